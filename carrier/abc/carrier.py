@@ -1,5 +1,8 @@
 import abc
 
+# CarrierName -> awb_warning_limit, заполняется при объявлении керриера
+awb_warning_limits = {}
+
 
 class AbstractCarrier:
     awb_warning_limit = 0
@@ -7,6 +10,11 @@ class AbstractCarrier:
     TrackingService = None
     ServicePointUpdater = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.awb_warning_limit:
+            awb_warning_limits[cls.name] = cls.awb_warning_limit
+
     @property
     @abc.abstractmethod
     def name(self):
@@ -0,0 +1,301 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+import requests
+
+from .exc import SendingOrderDelayed
+
+
+class TokenBucket:
+    """Ограничение частоты запросов: rate в секунду в среднем, не больше burst подряд. rate <= 0 - без ограничения"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class ConcurrentFetcher:
+    """
+    Параллельные запросы к API керриера по одному ключу (AWB): не больше workers одновременно
+    и не чаще rate в секунду на все потоки (TokenBucket). Временные ошибки (transient) повторяются
+    с экспоненциальной паузой, после retries повторов или при другой ошибке ключ пропускается с записью в лог.
+    Результаты отдаются по мере готовности, в работе не больше 2 * workers ключей.
+    Настройки: pimly.carriers.<carrier>.tracking.workers / rate / burst / retries
+    """
+    log = logging.getLogger('carriers_orders')
+    exception_log = logging.getLogger('carriers_orders_exceptions')
+
+    def __init__(self, name, fetch_one, workers=4, rate=0, burst=1, retries=3, backoff=1.0,
+                 transient=(SendingOrderDelayed,)):
+        self.name = name
+        self.fetch_one = fetch_one
+        self.workers = max(workers, 1)
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.transient = transient
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, carrier_name, fetch_one, workers=4, rate=0, burst=1, retries=3, **kwargs):
+        prefix = f'pimly.carriers.{carrier_name}.tracking'
+        return cls(
+            carrier_name, fetch_one,
+            workers=int(settings.get(f'{prefix}.workers', workers)),
+            rate=float(settings.get(f'{prefix}.rate', rate)),
+            burst=int(settings.get(f'{prefix}.burst', burst)),
+            retries=int(settings.get(f'{prefix}.retries', retries)),
+            **kwargs
+        )
+
+    def batches(self, keys, batch_size):
+        """Списки (key, результат) по batch_size"""
+        batch = []
+        for item in self.results(keys):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def results(self, keys):
+        """(key, результат) для ключей, которые удалось получить, в порядке готовности"""
+        keys = iter(keys)
+        self.stats.clear()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f'{self.name}-fetch') as executor:
+            pending = {executor.submit(self._fetch, key): key for key in islice(keys, self.workers * 2)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    fetched, result = future.result()
+                    if fetched:
+                        yield key, result
+
+                for key in islice(keys, len(done)):
+                    pending[executor.submit(self._fetch, key)] = key
+
+        elapsed = time.perf_counter() - started
+        self.log.info(f"{self.name}: {self.stats['fetched']} fetched, {self.stats['failed']} failed, "
+                      f"{self.stats['requests']} requests ({self.stats['retries']} retries) in {elapsed:.1f}s, "
+                      f"{self.stats['requests'] / elapsed if elapsed else 0:.2f} requests/s")
+
+    def _fetch(self, key):
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            self._count('requests')
+            try:
+                result = self.fetch_one(key)
+            except self.transient:
+                if attempt < self.retries:
+                    self._count('retries')
+                    time.sleep(self.backoff * 2 ** attempt)
+                    continue
+                self.exception_log.exception(f"{self.name}: {key} failed after {attempt + 1} attempts")
+            except Exception:
+                self.exception_log.exception(f"{self.name}: {key} skipped")
+            else:
+                self._count('fetched')
+                return True, result
+            break
+
+        self._count('failed')
+        return False, None
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+class AdaptiveBatchSize:
+    """
+    Размер пачки AWB по схеме AIMD: после быстрого (latency <= target_latency) и не слишком большого ответа
+    (payload <= max_payload) размер растет на step, после медленного, большого или ошибочного - уменьшается
+    в decrease раз, в пределах [minimum, maximum]
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None, step=10, decrease=0.5, target_latency=10.0, max_payload=None):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum or initial, self.minimum)
+        self.current = min(max(initial, self.minimum), self.maximum)
+        self.step = step
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.max_payload = max_payload
+        self._lock = threading.Lock()
+
+    def success(self, latency, payload):
+        with self._lock:
+            if latency > self.target_latency or (self.max_payload and payload > self.max_payload):
+                self._shrink()
+            else:
+                self.current = min(self.current + self.step, self.maximum)
+
+    def failure(self):
+        with self._lock:
+            self._shrink()
+
+    def _shrink(self):
+        self.current = max(int(self.current * self.decrease), self.minimum)
+
+
+def is_transient(error):
+    """Временная ошибка API: таймаут, ошибка соединения, ответ 5xx или SendingOrderDelayed"""
+    if isinstance(error, (SendingOrderDelayed, requests.Timeout, requests.ConnectionError)):
+        return True
+    status_code = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    return isinstance(status_code, int) and status_code >= 500
+
+
+class AdaptiveBatchFetcher:
+    """
+    Запросы к API керриера по нескольким AWB: до workers пачек одновременно, размер пачки подбирается
+    по задержке, размеру ответа и ошибкам (AdaptiveBatchSize). Временные ошибки (is_transient) повторяются
+    с экспоненциальной паузой, пачка, не полученная после retries повторов, пропускается целиком.
+    Пачка с другой ошибкой делится пополам и запрашивается снова, пока ошибка не сведется к отдельным AWB,
+    которые пропускаются с записью в лог. После max_failures неудачных запросов подряд API считается недоступным:
+    новые запросы не отправляются, оставшиеся AWB пропускаются.
+    Настройки: pimly.carriers.<carrier>.tracking.workers / batch_size / min_batch_size / max_batch_size /
+    batch_step / target_latency / max_payload / rate / retries / backoff / max_failures
+    """
+    log = logging.getLogger('carriers_orders')
+    exception_log = logging.getLogger('carriers_orders_exceptions')
+
+    def __init__(self, name, fetch_many, batch_size, workers=4, rate=0, retries=3, backoff=1.0, max_failures=10,
+                 payload_size=len):
+        self.name = name
+        self.fetch_many = fetch_many
+        self.batch_size = batch_size
+        self.workers = max(workers, 1)
+        self.bucket = TokenBucket(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_failures = max(max_failures, 1)
+        self.payload_size = payload_size
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, carrier_name, fetch_many, batch_size=10, min_batch_size=1, max_batch_size=100,
+                      batch_step=10, target_latency=10.0, max_payload=None, workers=4, rate=0, retries=3, backoff=1.0,
+                      max_failures=10, **kwargs):
+        prefix = f'pimly.carriers.{carrier_name}.tracking'
+        max_payload = settings.get(f'{prefix}.max_payload', max_payload)
+        size = AdaptiveBatchSize(
+            initial=int(settings.get(f'{prefix}.batch_size', batch_size)),
+            minimum=int(settings.get(f'{prefix}.min_batch_size', min_batch_size)),
+            maximum=int(settings.get(f'{prefix}.max_batch_size', max_batch_size)),
+            step=int(settings.get(f'{prefix}.batch_step', batch_step)),
+            target_latency=float(settings.get(f'{prefix}.target_latency', target_latency)),
+            max_payload=int(max_payload) if max_payload else None,
+        )
+        return cls(
+            carrier_name, fetch_many, size,
+            workers=int(settings.get(f'{prefix}.workers', workers)),
+            rate=float(settings.get(f'{prefix}.rate', rate)),
+            retries=int(settings.get(f'{prefix}.retries', retries)),
+            backoff=float(settings.get(f'{prefix}.backoff', backoff)),
+            max_failures=int(settings.get(f'{prefix}.max_failures', max_failures)),
+            **kwargs
+        )
+
+    def results(self, keys):
+        """(AWB пачки, ответ) в порядке готовности"""
+        keys = iter(keys)
+        retry = deque()
+        failures = 0
+        self.stats.clear()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f'{self.name}-fetch') as executor:
+            pending = {}
+            while True:
+                while len(pending) < self.workers and failures < self.max_failures:
+                    batch = retry.popleft() if retry else list(islice(keys, self.batch_size.current))
+                    if not batch:
+                        break
+                    pending[executor.submit(self._fetch, batch)] = batch
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = pending.pop(future)
+                    fetched, result, latency = future.result()
+                    if fetched:
+                        failures = 0
+                        self.batch_size.success(latency, self.payload_size(result))
+                        self.stats['fetched'] += len(batch)
+                        yield batch, result
+                        continue
+
+                    failures += 1
+                    self.batch_size.failure()
+                    if result is None and len(batch) > 1 and failures < self.max_failures:
+                        self.stats['splits'] += 1
+                        middle = len(batch) // 2
+                        retry.extend([batch[:middle], batch[middle:]])
+                    else:
+                        self.stats['failed'] += len(batch)
+                        self.exception_log.error(f"{self.name}: tracking for {len(batch)} AWBs skipped: "
+                                                 f"{', '.join(map(str, batch[:10]))}")
+
+            if failures >= self.max_failures:
+                skipped = sum(map(len, retry)) + sum(1 for _ in keys)
+                self.stats['failed'] += skipped
+                self.exception_log.error(f"{self.name}: tracking API unavailable after {failures} failed requests "
+                                         f"in a row, {skipped} AWBs not requested")
+
+        elapsed = time.perf_counter() - started
+        self.log.info(f"{self.name}: {self.stats['fetched']} AWBs fetched, {self.stats['failed']} failed, "
+                      f"{self.stats['requests']} requests ({self.stats['retries']} retries, {self.stats['splits']} splits) "
+                      f"in {elapsed:.1f}s, batch size {self.batch_size.current}")
+
+    def _fetch(self, batch):
+        """(получено, ответ, задержка). Для пачки, не полученной из-за временной ошибки, вместо ответа - ошибка"""
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            self._count('requests')
+            started = time.perf_counter()
+            try:
+                result = self.fetch_many(batch)
+            except Exception as e:
+                if not is_transient(e):
+                    self.exception_log.exception(f"{self.name}: tracking request for {len(batch)} AWBs failed")
+                    return False, None, time.perf_counter() - started
+                if attempt < self.retries:
+                    self._count('retries')
+                    time.sleep(self.backoff * 2 ** attempt)
+                    continue
+                self.exception_log.exception(f"{self.name}: tracking request for {len(batch)} AWBs failed "
+                                             f"after {attempt + 1} attempts")
+                return False, e, time.perf_counter() - started
+            return True, result, time.perf_counter() - started
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
@@ -0,0 +1,221 @@
+import atexit
+import collections
+import datetime
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+import transaction
+from pimly.models import DBSession
+from pimly.models.carrier.models import CarrierNumber
+from sqlalchemy import event, func, or_, text
+
+from .carrier import awb_warning_limits
+from .exc import SendingOrderCancelled
+
+
+class CarrierNumberAllocator:
+    """
+    Выдача трекинг номеров из пула carrier_number без конкуренции между воркерами.
+    Воркер арендует блок номеров (FOR UPDATE SKIP LOCKED, отдельная закоммиченная транзакция)
+    и раздает их локально. Номер удаляется из базы в транзакции заказа: если она откатится,
+    номер останется арендованным до leased_until и затем вернется в пул.
+    Неиспользованные номера возвращаются в пул при остановке процесса.
+    """
+    log = logging.getLogger('carriers_orders')
+    lease_ttl = datetime.timedelta(minutes=15)
+
+    lease_sql = text(f"""
+        UPDATE {CarrierNumber.__tablename__} SET lease_owner = :owner, leased_until = :leased_until
+        WHERE id IN (
+            SELECT id FROM {CarrierNumber.__tablename__}
+            WHERE carrier_id = :carrier_id
+              AND group_id = :group_id
+              AND (leased_until IS NULL OR leased_until < :now)
+            ORDER BY id
+            LIMIT :size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, number
+    """)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._owner = None
+        self._leases = {}
+        atexit.register(self.release_all)
+
+    @property
+    def owner(self):
+        # после fork у каждого воркера должен быть свой владелец и свои блоки
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._owner = f"{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}"
+            self._leases = {}
+        return self._owner
+
+    def allocate(self, carrier_id, group_id, lease_size=20):
+        """Трекинг номер из арендованного блока. Удаление номера выполняется в текущей транзакции"""
+        owner = self.owner
+        while True:
+            number_id, number = self._next_number(owner, carrier_id, group_id, lease_size)
+            deleted = DBSession.query(CarrierNumber) \
+                .filter(CarrierNumber.id == number_id,
+                        CarrierNumber.lease_owner == owner) \
+                .delete(synchronize_session=False)
+            if deleted:
+                return number
+
+            self.log.warning(f"Tracking number {number} lease was lost by {owner}")
+
+    def leased(self, carrier_id, group_id):
+        """Сколько номеров осталось в блоках, арендованных этим воркером"""
+        if self._pid != os.getpid():
+            return 0
+        return len(self._leases.get((carrier_id, group_id), ()))
+
+    def release(self, carrier_id=None, group_id=None):
+        """Возврат неиспользованных номеров в пул"""
+        owner = self.owner
+        with self._lock:
+            keys = [key for key in self._leases if carrier_id in (None, key[0]) and group_id in (None, key[1])]
+            ids = [number_id for key in keys for number_id, _ in self._leases.pop(key)]
+
+        if not ids:
+            return
+
+        with DBSession.get_bind().begin() as connection:
+            connection.execute(
+                CarrierNumber.__table__.update()
+                .where(CarrierNumber.id.in_(ids) & (CarrierNumber.lease_owner == owner))
+                .values(lease_owner=None, leased_until=None)
+            )
+
+    def release_all(self):
+        if self._pid != os.getpid():
+            return
+
+        try:
+            self.release()
+        except Exception:
+            self.log.exception(f"Can not release leased tracking numbers of {self._owner}")
+
+    def _next_number(self, owner, carrier_id, group_id, lease_size):
+        key = (carrier_id, group_id)
+        with self._lock:
+            numbers = self._leases.get(key)
+            if not numbers:
+                numbers = self._leases[key] = collections.deque(self._lease(owner, carrier_id, group_id, lease_size))
+                number_inventory.leased(carrier_id, group_id, len(numbers))
+            if not numbers:
+                raise SendingOrderCancelled(f"There are no free tracking numbers for carrier group {group_id}")
+            return numbers.popleft()
+
+    def _lease(self, owner, carrier_id, group_id, size):
+        now = datetime.datetime.utcnow()
+        with DBSession.get_bind().begin() as connection:
+            rows = connection.execute(self.lease_sql, {
+                'owner': owner,
+                'leased_until': now + self.lease_ttl,
+                'now': now,
+                'carrier_id': carrier_id,
+                'group_id': group_id,
+                'size': size,
+            }).fetchall()
+
+        rows = sorted((row.id, row.number) for row in rows)
+        self.log.info(f"{owner} leased {len(rows)} tracking numbers of carrier group {group_id}")
+        return rows
+
+
+class CarrierNumberInventory:
+    """
+    Количество свободных трекинг номеров по (carrier_id, group_id): не арендованные в базе
+    плюс оставшиеся в блоках, арендованных этим воркером. Номера, арендованные другими воркерами, не считаются.
+    Счетчики всех групп загружаются одним GROUP BY запросом и живут ttl секунд,
+    между обновлениями уменьшаются при аренде блока. Загрузка/удаление номеров через ORM сбрасывает счетчики,
+    пакетная загрузка (import_numbers, Core insert без ORM событий) увеличивает их после коммита (added).
+    """
+    log = logging.getLogger('carriers_orders')
+    ttl = 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._loaded_at = None
+        self._warned = set()
+
+    def count(self, carrier_id, group_id):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.refresh()
+        return self._counts.get((carrier_id, group_id), 0) + number_allocator.leased(carrier_id, group_id)
+
+    def refresh(self):
+        now = datetime.datetime.utcnow()
+        rows = DBSession.query(CarrierNumber.carrier_id, CarrierNumber.group_id, func.count(CarrierNumber.id)) \
+            .filter(or_(CarrierNumber.leased_until.is_(None), CarrierNumber.leased_until < now)) \
+            .group_by(CarrierNumber.carrier_id, CarrierNumber.group_id)
+        counts = {(carrier_id, group_id): count for carrier_id, group_id, count in rows}
+        with self._lock:
+            self._counts = counts
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def added(self, carrier_id, group_id, count):
+        """В пул загружено count новых номеров группы: счетчик увеличивается, не дожидаясь ttl"""
+        key = (carrier_id, group_id)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + count
+
+    def import_numbers(self, carrier_id, group_id, numbers):
+        """
+        Пакетная загрузка номеров в пул одним INSERT в текущей транзакции. Возвращает количество номеров.
+        Счетчик группы увеличивается только после успешного коммита
+        """
+        rows = [{'carrier_id': carrier_id, 'group_id': group_id, 'number': number} for number in numbers]
+        if not rows:
+            return 0
+
+        DBSession.execute(CarrierNumber.__table__.insert(), rows)
+        transaction.get().addAfterCommitHook(
+            lambda success: success and self.added(carrier_id, group_id, len(rows))
+        )
+        self.log.info(f"{len(rows)} tracking numbers imported to carrier group {group_id}")
+        return len(rows)
+
+    def leased(self, carrier_id, group_id, count):
+        """Воркер арендовал count номеров: они больше не свободны в базе, но учтены в его блоках"""
+        key = (carrier_id, group_id)
+        with self._lock:
+            self._counts[key] = max(self._counts.get(key, 0) - count, 0)
+
+    def allocated(self, carrier_name, carrier_id, group_id):
+        """Номер выдан: проверяем порог awb_warning_limit керриера"""
+        limit = awb_warning_limits.get(carrier_name, 0)
+        if not limit:
+            return
+
+        key = (carrier_id, group_id)
+        count = self.count(carrier_id, group_id)
+        if count >= limit:
+            self._warned.discard(key)
+        elif key not in self._warned:
+            self._warned.add(key)
+            self.log.warning(f"{carrier_name.value}: only {count} tracking numbers left in group {group_id} "
+                             f"(warning limit {limit})")
+
+
+number_allocator = CarrierNumberAllocator()
+number_inventory = CarrierNumberInventory()
+
+
+@event.listens_for(CarrierNumber, 'after_insert')
+@event.listens_for(CarrierNumber, 'after_delete')
+def _invalidate_inventory(mapper, connection, target):
+    number_inventory.invalidate()
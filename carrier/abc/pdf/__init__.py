@@ -1,9 +1,12 @@
 from .base import (
     AbstractShipmentPDF,
     SimpleDocWithoutPadding,
+    arabic_shaper,
     arabic_text,
+    arabic_texts,
     TTR,
 )
+from .fonts import font_registry
 from .invoice import (
     BaseInvoicePDF,
     EnigmoInvoicePDF,
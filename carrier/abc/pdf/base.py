@@ -1,22 +1,25 @@
 # -*- coding:utf-8 -*-
 import abc
 import io
-from functools import partial
 from collections import namedtuple
 import os
 import unicodedata
+from functools import lru_cache
 
 from arabic_reshaper import reshape
 from bidi.algorithm import get_display
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import (
     SimpleDocTemplate,
     Flowable,
 )
 
+from pimly.models.carrier.models import Carrier
+from pimly.utils.cache import cached_property
+from .fonts import font_registry
+from ..translation import translations
+
 
 class AbstractPDF(metaclass=abc.ABCMeta):
 
@@ -27,7 +30,7 @@ class AbstractPDF(metaclass=abc.ABCMeta):
         self.img_dir = os.path.join(self.base_dir, 'img')
         self.font_dir = os.path.join(self.base_dir, 'fonts', 'pdf')
         self._buffer = io.BytesIO()
-        self._register_fonts()
+        font_registry.register(self.font_dir)
 
     @abc.abstractmethod
     def create_document(self):
@@ -38,19 +41,6 @@ class AbstractPDF(metaclass=abc.ABCMeta):
     def pagesize(self):
         pass
 
-    def _register_fonts(self):
-        path = partial(os.path.join, self.font_dir)
-        fonts = [
-            ("Barcode", path('barcode.ttf')),
-            ("Arial", path('arial_font', 'Arial.ttf')),
-            ("Arial-Bold", path('arial_font', 'Arialbd.ttf')),
-            ("Arial-Uni", path('arial_font', 'ARIALUNI.TTF')),
-            ("XBZar", path('XBZarFont', 'XBZar.ttf')),
-            ("XBZar-Bold", path('XBZarFont', 'XBZarBd.ttf')),
-        ]
-        for font_name, file_path in fonts:
-            pdfmetrics.registerFont(TTFont(font_name, file_path))
-
 
 class AbstractShipmentPDF(AbstractPDF, metaclass=abc.ABCMeta):
     pagesize = (102 * mm, 144 * mm)
@@ -59,7 +49,7 @@ class AbstractShipmentPDF(AbstractPDF, metaclass=abc.ABCMeta):
         super().__init__(settings)
         self.shipment = shipment
         self.order = shipment.order
-        self.carrier_settings = kwargs.get('carrier_settings') or shipment.carrier.get_settings(self.order.channel.code)
+        self.carrier_settings = kwargs.get('carrier_settings') or Carrier.cached_settings(shipment.carrier.name, self.order.channel.code)
         self.title = kwargs.get('title') or f"shipment-{self.order.code}"
 
 
@@ -70,9 +60,19 @@ class AbstractInvoicePDF(AbstractPDF, metaclass=abc.ABCMeta):
         super().__init__(settings)
         self.shipment = shipment
         self.order = shipment.order
-        self.carrier_settings = kwargs.get('carrier_settings') or self.shipment.carrier.get_settings(self.order.channel.code)
+        self.carrier_settings = kwargs.get('carrier_settings') or Carrier.cached_settings(self.shipment.carrier.name, self.order.channel.code)
         self.title = kwargs.get('title') or f"invoice-{self.order.code}"
 
+    @cached_property
+    def address_translations(self):
+        """Переводы имен и городов адресов оплаты и доставки одним вызовом"""
+        return translations.translate_many(self.settings, [
+            self.order.billing_address.full_name,
+            self.order.billing_address.city,
+            self.order.shipping_address.full_name,
+            self.order.shipping_address.city,
+        ])
+
 
 class SimpleDocWithoutPadding(SimpleDocTemplate):
 
@@ -84,7 +84,36 @@ class SimpleDocWithoutPadding(SimpleDocTemplate):
         SimpleDocTemplate.addPageTemplates(self, pageTemplates)
 
 
+class ArabicShaper:
+    """
+    Shaping и bidi для текста PDF с LRU кешем на процесс: имена, города и адреса
+    повторяются между заказами и коробками одного заказа. ASCII строки возвращаются без обработки
+    """
+
+    def __init__(self, maxsize=20000):
+        self.shape_cached = lru_cache(maxsize=maxsize)(shape_arabic)
+
+    def shape(self, text):
+        if isinstance(text, str) and text.isascii():
+            return text
+        return self.shape_cached(text)
+
+    def shape_many(self, texts):
+        return [self.shape(text) for text in texts]
+
+    def cache_info(self):
+        return self.shape_cached.cache_info()
+
+
 def arabic_text(text):
+    return arabic_shaper.shape(text)
+
+
+def arabic_texts(texts):
+    return arabic_shaper.shape_many(texts)
+
+
+def shape_arabic(text):
     # http://stackoverflow.com/questions/8222517/use-of-arabic-rtl-in-reportlab
     is_arabic = False
     is_bidi = False
@@ -109,6 +138,9 @@ def arabic_text(text):
     return wr_text
 
 
+arabic_shaper = ArabicShaper()
+
+
 PDFTotals = namedtuple('PDFTotals', ['vat_text', 'discount_text', 'invoice_text'])
 
 
@@ -0,0 +1,65 @@
+import logging
+import os
+import resource
+import threading
+import time
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+
+class FontRegistry:
+    """
+    Регистрация TTF шрифтов в reportlab один раз на процесс.
+    Шрифты хранятся в глобальном реестре pdfmetrics, поэтому повторная регистрация
+    для каждого PDF документа только перечитывает файлы с диска.
+    """
+    log = logging.getLogger('carriers_orders')
+    fonts = (
+        ("Barcode", ('barcode.ttf',)),
+        ("Arial", ('arial_font', 'Arial.ttf')),
+        ("Arial-Bold", ('arial_font', 'Arialbd.ttf')),
+        ("Arial-Uni", ('arial_font', 'ARIALUNI.TTF')),
+        ("XBZar", ('XBZarFont', 'XBZar.ttf')),
+        ("XBZar-Bold", ('XBZarFont', 'XBZarBd.ttf')),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._font_dir = None
+        self.stats = {}
+
+    @property
+    def loaded(self):
+        return self._font_dir is not None
+
+    def register(self, font_dir):
+        if self._font_dir == font_dir:
+            return
+
+        with self._lock:
+            if self._font_dir == font_dir:
+                return
+
+            for font_name, path in self.fonts:
+                started = time.perf_counter()
+                max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                pdfmetrics.registerFont(TTFont(font_name, os.path.join(font_dir, *path)))
+                self.stats[font_name] = {
+                    'load_time': time.perf_counter() - started,
+                    'max_rss_delta_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - max_rss,
+                }
+
+            self._font_dir = font_dir
+            self.log.info(f"PDF fonts registered in {self.load_time:.3f}s: {self.stats}")
+
+    def warm_up(self, settings):
+        """Регистрация шрифтов при старте воркера, чтобы первый PDF не платил за загрузку"""
+        self.register(os.path.join(settings['webassets.base_dir'], 'fonts', 'pdf'))
+
+    @property
+    def load_time(self):
+        return sum(font_stats['load_time'] for font_stats in self.stats.values())
+
+
+font_registry = FontRegistry()
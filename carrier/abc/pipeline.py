@@ -0,0 +1,166 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class StageMetrics:
+    """
+    Счетчики стадии конвейера: elapsed - время получения очередного элемента стадии,
+    starved - из него ожидание входной очереди, blocked - ожидание места в выходной очереди,
+    depth_* - глубина выходной очереди после каждой записи
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.elapsed = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self.depth_max = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+
+    @property
+    def busy(self):
+        return max(self.elapsed - self.starved, 0.0)
+
+    @property
+    def throughput(self):
+        return self.items / self.busy if self.busy else 0.0
+
+    @property
+    def depth_mean(self):
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'busy': self.busy,
+            'starved': self.starved,
+            'blocked': self.blocked,
+            'throughput': self.throughput,
+            'queue_depth_max': self.depth_max,
+            'queue_depth_mean': self.depth_mean,
+        }
+
+    def __str__(self):
+        return (f"{self.name}: {self.items} items, busy {self.busy:.2f}s ({self.throughput:.1f}/s), "
+                f"starved {self.starved:.2f}s, blocked {self.blocked:.2f}s, "
+                f"queue depth max {self.depth_max} mean {self.depth_mean:.1f}")
+
+
+class Pipeline:
+    """
+    Конвейер из стадий, связанных ограниченными очередями. Источник и промежуточные стадии работают
+    в своих потоках, последняя стадия (sink) - в вызывающем потоке, поэтому работа с DBSession остается
+    в потоке сессии, а получение следующей пачки идет параллельно с записью текущей.
+    Ошибка любой стадии останавливает конвейер и пробрасывается из run
+    """
+    log = logging.getLogger('carriers_orders')
+    poll_interval = 0.1
+
+    def __init__(self, name, queue_size=2):
+        self.name = name
+        self.queue_size = queue_size
+        self.metrics = []
+        self._stop = threading.Event()
+        self._errors = []
+
+    def run(self, source, stages, sink):
+        """
+        source - (name, iterable), stages - [(name, func)], где func(item) возвращает итерируемые результаты,
+        sink - (name, func). Возвращает список StageMetrics
+        """
+        self._stop.clear()
+        self._errors = []
+        self.metrics = [StageMetrics(name) for name, _ in [source, *stages, sink]]
+
+        threads = []
+        items = source[1]
+        producers = [source, *stages]
+        for index, (_, func) in enumerate([*stages, sink], start=1):
+            output = queue.Queue(maxsize=self.queue_size)
+            threads.append(threading.Thread(target=self._produce, args=(items, output, self.metrics[index - 1]),
+                                            name=f"{self.name}-{producers[index - 1][0]}", daemon=True))
+            inputs = self._read(output, self.metrics[index])
+            if index > len(stages):
+                items = map(func, inputs)
+            else:
+                items = itertools.chain.from_iterable(map(func, inputs))
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            for _ in self._timed(items, self.metrics[-1]):
+                pass
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        for metrics in self.metrics:
+            self.log.info(f"{self.name} pipeline. {metrics}")
+        return self.metrics
+
+    def _produce(self, items, output, metrics):
+        try:
+            for item in self._timed(items, metrics):
+                self._put(output, item, metrics)
+                if self._stop.is_set():
+                    break
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            self._put(output, _DONE, metrics)
+
+    def _put(self, output, item, metrics):
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                output.put(item, timeout=self.poll_interval)
+                break
+            except queue.Full:
+                continue
+        metrics.blocked += time.perf_counter() - started
+        if item is not _DONE:
+            depth = output.qsize()
+            metrics.depth_max = max(metrics.depth_max, depth)
+            metrics.depth_total += depth
+            metrics.depth_samples += 1
+
+    def _read(self, input, metrics):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                item = input.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+            finally:
+                metrics.starved += time.perf_counter() - started
+            if item is _DONE:
+                return
+            yield item
+
+    @staticmethod
+    def _timed(items, metrics):
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                metrics.elapsed += time.perf_counter() - started
+            metrics.items += 1
+            yield item
@@ -1,23 +1,25 @@
 import abc
 import logging
-import random
 import traceback
 
 import requests
 from pimly.models import DBSession
-from pimly.models.carrier.models import Carrier, CarrierNumber
+from pimly.models.carrier.models import Carrier, CarrierNumber, CarrierShippingJob, ShippingJobStatus
 from pimly.models.orders import OrderShippingTask, OrderShipment
 from pyramid.settings import asbool
 from sqlalchemy.orm import contains_eager
 
 from . import pdf
 from .exc import SendingOrderDelayed
+from .numbers import number_allocator, number_inventory
 
 
 class AbstractShippingService:
     log = logging.getLogger('carriers_orders')
     exception_log = logging.getLogger(__name__)
     send_exceptions = (requests.RequestException, SendingOrderDelayed)
+    # False - _resend_shipment всегда завершается ошибкой, повторную отправку выполняет оператор
+    resend_allowed = True
     waybill_pdf_creators = {
         'EG': pdf.EgyptWaybillPDF,
         'SA': pdf.SaudiArabiaWaybillPDF,
@@ -27,8 +29,21 @@ class AbstractShippingService:
     def __init__(self, settings, channel_code):
         self.settings = settings
         self.production_mode = asbool(settings.get('pimly.order_api.production_mode', False))
-        self.carrier = self._carrier_qs.one()
-        self.carrier_settings = self.carrier.get_settings(channel_code)
+        self.channel_code = channel_code
+
+    @property
+    def carrier_info(self):
+        return Carrier.cached(self.carrier_name)
+
+    @property
+    def carrier_settings(self):
+        """Настройки читаются из общего кеша при каждом обращении: сервис переиспользуется и не должен их закреплять"""
+        return Carrier.cached_settings(self.carrier_name, self.channel_code)
+
+    @property
+    def carrier(self):
+        """Керриер в текущей сессии. Сервис переиспользуется между запросами и не хранит ORM объекты"""
+        return DBSession.query(Carrier).get(self.carrier_info.id)
 
     @property
     @abc.abstractmethod
@@ -36,8 +51,11 @@ class AbstractShippingService:
         pass
 
     @abc.abstractmethod
-    def can_send_shipment(self, shipment):
-        """Проверяем может ли керриер глобально отправить этот заказ: подходит ли страна, валюта и т.д."""
+    def can_send_shipment(self, shipment, timeout=None):
+        """
+        Проверяем может ли керриер глобально отправить этот заказ: подходит ли страна, валюта и т.д.
+        shipment - ShipmentSnapshot (может проверяться не в потоке запроса), timeout - ограничение внешних вызовов
+        """
         return True
 
     @abc.abstractmethod
@@ -122,8 +140,32 @@ class AbstractShippingService:
         shipping_task.message = reason
         shipping_task.traceback = traceback_exc
         DBSession.add(shipping_task)
+        if self.resend_allowed and asbool(self.settings.get('pimly.carriers.outbox', False)):
+            self._schedule_shipping_job(shipment)
         DBSession.flush()
 
+    def _schedule_shipping_job(self, shipment):
+        """
+        Повторная отправка воркерами ShippingOutbox, если для шипмента еще нет активного задания.
+        Шипмент, задание которого исчерпало попытки (failed), повторно не планируется
+        """
+        if self._outbox_jobs_qs.filter(CarrierShippingJob.shipment_id == shipment.id).first():
+            return
+
+        job = CarrierShippingJob(
+            shipment=shipment,
+            carrier_id=self.carrier_info.id,
+            channel_code=shipment.order.channel.code,
+            attempts=1,
+        )
+        job.retry_later(*self.retry_delays)
+        DBSession.add(job)
+
+    @property
+    def retry_delays(self):
+        return (float(self.settings.get('pimly.carriers.outbox.retry_base', 60)),
+                float(self.settings.get('pimly.carriers.outbox.retry_max', 60 * 60)))
+
     def _delete_shipping_tasks(self, shipments):
         """Удаление успешно отправленных тасков"""
         if shipments:
@@ -131,20 +173,25 @@ class AbstractShippingService:
                 .filter(OrderShippingTask.shipment_id.in_(shipment.id for shipment in shipments))\
                 .delete(synchronize_session=False)
 
+    @property
+    def _outbox_jobs_qs(self):
+        """Шипменты, которые отправляют воркеры ShippingOutbox, и шипменты, задания которых исчерпали попытки"""
+        return DBSession.query(CarrierShippingJob.shipment_id) \
+            .filter(CarrierShippingJob.status.in_([ShippingJobStatus.pending,
+                                                   ShippingJobStatus.processing,
+                                                   ShippingJobStatus.failed]))
+
     @property
     def _shipping_tasks_qs(self):
         return DBSession.query(OrderShippingTask) \
             .join(OrderShipment) \
             .join(OrderShipment.carrier) \
-            .filter(Carrier.name == self.carrier_name) \
+            .filter(Carrier.name == self.carrier_name,
+                    ~OrderShipment.id.in_(self._outbox_jobs_qs)) \
             .options(contains_eager(OrderShippingTask.shipment).joinedload(OrderShipment.carrier),
                      contains_eager('shipment').selectinload('items')) \
             .limit(200)
 
-    @property
-    def _carrier_qs(self):
-        return DBSession.query(Carrier).filter(Carrier.name == self.carrier_name)
-
 
 class TrackingNumberMixin:
     """Mixin для работы с трекинг номерами, хранящимися в базе данных"""
@@ -156,14 +203,11 @@ class TrackingNumberMixin:
             .filter(Carrier.name == self.carrier_name,
                     CarrierNumber.group_id == self.carrier_settings.group_id)
 
-    def get_tracking_number(self):
-        numbers = [x.id for x in self.tracking_number_qs.limit(200)]
-        carrier_number = DBSession.query(CarrierNumber) \
-            .filter(CarrierNumber.id == random.choice(numbers)) \
-            .one()
-
-        tracking_number = carrier_number.number
-        DBSession.delete(carrier_number)
-        DBSession.flush()
+    def has_tracking_numbers(self):
+        return number_inventory.count(self.carrier_info.id, self.carrier_settings.group_id) > 0
 
+    def get_tracking_number(self):
+        lease_size = int(self.settings.get('pimly.carriers.awb_lease_size', 20))
+        tracking_number = number_allocator.allocate(self.carrier_info.id, self.carrier_settings.group_id, lease_size)
+        number_inventory.allocated(self.carrier_name, self.carrier_info.id, self.carrier_settings.group_id)
         return tracking_number
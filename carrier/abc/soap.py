@@ -0,0 +1,78 @@
+import logging
+import os
+import threading
+import time
+
+from pimlib.utils.files import ensure_dir
+from pyramid.settings import asbool
+from requests import Session
+from zeep import Client, Transport
+from zeep.cache import SqliteCache
+
+
+class SoapClientPool:
+    """
+    Пул zeep клиентов на процесс.
+    Клиент (с распарсенным WSDL) создается один раз для каждой комбинации
+    (url, verify, timeout, operation_timeout). Загруженные WSDL/XSD документы
+    дополнительно кешируются на диске, чтобы новый воркер не скачивал их заново.
+    """
+    log = logging.getLogger('carriers_orders')
+    wsdl_cache_timeout = 24 * 60 * 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._wsdl_cache = None
+
+    def get(self, settings, url, verify=True, timeout=120, operation_timeout=120):
+        key = (url, verify, timeout, operation_timeout)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            if key not in self._clients:
+                started = time.perf_counter()
+                self._clients[key] = self._create_client(settings, url, verify, timeout, operation_timeout)
+                self.log.info(f"SOAP client for {url} created in {time.perf_counter() - started:.3f}s")
+
+        return self._clients[key]
+
+    def preload(self, settings, *api_classes):
+        """Загрузка WSDL при старте воркера. api_classes - классы с методом soap_client(settings)"""
+        for api_class in api_classes:
+            try:
+                api_class.soap_client(settings)
+            except Exception:
+                self.log.exception(f"Can not preload SOAP client for {api_class.__name__}")
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def _create_client(self, settings, url, verify, timeout, operation_timeout):
+        session = Session()
+        session.verify = verify
+        transport = Transport(
+            cache=self._get_wsdl_cache(settings),
+            timeout=timeout,
+            operation_timeout=operation_timeout,
+            session=session,
+        )
+        return Client(url, transport=transport)
+
+    def _get_wsdl_cache(self, settings):
+        if not asbool(settings.get('pimly.carriers.wsdl_cache', True)):
+            return None
+
+        if self._wsdl_cache is None:
+            path = settings.get('pimly.carriers.wsdl_cache_path') or \
+                os.path.join(settings['pimly.carriers.main_path'], 'wsdl_cache.db')
+            ensure_dir(os.path.dirname(path))
+            self._wsdl_cache = SqliteCache(path=path, timeout=self.wsdl_cache_timeout)
+
+        return self._wsdl_cache
+
+
+soap_clients = SoapClientPool()
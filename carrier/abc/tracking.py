@@ -1,26 +1,113 @@
 import abc
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from itertools import groupby, islice
+from operator import itemgetter
+
+import transaction
+from sqlalchemy.orm import selectinload
 
 from pimly import DBSession
+from pimly.utils import grouper
 from pimly.utils.cache import cached_property
+from pimly.models import enum
 from pimly.models.carrier.models import Carrier
+from pimly.models.orders import Order, OrderShipment
+from pimly.models.tracking.enum import MilestoneType, OrderShipmentStatus
+from pimly.models.tracking.models import ShipmentMilestone
+from .pipeline import Pipeline
 
 
 class AbstractTrackingUpdater:
+    """
+    Обновление трекинга керриера конвейером: fetch (сырые пачки керриера, отдельный поток) ->
+    parse + _map_events (события по AWB, отдельный поток) -> _persist (запись в БД, вызывающий поток).
+    Стадии связаны ограниченными очередями, поэтому следующая пачка запрашивается, пока пишется текущая.
+    Керриер реализует fetch, parse и _create_milestone.
+    Настройки: pimly.carriers.tracking.queue_size - пачек в очереди между стадиями
+    """
     log = logging.getLogger('carriers_orders')
     exception_log = logging.getLogger('carriers_orders_exceptions')
+    parse_grouped = False
 
     def __init__(self, settings, **kwargs):
         self.settings = settings
         self.to_date = kwargs.get('to_date') or (date.today() + timedelta(days=1))
         self.from_date = kwargs.get('from_date') or (self.to_date - timedelta(days=30))
         self.tracking_numbers = kwargs.get('tracking_numbers')
+        self.pipeline_metrics = []
 
-    @abc.abstractmethod
     def update_trackings(self):
+        tracking_numbers = self._get_tracking_numbers()
+        self.pipeline_metrics = self.run_pipeline(tracking_numbers)
+
+    def run_pipeline(self, tracking_numbers):
+        queue_size = int(self.settings.get('pimly.carriers.tracking.queue_size', 2))
+        pipeline = Pipeline(self.carrier_name.name, queue_size=queue_size)
+        return pipeline.run(
+            source=('fetch', self.fetch(tracking_numbers)),
+            stages=[('parse', self._parse_batch)],
+            sink=('persist', self._persist_batch),
+        )
+
+    def fetch(self, tracking_numbers):
+        """Генератор сырых пачек керриера (ответ API, файл). Работает в отдельном потоке, без DBSession"""
+        raise NotImplementedError
+
+    def parse(self, batch):
+        """Генератор пар (AWB, событие керриера с атрибутом milestone) из пачки fetch"""
+        raise NotImplementedError
+
+    def _get_tracking_numbers(self):
+        """AWB для fetch, запрашиваются в вызывающем потоке"""
+        return [order_shipment.tracking_number for order_shipment in self._tracking_qs]
+
+    def _parse_batch(self, batch):
+        """
+        orders_tracking_info пачки fetch. Если parse отдает события, сгруппированные по AWB (parse_grouped),
+        пачка уходит на запись частями по pimly.carriers.tracking.batch_size AWB, не дожидаясь ее конца.
+        После последней части - (batch, None) для _batch_done
+        """
+        events = self.parse(batch)
+        if self.parse_grouped:
+            batch_size = int(self.settings.get('pimly.carriers.tracking.batch_size', 500))
+            awb_events = ((hawb, list(group)) for hawb, group in groupby(events, key=itemgetter(0)))
+            for chunk in iter(lambda: list(islice(awb_events, batch_size)), []):
+                yield batch, self._map_events(event for _, group in chunk for event in group)
+        else:
+            yield batch, self._map_events(events)
+        yield batch, None
+
+    def _persist_batch(self, parsed_batch):
+        batch, orders_tracking_info = parsed_batch
+        if orders_tracking_info is None:
+            self._batch_done(batch)
+        else:
+            self._persist(orders_tracking_info)
+
+    def _batch_done(self, batch):
+        """Действия керриера после записи всей пачки fetch"""
         pass
 
+    def _map_events(self, events):
+        """События по AWB в формате orders_tracking_info, события без milestone отбрасываются"""
+        events_by_hawb = {}
+        for hawb, tracking in events:
+            if hawb and tracking.milestone:
+                events_by_hawb.setdefault(hawb, []).append(tracking)
+
+        return [{
+            'hawb': hawb,
+            'tracking_info': tracking_info,
+        } for hawb, tracking_info in events_by_hawb.items()]
+
+    def _persist(self, orders_tracking_info):
+        # API керриеров отдают всю историю AWB, поэтому доставленными считаются только AWB с новым событием доставки
+        delivered_tracking_numbers = list(self._update_shipment_milestones(orders_tracking_info))
+        if delivered_tracking_numbers:
+            self._set_delivered_status(delivered_tracking_numbers)
+            self._update_shipment_delivery_date(delivered_tracking_numbers)
+
     @property
     @abc.abstractmethod
     def carrier_name(self):
@@ -33,3 +120,114 @@ class AbstractTrackingUpdater:
             .one()
 
         return carrier.id
+
+    def _create_milestone(self, shipment_id, tracking):
+        """ShipmentMilestone для события керриера из orders_tracking_info"""
+        raise NotImplementedError
+
+    def _update_shipment_milestones(self, orders_tracking_info):
+        """
+        Пакетная запись событий трекинга: orders_tracking_info - [{'hawb', 'tracking_info'}].
+        На пачку AWB один запрос шипментов, один запрос существующих событий для дедупликации,
+        одна вставка новых событий (через ORM, чтобы сработали события ShipmentNotification)
+        и один запрос для пересчета статуса измененных шипментов.
+        Возвращает AWB, для которых добавлено событие доставки.
+        Настройки: pimly.carriers.tracking.batch_size - AWB в пачке,
+        pimly.carriers.tracking.commit_batches - пачек в одной транзакции
+        """
+        batch_size = int(self.settings.get('pimly.carriers.tracking.batch_size', 500))
+        commit_batches = int(self.settings.get('pimly.carriers.tracking.commit_batches', 1))
+        batches = [list(filter(None, group)) for group in grouper(batch_size, orders_tracking_info)]
+        delivered = set()
+        for group in grouper(commit_batches, batches):
+            with transaction.manager:
+                for batch in filter(None, group):
+                    delivered.update(self._ingest_milestones(batch))
+        return delivered
+
+    def _ingest_milestones(self, orders_tracking_info):
+        """Запись новых событий пачки AWB. Возвращает AWB, для которых добавлено событие доставки"""
+        shipments = {}
+        shipment_qs = DBSession.query(OrderShipment) \
+            .filter(OrderShipment.status_history.isnot(None),
+                    ~OrderShipment.current_status.in_([OrderShipmentStatus.delivered, OrderShipmentStatus.returned]),
+                    OrderShipment.carrier_id == self.carrier_id,
+                    OrderShipment.tracking_number.in_([order_tracking['hawb'] for order_tracking in orders_tracking_info])) \
+            .order_by(OrderShipment.id)
+        for shipment in shipment_qs:
+            shipments.setdefault(shipment.tracking_number, shipment)
+        if not shipments:
+            return set()
+
+        existing_qs = DBSession.query(ShipmentMilestone.shipment_id,
+                                      ShipmentMilestone.milestone,
+                                      ShipmentMilestone.carrier_code,
+                                      ShipmentMilestone.event_date) \
+            .filter(ShipmentMilestone.shipment_id.in_([shipment.id for shipment in shipments.values()]))
+        existing = set(existing_qs)
+
+        new_milestones = []
+        updated_shipment_ids = set()
+        delivered = set()
+        for order_tracking in orders_tracking_info:
+            shipment = shipments.get(order_tracking['hawb'])
+            if shipment is None:
+                continue
+
+            milestones = []
+            for tracking in order_tracking['tracking_info']:
+                milestone = self._create_milestone(shipment.id, tracking)
+                key = (shipment.id, milestone.milestone, milestone.carrier_code, milestone.event_date)
+                if key not in existing:
+                    existing.add(key)
+                    milestones.append(milestone)
+
+            if milestones:
+                # Sort for the further correct addition of ShipmentNotification
+                milestones.sort()
+                new_milestones.extend(milestones)
+                updated_shipment_ids.add(shipment.id)
+                if any(MilestoneType.is_delivered_milestone(milestone.milestone) for milestone in milestones):
+                    delivered.add(order_tracking['hawb'])
+
+        if not new_milestones:
+            return delivered
+
+        DBSession.add_all(new_milestones)
+        DBSession.flush()
+        updated_qs = DBSession.query(OrderShipment) \
+            .filter(OrderShipment.id.in_(updated_shipment_ids)) \
+            .populate_existing()
+        for shipment in updated_qs:
+            shipment.update_status_info()
+
+        self.log.info(f"{self.carrier_name.value}: {len(new_milestones)} milestones added "
+                      f"for {len(updated_shipment_ids)} of {len(orders_tracking_info)} shipments")
+        return delivered
+
+    def _set_delivered_status(self, delivered_tracking_numbers):
+        order_shipment_qs = DBSession.query(OrderShipment.order_id) \
+            .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
+                    OrderShipment.carrier_id == self.carrier_id)
+
+        for group in grouper(100, [order_shipment.order_id for order_shipment in order_shipment_qs]):
+            delivered_order_ids = list(filter(None, group))
+            with transaction.manager:
+                order_qs = DBSession.query(Order) \
+                    .filter(Order.id.in_(delivered_order_ids)) \
+                    .options(selectinload('shipments').load_only('current_status'))
+                for order in order_qs:
+                    if all(sh.current_status == OrderShipmentStatus.delivered for sh in order.shipments):
+                        order.status = enum.OrderStatus.delivered
+                        DBSession.flush()
+            self.log.info(f"{self.carrier_name.value}. Set delivered status for orders (id): {delivered_order_ids}")
+
+    def _update_shipment_delivery_date(self, delivered_tracking_numbers):
+        with transaction.manager:
+            DBSession.query(OrderShipment) \
+                .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
+                        OrderShipment.carrier_id == self.carrier_id,
+                        OrderShipment.current_status == OrderShipmentStatus.delivered,
+                        OrderShipment.delivered_date.is_(None)) \
+                .update({OrderShipment.delivered_date: datetime.utcnow()},
+                        synchronize_session=False)
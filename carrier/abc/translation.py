@@ -0,0 +1,145 @@
+import collections
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from contextlib import closing
+
+from pimlib.utils.files import ensure_dir
+from pimly.models.translate import Translator
+from pyramid.settings import asbool
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def translation_key(text):
+    """Ключ кеша: NFKC и схлопнутые пробелы"""
+    return WHITESPACE.sub(' ', unicodedata.normalize('NFKC', text)).strip()
+
+
+class TranslationCache:
+    """
+    Кеш переводов имен и адресов на процесс (LRU) с общим постоянным уровнем в sqlite,
+    ключ - нормализованная исходная строка. translate_many переводит все строки шипмента за один вызов:
+    один запрос к sqlite для строк, которых нет в памяти, и Translator только для новых строк.
+    Настройки: pimly.carriers.translation.cache (вкл/выкл sqlite), pimly.carriers.translation.cache_path / cache_size
+    """
+    log = logging.getLogger('carriers_orders')
+    create_sql = "CREATE TABLE IF NOT EXISTS translation (source TEXT PRIMARY KEY, translation TEXT NOT NULL)"
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._values = collections.OrderedDict()
+        self._translator = None
+        self._path = None
+        self.counters = collections.Counter()
+
+    def translate(self, settings, text):
+        return self.translate_many(settings, [text])[text]
+
+    def translate_many(self, settings, texts):
+        """{text: перевод} для всех строк texts"""
+        result = {}
+        keys = {}
+        for text in texts:
+            if not text:
+                result[text] = text
+            elif text not in result:
+                keys.setdefault(translation_key(text), []).append(text)
+
+        missing = {}
+        with self._lock:
+            for key, key_texts in keys.items():
+                translation = self._values.get(key)
+                if translation is None:
+                    missing[key] = key_texts
+                else:
+                    self._values.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    result.update((text, translation) for text in key_texts)
+
+        if missing:
+            found = self._load(settings, list(missing))
+            new = {key: self._get_translator().translate(key) for key in missing if key not in found}
+            if new:
+                self._save(settings, new)
+
+            with self._lock:
+                self.counters['persistent_hits'] += len(found)
+                self.counters['misses'] += len(new)
+                for key, translation in {**found, **new}.items():
+                    self._values[key] = translation
+                    result.update((text, translation) for text in missing[key])
+                while len(self._values) > int(settings.get('pimly.carriers.translation.cache_size', self.maxsize)):
+                    self._values.popitem(last=False)
+
+        return result
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            size = len(self._values)
+        total = sum(counters.values())
+        misses = counters.get('misses', 0)
+        return dict(counters, size=size, hit_ratio=(total - misses) / total if total else 0)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self.counters.clear()
+
+    def _get_translator(self):
+        if self._translator is None:
+            self._translator = Translator()
+        return self._translator
+
+    def _load(self, settings, keys):
+        path = self._get_path(settings)
+        if path is None:
+            return {}
+
+        found = {}
+        try:
+            with closing(sqlite3.connect(path, timeout=5)) as connection:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows = connection.execute(
+                        f"SELECT source, translation FROM translation WHERE source IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    found.update(rows)
+        except sqlite3.Error:
+            self.log.exception(f"Can not read translations from {path}")
+        return found
+
+    def _save(self, settings, translations):
+        path = self._get_path(settings)
+        if path is None:
+            return
+
+        try:
+            with closing(sqlite3.connect(path, timeout=5)) as connection, connection:
+                connection.executemany("INSERT OR REPLACE INTO translation VALUES (?, ?)", translations.items())
+        except sqlite3.Error:
+            self.log.exception(f"Can not save translations to {path}")
+
+    def _get_path(self, settings):
+        if not asbool(settings.get('pimly.carriers.translation.cache', True)):
+            return None
+
+        if self._path is None:
+            path = settings.get('pimly.carriers.translation.cache_path') or \
+                os.path.join(settings['pimly.carriers.main_path'], 'translations.db')
+            ensure_dir(os.path.dirname(path))
+            with closing(sqlite3.connect(path, timeout=5)) as connection, connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(self.create_sql)
+            self._path = path
+
+        return self._path
+
+
+translations = TranslationCache()
@@ -0,0 +1,108 @@
+import threading
+
+import requests
+from pyramid.settings import asbool
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter, который не позволяет отправить запрос без таймаута"""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+
+class HTTPTransport:
+    """
+    Пул keep-alive HTTP сессий для REST API керриеров.
+    Для каждого керриера создается своя requests.Session с ограниченным пулом соединений,
+    повтором запроса только при ошибке соединения (запрос еще не был отправлен) и обязательным таймаутом.
+    Настройки: pimly.carriers.http.[<carrier>.]pool_size / retries / connect_timeout / read_timeout
+    """
+    defaults = {
+        'pool_size': 10,
+        'retries': 2,
+        'connect_timeout': 10,
+        'read_timeout': 60,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._requests = {}
+
+    def session(self, settings, carrier_name):
+        name = getattr(carrier_name, 'name', carrier_name)
+        session = self._sessions.get(name)
+        if session is not None:
+            return session
+
+        with self._lock:
+            if name not in self._sessions:
+                self._sessions[name] = self._create_session(settings, name)
+
+        return self._sessions[name]
+
+    def stats(self):
+        """Количество запросов и открытых TCP/TLS соединений по каждому керриеру"""
+        stats = {}
+        for name, session in self._sessions.items():
+            connections = 0
+            # один и тот же адаптер смонтирован на https:// и http://
+            adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                connections += sum(pools[key].num_connections for key in pools.keys())
+
+            requests_count = self._requests.get(name, 0)
+            stats[name] = {
+                'requests': requests_count,
+                'connections': connections,
+                'reused': max(requests_count - connections, 0),
+            }
+        return stats
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._requests.clear()
+
+    def _create_session(self, settings, name):
+        pool_size = int(self._option(settings, name, 'pool_size'))
+        retries = int(self._option(settings, name, 'retries'))
+        timeout = (float(self._option(settings, name, 'connect_timeout')),
+                   float(self._option(settings, name, 'read_timeout')))
+
+        adapter = TimeoutHTTPAdapter(
+            timeout=timeout,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=asbool(self._option(settings, name, 'pool_block', False)),
+            max_retries=Retry(total=retries, connect=retries, read=0, redirect=0, status=0,
+                              backoff_factor=0.3, raise_on_status=False),
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.hooks['response'].append(lambda response, *args, **kwargs: self._count_request(name))
+        return session
+
+    def _count_request(self, name):
+        with self._lock:
+            self._requests[name] = self._requests.get(name, 0) + 1
+
+    def _option(self, settings, name, option, default=None):
+        value = settings.get(f'pimly.carriers.http.{name}.{option}')
+        if value is None:
+            value = settings.get(f'pimly.carriers.http.{option}', self.defaults.get(option, default))
+        return value
+
+
+http_transport = HTTPTransport()
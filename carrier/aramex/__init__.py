@@ -1,15 +1,12 @@
 from pimly.models import enum
 
 from ..abc.carrier import AbstractCarrier
-from .shipping import AramexShippingService
-
-from .tracking import TrackingService
-from .service_point import ServicePointUpdater
+from ..registry import LazyAttribute
 
 
 class Aramex(AbstractCarrier):
     name = enum.CarrierName.aramex
     awb_warning_limit = 6000
-    ShippingService = AramexShippingService
-    TrackingService = TrackingService
-    ServicePointUpdater = ServicePointUpdater
+    ShippingService = LazyAttribute('.shipping', 'AramexShippingService')
+    TrackingService = LazyAttribute('.tracking', 'TrackingService')
+    ServicePointUpdater = LazyAttribute('.service_point', 'ServicePointUpdater')
@@ -4,7 +4,10 @@ import requests
 import base64
 
 from pyramid.settings import asbool
+
+from pimly.models import enum
 from ..abc.exc import SendingOrderDelayed
+from ..abc.transport import http_transport
 
 
 class AramexOrderAPI:
@@ -17,18 +20,25 @@ class AramexOrderAPI:
         self.username = settings['pimly.aramex_name']
         self.password = settings['pimly.aramex_password']
         self.api_key = settings['pimly.aramex_api_key']
+        self.session = http_transport.session(settings, enum.CarrierName.aramex)
+
+    def signer(self):
+        """HMAC-SHA256 подпись тела запроса, может обновляться по мере записи документа"""
+        return hmac.new(key=bytes(self.api_key, 'utf-8'), digestmod=hashlib.sha256)
 
-    def send_shipping_file(self, shipping_xml):
-        body = shipping_xml.getvalue()
-        hmac_sha256 = hmac.new(key=bytes(self.api_key, 'utf-8'), msg=body, digestmod=hashlib.sha256)
+    def send_shipping_file(self, body, signer):
+        """
+        body - открытый файл с документом, который отправляется потоком, signer - подпись этого документа.
+        Возвращает ответ InfoLink
+        """
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 auth=(self.username, self.password),
                 data=body,
                 headers={
                     'Content-Type': 'application/xml',
-                    'x-hmac-sha256': base64.b64encode(hmac_sha256.digest()).decode(),
+                    'x-hmac-sha256': base64.b64encode(signer.digest()).decode(),
                 },
                 timeout=60
             )
@@ -38,9 +48,10 @@ class AramexOrderAPI:
             if response.status_code not in self.allowed_statuses:
                 raise SendingOrderDelayed(f"""
                     Invalid response code: {response.status_code},
-                    Request: {response.request.body},
+                    Request file: {body.name},
                     Response: {response.text}
                 """)
+            return response
 
     @property
     def api_url(self):
@@ -0,0 +1,126 @@
+import csv
+import heapq
+import logging
+import os
+import tempfile
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from sys import intern
+
+AramexTrackInfo = namedtuple('AramexTrackInfo', [
+    'order_awb',
+    'milestone',
+    'task_type',
+    'event_code',
+    'action_date',
+    'msg1',
+    'msg2',
+])
+
+COLUMNS = ('AWB', 'PINumber', 'ProblemCode', 'ActionDate', 'ActionTime', 'Comment1', 'Comment2')
+
+
+@lru_cache(maxsize=4096)
+def parse_action_date(action_date):
+    return datetime.strptime(action_date, "%d/%m/%y").date()
+
+
+@lru_cache(maxsize=2048)
+def parse_action_time(action_time):
+    return datetime.strptime(action_time, "%H:%M").time()
+
+
+class AramexEventReader:
+    """
+    Потоковое чтение файла событий Aramex: колонки берутся по позиции из заголовка, повторяющиеся
+    значения (коды, даты, комментарии) интернируются, даты и время разбираются через кеш.
+    groups отдает события по AWB в порядке AWB.
+    Если событий в файле больше spill_rows, отсортированные части пишутся во временные файлы
+    и сливаются (внешняя сортировка), поэтому память не зависит от размера файла
+    """
+    log = logging.getLogger('carriers_orders')
+    exception_log = logging.getLogger('carriers_orders_exceptions')
+
+    def __init__(self, milestones, categories, spill_rows=200000, tmp_dir=None):
+        self.milestones = milestones
+        self.categories = categories
+        self.spill_rows = spill_rows
+        self.tmp_dir = tmp_dir
+
+    def rows(self, file_path):
+        """(awb, event_code, action_date, action_time, comment1, comment2) для событий с известным milestone"""
+        with open(file_path, encoding='utf-8-sig', newline='') as src:
+            reader = csv.reader(src, skipinitialspace=True)
+            header = next(reader, None)
+            if header is None:
+                return
+
+            positions = [header.index(column) for column in COLUMNS]
+            width = max(positions) + 1
+            columns = itemgetter(*positions)
+            for row in reader:
+                if len(row) < width:
+                    row.extend([''] * (width - len(row)))
+                awb, pin_number, problem_code, action_date, action_time, comment1, comment2 = columns(row)
+                event_code = f"{pin_number.replace(' ', '')}{problem_code.replace(' ', '')}"
+                if event_code.upper() not in self.milestones:
+                    continue
+                yield (awb.replace(' ', ''), intern(event_code), intern(action_date.strip()), intern(action_time.strip()),
+                       intern(comment1.strip()), intern(comment2.strip()))
+
+    def event(self, row):
+        awb, event_code, action_date, action_time, comment1, comment2 = row
+        try:
+            event_date = datetime.combine(parse_action_date(action_date), parse_action_time(action_time))
+        except ValueError:
+            self.exception_log.exception("Aramex: Error during parse file. [Event Date format]")
+            return None
+
+        return AramexTrackInfo(
+            order_awb=awb,
+            task_type=self.categories.get(event_code),
+            milestone=self.milestones[event_code.upper()],
+            event_code=event_code,
+            action_date=event_date,
+            msg1=comment1,
+            msg2=comment2
+        )
+
+    def groups(self, file_path):
+        """(awb, [AramexTrackInfo]) по возрастанию AWB, события AWB в порядке файла"""
+        runs = []
+        try:
+            rows = []
+            for row in self.rows(file_path):
+                rows.append(row)
+                if len(rows) >= self.spill_rows:
+                    runs.append(self._spill(rows))
+                    rows = []
+
+            rows.sort(key=itemgetter(0))
+            if runs:
+                self.log.info(f"Aramex. {file_path}: merge {len(runs)} sorted parts")
+                rows = heapq.merge(*map(self._read_run, runs), rows, key=itemgetter(0))
+
+            for awb, awb_rows in groupby(rows, key=itemgetter(0)):
+                events = list(filter(None, map(self.event, awb_rows)))
+                if awb and events:
+                    yield awb, events
+        finally:
+            for path in runs:
+                os.remove(path)
+
+    def _spill(self, rows):
+        rows.sort(key=itemgetter(0))
+        fd, path = tempfile.mkstemp(prefix='aramex-events-', suffix='.csv', dir=self.tmp_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as dst:
+            csv.writer(dst).writerows(rows)
+        return path
+
+    @staticmethod
+    def _read_run(path):
+        with open(path, encoding='utf-8', newline='') as src:
+            yield from map(tuple, csv.reader(src))
@@ -0,0 +1,227 @@
+import base64
+import os
+import traceback
+from datetime import datetime
+from itertools import groupby
+
+import transaction
+from lxml import etree
+
+from pimlib.utils.files import ensure_dir
+
+from ..abc.exc import SendingOrderCancelled, SendingOrderDelayed
+
+
+class SignedFile:
+    """Файл архива, который обновляет HMAC подпись по мере записи"""
+
+    def __init__(self, file, signer):
+        self.file = file
+        self.signer = signer
+
+    def write(self, data):
+        self.signer.update(data)
+        return self.file.write(data)
+
+
+class InfoLinkWriter:
+    """
+    Потоковая запись InfoLink документа с несколькими HAWB и общим AccessRequest.
+    Элементы HAWB пишутся по одному, invoice PDF кодируется в base64 частями,
+    поэтому документ целиком в памяти не собирается.
+    """
+    chunk_size = 3 * 64 * 1024  # кратно 3, чтобы части base64 склеивались без padding
+
+    def __init__(self, shipping_xmls):
+        self.shipping_xmls = shipping_xmls
+
+    def write(self, output):
+        with etree.xmlfile(output) as xf:
+            with xf.element('InfoLinkDocument'):
+                xf.write(self.shipping_xmls[0]._access_request())
+                for shipping_xml in self.shipping_xmls:
+                    self._write_hawb(xf, shipping_xml)
+
+    def _write_hawb(self, xf, shipping_xml):
+        with xf.element('HAWB'):
+            for element in shipping_xml._hawb_head():
+                xf.write(element)
+            with xf.element('Invoice'):
+                for chunk in self._base64_chunks(shipping_xml.waybill_document):
+                    xf.write(chunk)
+            for element in shipping_xml._items():
+                xf.write(element)
+
+    def _base64_chunks(self, document):
+        document.seek(0)
+        for chunk in iter(lambda: document.read(self.chunk_size), b''):
+            yield base64.b64encode(chunk).decode()
+        document.seek(0)
+
+
+class InfoLinkReply:
+    """
+    Результаты по HAWB в ответе InfoLink: элементы с HAWBNumber и статусом (Status/Result)
+    или текстом ошибки (Error/ErrorMessage/Message)
+    """
+    error_statuses = {'error', 'errors', 'failed', 'failure', 'rejected', 'false'}
+
+    @classmethod
+    def errors(cls, content):
+        """{HAWBNumber: текст ошибки или None}. None, если в ответе нет результатов по отдельным HAWB"""
+        try:
+            root = etree.fromstring(content)
+        except (etree.XMLSyntaxError, ValueError):
+            return None
+
+        results = {}
+        for element in root.iter():
+            number = element.findtext('HAWBNumber')
+            if number is None:
+                continue
+            status = (element.findtext('Status') or element.findtext('Result') or '').strip()
+            error = element.findtext('ErrorMessage') or element.findtext('Error')
+            if status.lower() in cls.error_statuses or (not status and error):
+                results[number.strip()] = error or element.findtext('Message') or status
+            else:
+                results[number.strip()] = None
+
+        return results or None
+
+
+class InfoLinkMixin:
+    """
+    Отправка шипментов Aramex InfoLink документами. Документ пишется потоком в архивный файл
+    с одновременным подсчетом HMAC подписи, затем файл отправляется потоком в теле запроса.
+    Пакетная отправка: один документ (одна подпись и один HTTP запрос) на группу шипментов
+    с одинаковым EntityID, размер документа ограничен количеством HAWB и байтами.
+    Результат каждого шипмента берется из ответа по его HAWB (InfoLinkReply).
+    Настройки: pimly.carriers.outbox.[<carrier>.]batch_size / batch_max_bytes
+    """
+    order_api_class = None
+    hawb_overhead_bytes = 8 * 1024
+
+    def send_shipments(self, shipments):
+        """Отправка пачки шипментов. Возвращает {shipment.id: исключение или None}"""
+        results = {}
+        shipping_xmls = []
+        for shipment in shipments:
+            savepoint = transaction.savepoint()
+            try:
+                if not shipment.tracking_number:
+                    shipment.tracking_number = self.get_tracking_number()
+                elif not self.resend_allowed:
+                    raise SendingOrderDelayed(f"Resend for {self.carrier_name.value} carrier is not allowed")
+                shipping_xmls.append(self._shipping_xml_builder(shipment))
+            except SendingOrderCancelled as exc:
+                # выданный номер возвращается в пул вместе с откатом
+                savepoint.rollback()
+                results[shipment.id] = exc
+            except self.send_exceptions as exc:
+                self._update_shipping_task(shipment, str(exc), traceback.format_exc())
+                results[shipment.id] = exc
+
+        for batch in self._batches(shipping_xmls):
+            batch_shipments = [shipping_xml.shipment for shipping_xml in batch]
+            timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+            file_name = f"batch-{timestamp}-{batch_shipments[0].order.code}-{len(batch)}.xml"
+            try:
+                errors = self._send_document(batch, file_name)
+            except self.send_exceptions as exc:
+                self.exception_log.exception(f"Error during sending {len(batch)} orders to {self.carrier_name.value}")
+                for shipment in batch_shipments:
+                    self._update_shipping_task(shipment, str(exc), traceback.format_exc())
+                    results[shipment.id] = exc
+                continue
+
+            sent = []
+            for shipment in batch_shipments:
+                exc = self._reply_error(errors, shipment.tracking_number, file_name)
+                if exc is None:
+                    sent.append(shipment)
+                    results[shipment.id] = None
+                    continue
+
+                self.exception_log.error(f"Error during sending order {shipment.order.code} to {self.carrier_name.value}: {exc}")
+                self._update_shipping_task(shipment, str(exc), '')
+                results[shipment.id] = exc
+
+            if sent:
+                self.log.info(f"{len(sent)} shipments were sent to {self.carrier_name.value} in one InfoLink document: "
+                              f"{', '.join(shipment.order.code for shipment in sent)}")
+                self._delete_shipping_tasks(sent)
+
+        return results
+
+    def _send_shipping_information(self, shipment):
+        file_name = f"{shipment.order.code}.xml"
+        errors = self._send_document([self._shipping_xml_builder(shipment)], file_name)
+        exc = self._reply_error(errors, shipment.tracking_number, file_name)
+        if exc is not None:
+            raise exc
+
+    @staticmethod
+    def _reply_error(errors, tracking_number, file_name):
+        """
+        Ошибка шипмента по ответу InfoLink или None. Отправленным считается только HAWB, подтвержденный в ответе:
+        ответ без результатов по HAWB (ошибка, страница ошибки) означает, что документ не принят
+        """
+        if errors is None:
+            return SendingOrderDelayed(f"InfoLink reply for {file_name} has no HAWB results")
+        if tracking_number not in errors:
+            return SendingOrderDelayed(f"HAWB {tracking_number} is missing in InfoLink reply for {file_name}")
+        if errors[tracking_number]:
+            return SendingOrderDelayed(f"HAWB {tracking_number} was rejected: {errors[tracking_number]}")
+        return None
+
+    def _send_document(self, shipping_xmls, file_name):
+        """Отправка документа. Возвращает InfoLinkReply.errors ответа"""
+        api = self.order_api_class(self.settings)
+        signer = api.signer()
+        file_path = os.path.join(self.local_path, file_name)
+        ensure_dir(self.local_path)
+        with open(file_path, 'wb') as f:
+            InfoLinkWriter(shipping_xmls).write(SignedFile(f, signer))
+
+        with open(file_path, 'rb') as body:
+            response = api.send_shipping_file(body, signer)
+        errors = InfoLinkReply.errors(response.content)
+        if errors is None:
+            self.exception_log.error(f"{self.carrier_name.value}: InfoLink reply for {file_name} has no HAWB results: "
+                                     f"{response.content[:2000]!r}")
+        return errors
+
+    @property
+    def batch_size(self):
+        return int(self._batch_option('batch_size', 1))
+
+    @property
+    def batch_max_bytes(self):
+        return int(self._batch_option('batch_max_bytes', 20 * 1024 * 1024))
+
+    def _batches(self, shipping_xmls):
+        def credentials(shipping_xml):
+            return shipping_xml.entity_id or '', shipping_xml.entity_pin or ''
+
+        for _, group in groupby(sorted(shipping_xmls, key=credentials), key=credentials):
+            batch, batch_bytes = [], 0
+            for shipping_xml in group:
+                size = self._estimated_size(shipping_xml)
+                if batch and (len(batch) >= self.batch_size or batch_bytes + size > self.batch_max_bytes):
+                    yield batch
+                    batch, batch_bytes = [], 0
+                batch.append(shipping_xml)
+                batch_bytes += size
+
+            if batch:
+                yield batch
+
+    def _estimated_size(self, shipping_xml):
+        # invoice PDF передается в base64
+        return shipping_xml.waybill_document.getbuffer().nbytes * 4 // 3 + self.hawb_overhead_bytes
+
+    def _batch_option(self, option, default):
+        value = self.settings.get(f'pimly.carriers.outbox.{self.carrier_name.name}.{option}')
+        if value is None:
+            value = self.settings.get(f'pimly.carriers.outbox.{option}', default)
+        return value
@@ -0,0 +1,224 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import stat
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import paramiko
+from pyramid.settings import asbool
+
+RemoteFile = namedtuple('RemoteFile', ['name', 'size', 'mtime'])
+
+
+class FetchManifest:
+    """
+    Файлы, уже загруженные с SFTP: имя -> (размер, mtime). Хранится в json и пишется атомарно,
+    record можно вызывать из потоков загрузки
+    """
+    log = logging.getLogger('carriers_orders')
+
+    def __init__(self, path):
+        self.path = path
+        self.files = self._load()
+        self._lock = threading.Lock()
+
+    def is_fetched(self, remote_file):
+        return self.files.get(remote_file.name) == (remote_file.size, remote_file.mtime)
+
+    def add(self, remote_file):
+        self.files[remote_file.name] = (remote_file.size, remote_file.mtime)
+
+    def record(self, remote_file):
+        with self._lock:
+            self.add(remote_file)
+            self.save()
+
+    def prune(self, remote_files):
+        """Забыть файлы, которых больше нет на сервере"""
+        names = {remote_file.name for remote_file in remote_files}
+        self.files = {name: value for name, value in self.files.items() if name in names}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as dst:
+            json.dump(self.files, dst)
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path) as src:
+                return {name: tuple(value) for name, value in json.load(src).items()}
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            self.log.exception(f"Aramex. Broken fetch manifest {self.path}, all remote files will be fetched")
+            return {}
+
+
+class SFTPChannels:
+    """Несколько SFTP каналов поверх одного SSH соединения, у каждого потока загрузки свой канал"""
+
+    def __init__(self, host, login, password, port=22, timeout=60):
+        self.host = host
+        self.login = login
+        self.password = password
+        self.port = port
+        self.timeout = timeout
+        self.transport = None
+        self._local = threading.local()
+        self._clients = []
+
+    def __enter__(self):
+        self.transport = paramiko.Transport((self.host, self.port))
+        self.transport.banner_timeout = self.timeout
+        self.transport.connect(username=self.login, password=self.password)
+        return self
+
+    def __exit__(self, *exc_info):
+        for client in self._clients:
+            client.close()
+        self._clients.clear()
+        self.transport.close()
+
+    def client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = paramiko.SFTPClient.from_transport(self.transport)
+            client.get_channel().settimeout(self.timeout)
+            self._local.client = client
+            self._clients.append(client)
+        return client
+
+
+class AramexEventSource:
+    """
+    Файлы событий Aramex для Aramex и Aramex SA. Сначала отдаются локальные файлы, оставшиеся
+    с прошлого запуска, затем новые файлы с SFTP по мере загрузки: файлы качаются параллельно
+    по нескольким каналам, уже загруженные (имя, размер, mtime в манифесте) пропускаются.
+    Файлы, оставшиеся в legacy_dirs (прежние отдельные директории керриеров), переносятся в local_dir
+    и обрабатываются как локальные.
+    Настройки: pimly.carriers.aramex.tracking.sftp_channels - параллельных загрузок
+    """
+    log = logging.getLogger('carriers_orders')
+    exception_log = logging.getLogger('carriers_orders_exceptions')
+
+    def __init__(self, settings, remote_dir, local_dir, legacy_dirs=()):
+        self.settings = settings
+        self.remote_dir = remote_dir
+        self.local_dir = local_dir
+        self.legacy_dirs = legacy_dirs
+        self.channels = int(settings.get('pimly.carriers.aramex.tracking.sftp_channels', 4))
+        self.remove_src = asbool(settings['pimly.order_api.production_mode'])
+        self.manifest = FetchManifest(os.path.join(local_dir, '.manifest.json'))
+        self.stats = Counter()
+
+    @contextmanager
+    def lock(self):
+        """Один запуск на директорию: второй керриер, запущенный одновременно, получает False"""
+        with open(os.path.join(self.local_dir, '.lock'), 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def files(self):
+        self.stats.clear()
+        local_files = self._local_files()
+        yield from local_files
+
+        started = time.perf_counter()
+        with SFTPChannels(host=self.settings['pimly.feed.sftp.server'],
+                          login=self.settings['pimly.feed.sftp.user'],
+                          password=self.settings['pimly.feed.sftp.password']) as channels:
+            remote_files = self._remote_files(channels)
+            self.manifest.prune(remote_files)
+            new_files = [remote_file for remote_file in remote_files if not self.manifest.is_fetched(remote_file)]
+            self.stats['skipped'] = len(remote_files) - len(new_files)
+
+            with ThreadPoolExecutor(max_workers=self.channels, thread_name_prefix='aramex-sftp') as executor:
+                futures = {executor.submit(self._download, channels, remote_file, local_files): remote_file
+                           for remote_file in new_files}
+                try:
+                    for future in as_completed(futures):
+                        remote_file = futures[future]
+                        try:
+                            local_path = future.result()
+                        except Exception:
+                            self.stats['failed'] += 1
+                            self.exception_log.exception(f"Aramex. Can not download {remote_file.name}")
+                            continue
+
+                        self.stats['downloaded'] += 1
+                        self.stats['bytes'] += remote_file.size
+                        yield local_path
+                except GeneratorExit:
+                    # конвейер остановлен: ждем только уже идущие загрузки, их файлы останутся локальными
+                    # и будут обработаны следующим запуском
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        self.log.info(f"Aramex. SFTP: {len(local_files)} local files, {self.stats['downloaded']} downloaded "
+                      f"({self.stats['bytes'] // 1024} KB), {self.stats['skipped']} already fetched, "
+                      f"{self.stats['failed']} failed in {time.perf_counter() - started:.1f}s")
+
+    def _local_files(self):
+        for legacy_dir in self.legacy_dirs:
+            self._drain(legacy_dir)
+        files = (os.path.join(self.local_dir, name) for name in sorted(os.listdir(self.local_dir))
+                 if not name.startswith('.'))
+        return list(filter(os.path.isfile, files))
+
+    def _drain(self, legacy_dir):
+        try:
+            names = sorted(os.listdir(legacy_dir))
+        except FileNotFoundError:
+            return
+
+        moved = 0
+        for name in names:
+            src = os.path.join(legacy_dir, name)
+            if name.startswith('.') or not os.path.isfile(src):
+                continue
+            dst = os.path.join(self.local_dir, name)
+            if os.path.exists(dst):
+                base, ext = os.path.splitext(name)
+                dst = os.path.join(self.local_dir, f"{base}-{os.path.basename(os.path.dirname(legacy_dir))}{ext}")
+            shutil.move(src, dst)
+            moved += 1
+        if moved:
+            self.log.info(f"Aramex. {moved} unprocessed files moved from {legacy_dir} to {self.local_dir}")
+
+    def _remote_files(self, channels):
+        attributes = channels.client().listdir_attr(self.remote_dir)
+        remote_files = [RemoteFile(attr.filename, attr.st_size, attr.st_mtime)
+                        for attr in attributes if stat.S_ISREG(attr.st_mode)]
+        return sorted(remote_files, key=lambda remote_file: (remote_file.mtime, remote_file.name))
+
+    def _download(self, channels, remote_file, local_files):
+        local_path = os.path.join(self.local_dir, remote_file.name)
+        if local_path in local_files:
+            name, ext = os.path.splitext(remote_file.name)
+            local_path = os.path.join(self.local_dir, f"{name}-{remote_file.mtime}{ext}")
+
+        remote_path = f"{self.remote_dir.rstrip('/')}/{remote_file.name}"
+        tmp_path = os.path.join(self.local_dir, f".{remote_file.name}.part")
+        client = channels.client()
+        client.get(remote_path, tmp_path)
+        os.replace(tmp_path, local_path)
+        # файл записывается в манифест сразу после загрузки, даже если его не успеют отдать конвейеру
+        self.manifest.record(remote_file)
+        if self.remove_src:
+            client.remove(remote_path)
+        return local_path
@@ -10,6 +10,7 @@ from reportlab.platypus import (
     PageBreak,
 )
 
+from pimly.models.carrier.models import Carrier
 from pimly.utils import helpers as h
 from pimly.utils.vat import VATOrder
 from ...abc.pdf import AbstractShipmentPDF, SimpleDocWithoutPadding, arabic_text
@@ -155,7 +156,7 @@ class ShipmentPDF(AbstractShipmentPDF):
             spaceBefore=0,
         )
         bold = '<font name="Arial-Bold">{}</font><br/>'
-        carrier_settings = self.shipment.carrier.get_settings(self.order.channel.code)
+        carrier_settings = Carrier.cached_settings(self.shipment.carrier.name, self.order.channel.code)
         shipment_cost = self.shipment.totals.total
         params = {
             'weight': '0.5 KG',
@@ -1,9 +1,8 @@
-import requests
 from pyramid.settings import asbool
 
-from pimly.models import DBSession
 from pimly.models.enum import CarrierName
 from ..abc.service_point import Location, AbstractServicePointUpdater
+from ..abc.transport import http_transport
 from ..models import Carrier
 
 
@@ -29,9 +28,10 @@ class ServicePointAPI:
     def __init__(self, settings):
         production_mode = asbool(settings.get('pimly.order_api.production_mode', False))
         self.url = self.production_url if production_mode else self.staging_url
+        self.session = http_transport.session(settings, CarrierName.aramex)
 
     def get_locations(self, country_code):
-        response = requests.post(
+        response = self.session.post(
             self.url,
             timeout=60,
             headers={"Content-Type": "application/json", "Accept": "application/json"},
@@ -67,8 +67,7 @@ class ServicePointAPI:
                 )
 
     def _body(self, country_code):
-        carrier = DBSession.query(Carrier).filter(Carrier.name == CarrierName.aramex).one()
-        carrier_settings = carrier.get_settings()
+        carrier_settings = Carrier.cached_settings(CarrierName.aramex)
         return {
             'ClientInfo': {
                 'UserName': carrier_settings.sp_username,
@@ -1,26 +1,23 @@
-import base64
-import io
 import os
 from datetime import datetime
 from itertools import chain
 
-from lxml import etree
 from lxml.builder import E
 
-from pimlib.utils.files import ensure_dir
-
 from pimly.models import enum
 from pimly.utils.vat import VATOrder
 
 from .api import AramexOrderAPI
+from .infolink import InfoLinkMixin
 from .pdf import click_and_collect, home_collection
 from .pdf.invoice import EgyptInvoicePDF, SaudiArabiaInvoicePDF, ArabEmiratesInvoicePDF
 from ..abc.pdf import EnigmoInvoicePDF, BaseInvoicePDF
 from ..abc.shipping import AbstractShippingService, TrackingNumberMixin
 
 
-class AramexShippingService(TrackingNumberMixin, AbstractShippingService):
+class AramexShippingService(InfoLinkMixin, TrackingNumberMixin, AbstractShippingService):
     carrier_name = enum.CarrierName.aramex
+    order_api_class = AramexOrderAPI
     invoice_pdf_creators = {
         'EG': EgyptInvoicePDF,
         'SA': SaudiArabiaInvoicePDF,
@@ -31,8 +28,8 @@ class AramexShippingService(TrackingNumberMixin, AbstractShippingService):
         super().__init__(settings, channel_code)
         self.local_path = os.path.join(self.settings['pimly.carriers.main_path'], self.carrier_name.name, 'shipping_files')
 
-    def can_send_shipment(self, shipment):
-        return shipment.delivery_type == enum.DeliveryType.international and self.tracking_number_qs.count() > 0
+    def can_send_shipment(self, shipment, timeout=None):
+        return shipment.delivery_type == enum.DeliveryType.international and self.has_tracking_numbers()
 
     def create_shipping_document(self, shipment):
         creators = {
@@ -57,27 +54,12 @@ class AramexShippingService(TrackingNumberMixin, AbstractShippingService):
     def _resend_shipment(self, shipment):
         self._send_shipping_information(shipment)
 
-    def _send_shipping_information(self, shipment):
-        shipping_xml = self._create_shipping_xml(shipment)
-        self._save_shipping_xml(shipment.order, shipping_xml)
-        api = AramexOrderAPI(self.settings)
-        api.send_shipping_file(shipping_xml)
-
-    def _create_shipping_xml(self, shipment):
+    def _shipping_xml_builder(self, shipment):
         waybill_document = self.create_waybill_document(shipment, carrier_settings=self.carrier_settings)
         if shipment.order.shipping_method_type == enum.ShippingMethod.click_and_collect:
-            shipping_xml = ClickAndCollectShippingXML(shipment, waybill_document, self.carrier_settings)
-        else:
-            shipping_xml = HomeCollectionShippingXML(shipment, waybill_document, self.carrier_settings)
-
-        return shipping_xml.create()
+            return ClickAndCollectShippingXML(shipment, waybill_document, self.carrier_settings)
 
-    def _save_shipping_xml(self, order, shipping_xml):
-        file_path = os.path.join(self.local_path, f"{order.code}.xml")
-        ensure_dir(self.local_path)
-        with open(file_path, 'wb') as f:
-            f.write(shipping_xml.getvalue())
-        shipping_xml.seek(0)
+        return HomeCollectionShippingXML(shipment, waybill_document, self.carrier_settings)
 
 
 class HomeCollectionShippingXML:
@@ -94,18 +76,6 @@ class HomeCollectionShippingXML:
         self.account_number = self.carrier_settings.account_number
         self.account_post_code = self.carrier_settings.account_post_code
 
-    def create(self):
-        buffer = io.BytesIO()
-        document = etree.ElementTree(
-            E.InfoLinkDocument(
-                self._access_request(),
-                self._hawb(),
-            )
-        )
-        document.write(buffer)
-        buffer.seek(0)
-        return buffer
-
     def _access_request(self):
         return E.AccessRequest(
             E.DocumentType('215'),
@@ -121,15 +91,14 @@ class HomeCollectionShippingXML:
             E.Reference5(),
         )
 
-    def _hawb(self):
-        hawbs = chain(
+    def _hawb_head(self):
+        """Элементы HAWB до Invoice"""
+        return chain(
             self._order_info(),
             self._shipper_info(),
             self._consignee_info(),
             self._remarks(),
-            self._items(),
         )
-        return E.HAWB(*hawbs)
 
     def _order_info(self):
         return [
@@ -202,7 +171,6 @@ class HomeCollectionShippingXML:
                     E.ConsigneeTaxIDVATEINNumber(self.order.document.document_number if self.order.document else '')
                 )
             ),
-            E.Invoice(base64.b64encode(self.waybill_document.getvalue()).decode()),
         ]
 
     def _items(self):
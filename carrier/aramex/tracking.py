@@ -1,24 +1,19 @@
-import csv
 import os
 import shutil
-import transaction
-from _operator import attrgetter
-from collections import namedtuple
 from datetime import datetime
-from itertools import groupby
 
 from pimlib.utils.files import ensure_dir
-from pyramid.settings import asbool
-from sqlalchemy.orm import selectinload
 
 from pimly.models import DBSession, enum
-from pimly.models.orders import Order, OrderShipment
+from pimly.models.orders import OrderShipment
 from pimly.models.task_manager.aramex_source import ORDER_EVENT_CATEGORY, TASK_HANDLERS
-from pimly.models.tracking.enum import MilestoneType, OrderShipmentStatus
+from pimly.models.tracking.enum import MilestoneType
 from pimly.models.tracking.models import ShipmentMilestone
 from pimly.models.carrier.abc.tracking import AbstractTrackingUpdater
-from pimly.utils.downloaders import SFTPLoader
-from pimly.utils import grouper
+from pimly.utils.cache import cached_property
+from ..registry import carrier_registry
+from .events import AramexEventReader
+from .ingest import AramexEventSource
 
 MILESTONES = {
     "SH249": MilestoneType.customer_contacted,
@@ -140,128 +135,94 @@ MILESTONES = {
 }
 
 
-AramexTrackInfo = namedtuple('AramexTrackInfo', [
-    'order_awb',
-    'milestone',
-    'task_type',
-    'event_code',
-    'action_date',
-    'msg1',
-    'msg2',
-])
-
-
 class TrackingService(AbstractTrackingUpdater):
+    """
+    Трекинг Aramex и Aramex SA из общих файлов событий на SFTP. Запуск любого из керриеров
+    загружает и разбирает новые файлы один раз для обоих, события каждого AWB пишутся
+    трекером керриера, которому принадлежит шипмент
+    """
     carrier_name = enum.CarrierName.aramex
+    shared_carriers = ('aramex', 'aramex_sa')
     remote_dir = "carriers/aramex/tracking_numbers/"
+    parse_grouped = True
 
     def __init__(self, settings, **kwargs):
         super().__init__(settings, **kwargs)
-        self.src_path = os.path.join(self.settings['pimly.carriers.main_path'], self.carrier_name.name, 'task_events')
+        self.src_path = os.path.join(self.settings['pimly.carriers.main_path'], 'aramex', 'task_events')
         self.archive_path = os.path.join(self.src_path, 'Archive')
-        self.production_mode = asbool(settings['pimly.order_api.production_mode'])
+        self.sort_path = os.path.join(self.src_path, 'Sort')
         ensure_dir(self.archive_path)
-        self.loader = SFTPLoader(
-            host=settings['pimly.feed.sftp.server'],
-            login=settings['pimly.feed.sftp.user'],
-            password=settings['pimly.feed.sftp.password'],
+        ensure_dir(self.sort_path)
+        # до общей загрузки каждый керриер качал файлы в свою task_events: необработанные файлы оттуда переносятся
+        legacy_dirs = [os.path.join(self.settings['pimly.carriers.main_path'], carrier_name, 'task_events')
+                       for carrier_name in self.shared_carriers if carrier_name != 'aramex']
+        self.source = AramexEventSource(settings, self.remote_dir, self.src_path, legacy_dirs)
+        self.event_reader = AramexEventReader(
+            MILESTONES, ORDER_EVENT_CATEGORY,
+            spill_rows=int(settings.get('pimly.carriers.aramex.tracking.spill_rows', 200000)),
+            tmp_dir=self.sort_path,
         )
 
     def update_trackings(self):
-        self.loader.download_files(self.remote_dir, self.src_path, remove_src=self.production_mode, timeout=60)
-        files = (os.path.join(self.src_path, f) for f in os.listdir(self.src_path))
-        for file_path in filter(os.path.isfile, files):
+        with self.source.lock() as locked:
+            if not locked:
+                self.log.info(f"{self.carrier_name.value}. Aramex events are processed by another run")
+                return
+            super().update_trackings()
+
+    @cached_property
+    def carrier_updaters(self):
+        """{carrier_id: трекер керриера}"""
+        updaters = {}
+        for carrier_name in self.shared_carriers:
+            Updater = carrier_registry.get(carrier_name).TrackingService
+            updater = self if type(self) is Updater else Updater(self.settings)
+            updaters[updater.carrier_id] = updater
+        return updaters
+
+    def fetch(self, tracking_numbers):
+        for file_path in self.source.files():
             self.log.info(f"Aramex. Process file: {file_path}")
-
-            order_trackings = self._parse_file(file_path)
-            self._update_shipment_milestones(order_trackings)
-
-            delivered_tracking_numbers = [tracking['hawb'] for tracking in order_trackings if tracking['is_delivered']]
-            self._set_delivered_status(delivered_tracking_numbers)
-            self._update_shipment_delivery_date(delivered_tracking_numbers)
-            self._create_order_tasks(order_trackings)
-            self._archive_file(file_path)
-
-    def _parse_file(self, file_path):
-        with open(file_path, encoding='utf-8-sig') as src:
-            reader = csv.DictReader(src, skipinitialspace=True)
-            tracking_events = filter(None, (self._parse_row(row) for row in reader))
-            tracking_events = sorted(tracking_events, key=attrgetter('order_awb'))
-
-        order_events = []
-        for awb, events in groupby(tracking_events, key=attrgetter('order_awb')):
-            awb_events = list(events)
-            order_events.append({
-                'hawb': awb,
-                'is_delivered': self._check_delivered_status(awb_events),
-                'tracking_info': awb_events
-            })
-
-        return order_events
-
-    def _parse_row(self, track):
-        pin_number = track['PINumber'].replace(' ', '') if track['PINumber'] else ''
-        problem_code = track['ProblemCode'].replace(' ', '') if track['ProblemCode'] else ''
-        event_code = f"{pin_number}{problem_code}"
-        milestone = MILESTONES.get(event_code.upper())
-        if not milestone:
-            return None
-
-        action_date = track['ActionDate'].strip() if track['ActionDate'] else ''
-        action_time = track['ActionTime'].strip() if track['ActionTime'] else ''
-
-        try:
-            event_date = datetime.strptime(f"{action_date}T{action_time}", "%d/%m/%yT%H:%M")
-        except ValueError:
-            self.exception_log.exception("Aramex: Error during parse file. [Event Date format]")
-            return None
-
-        comment1 = track['Comment1'].strip() if track['Comment1'] else ''
-        comment2 = track['Comment2'].strip() if track['Comment2'] else ''
-
-        return AramexTrackInfo(
-            order_awb=track['AWB'].replace(' ', '') if track['AWB'] else '',
-            task_type=ORDER_EVENT_CATEGORY.get(event_code),
-            milestone=milestone,
-            event_code=event_code,
-            action_date=event_date,
-            msg1=comment1,
-            msg2=comment2
+            yield file_path
+
+    def parse(self, file_path):
+        for awb, events in self.event_reader.groups(file_path):
+            for tracking in events:
+                yield awb, tracking
+
+    def _persist(self, orders_tracking_info):
+        owners = DBSession.query(OrderShipment.tracking_number, OrderShipment.carrier_id) \
+            .filter(OrderShipment.tracking_number.in_([tracking['hawb'] for tracking in orders_tracking_info]),
+                    OrderShipment.carrier_id.in_(list(self.carrier_updaters)))
+        carrier_ids = dict(owners)
+
+        tracking_by_carrier = {}
+        for tracking in orders_tracking_info:
+            carrier_id = carrier_ids.get(tracking['hawb'])
+            if carrier_id:
+                tracking_by_carrier.setdefault(carrier_id, []).append(tracking)
+
+        for carrier_id, carrier_tracking_info in tracking_by_carrier.items():
+            super(TrackingService, self.carrier_updaters[carrier_id])._persist(carrier_tracking_info)
+        self._create_order_tasks(orders_tracking_info)
+
+    def _batch_done(self, file_path):
+        self._archive_file(file_path)
+
+    def _get_tracking_numbers(self):
+        """События берутся из всех новых файлов, выборка AWB не нужна"""
+        return None
+
+    def _create_milestone(self, shipment_id, tracking):
+        return ShipmentMilestone(
+            shipment_id=shipment_id,
+            is_customer_view=tracking.milestone.args['is_customer_view'],
+            milestone=tracking.milestone,
+            carrier_code=tracking.event_code,
+            event_date=tracking.action_date,
+            description=". ".join(filter(None, [tracking.msg1, tracking.msg2])),
         )
 
-    def _check_delivered_status(self, order_tracking):
-        for tracking in order_tracking:
-            if MilestoneType.is_delivered_milestone(tracking.milestone):
-                return True
-        return False
-
-    def _update_shipment_milestones(self, orders_tracking_info):
-        for order_tracking in orders_tracking_info:
-            with transaction.manager:
-                order_shipment = DBSession.query(OrderShipment) \
-                    .filter(OrderShipment.status_history != None,
-                            ~OrderShipment.current_status.in_([OrderShipmentStatus.delivered, OrderShipmentStatus.returned]),
-                            OrderShipment.carrier_id == self.carrier_id,
-                            OrderShipment.tracking_number == order_tracking['hawb']) \
-                    .first()
-                if not order_shipment:
-                    continue
-
-                milestones = [ShipmentMilestone(
-                        shipment_id=order_shipment.id,
-                        is_customer_view=tracking.milestone.args['is_customer_view'],
-                        milestone=tracking.milestone,
-                        carrier_code=tracking.event_code,
-                        event_date=tracking.action_date,
-                        description=". ".join(filter(None, [tracking.msg1, tracking.msg2])))
-                    for tracking in order_tracking['tracking_info']]
-                new_milestones = order_shipment.filter_milestones(milestones)
-                # Sort for the further correct addition of ShipmentNotification
-                new_milestones.sort()
-                DBSession.add_all(new_milestones)
-                DBSession.refresh(order_shipment)
-                order_shipment.update_status_info()
-
     def _create_order_tasks(self, orders_tracking_info):
         event_tasks = {}
         for order_tracking in orders_tracking_info:
@@ -274,31 +235,6 @@ class TrackingService(AbstractTrackingUpdater):
             handler = Handler()
             handler.create_tasks(events)
 
-    def _set_delivered_status(self, delivered_tracking_numbers):
-        order_shipment_qs = DBSession.query(OrderShipment.order_id) \
-            .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
-                    OrderShipment.carrier_id == self.carrier_id)
-
-        for group in grouper(100, [order_shipment.order_id for order_shipment in order_shipment_qs]):
-            delivered_order_ids = list(filter(None, group))
-            with transaction.manager:
-                order_qs = DBSession.query(Order) \
-                    .filter(Order.id.in_(delivered_order_ids)) \
-                    .options(selectinload('shipments').load_only('current_status'))
-                for order in order_qs:
-                    if all(sh.current_status == OrderShipmentStatus.delivered for sh in order.shipments):
-                        order.status = enum.OrderStatus.delivered
-                        DBSession.flush()
-                self.log.info(f"Aramex. Set delivered status for orders (id): {delivered_order_ids}")
-
-    def _update_shipment_delivery_date(self, delivered_tracking_numbers):
-        with transaction.manager:
-            DBSession.query(OrderShipment) \
-                .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
-                        OrderShipment.current_status == OrderShipmentStatus.delivered) \
-                .update({OrderShipment.delivered_date: datetime.utcnow()},
-                        synchronize_session=False)
-
     def _archive_file(self, file_path):
         current_time = datetime.utcnow().strftime("%Y-%m-%d_%H:%M")
         file_name = os.path.basename(file_path)
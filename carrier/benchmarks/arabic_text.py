@@ -0,0 +1,67 @@
+"""
+Shaping и bidi для текста PDF: без кеша и через ArabicShaper на корпусе адресов стран Залива.
+Строки корпуса повторяются с распределением Ципфа, как имена и города в реальных заказах,
+и каждый адрес обрабатывается по разу на коробку.
+Запуск: python -m pimly.models.carrier.benchmarks.arabic_text [--orders N] [--boxes N]
+"""
+import argparse
+import random
+import time
+
+from ..abc.pdf.base import ArabicShaper, shape_arabic
+from ..dhl.city_tables import SA
+
+FIRST_NAMES = ['محمد', 'عبدالله', 'فاطمة', 'نورة', 'خالد', 'سارة', 'أحمد', 'ريم', 'Mohammed', 'Fatima', 'Abdullah', 'Noura']
+LAST_NAMES = ['العتيبي', 'القحطاني', 'الشمري', 'الدوسري', 'المطيري', 'الحربي', 'Al Otaibi', 'Al Qahtani', 'Al Shammari']
+CITIES = ['الرياض', 'جدة', 'الدمام', 'مكة المكرمة', 'المدينة المنورة', 'الخبر', 'الكويت', 'دبي', 'أبوظبي', 'الدوحة',
+          'المنامة', 'مسقط'] + list(SA)[:60]
+DISTRICTS = ['حي النرجس', 'حي الملقا', 'حي الروضة', 'السالمية', 'حولي', 'Al Barsha', 'Jumeirah', 'Al Olaya', '']
+STREETS = ['شارع الأمير سلطان', 'طريق الملك فهد', 'شارع التحلية', 'King Abdullah Rd', 'Sheikh Zayed Rd', 'شارع ٢٣']
+COUNTRIES = ['Saudi Arabia', 'Kuwait', 'United Arab Emirates', 'Qatar', 'Bahrain', 'Oman']
+
+
+def zipf_choice(rnd, values):
+    return values[min(int(rnd.paretovariate(1.2)) - 1, len(values) - 1)]
+
+
+def corpus(orders, seed=1):
+    rnd = random.Random(seed)
+    addresses = []
+    for _ in range(orders):
+        addresses.append([
+            f"{zipf_choice(rnd, FIRST_NAMES)} {zipf_choice(rnd, LAST_NAMES)}",
+            f"{zipf_choice(rnd, STREETS)} {rnd.randint(1, 400)}",
+            zipf_choice(rnd, DISTRICTS),
+            zipf_choice(rnd, CITIES),
+            zipf_choice(rnd, COUNTRIES),
+            f"+9665{rnd.randint(10000000, 99999999)}",
+        ])
+    return addresses
+
+
+def measure(name, shape, addresses, boxes):
+    started = time.perf_counter()
+    for address in addresses:
+        for _ in range(boxes):
+            for text in address:
+                shape(text)
+    elapsed = time.perf_counter() - started
+    strings = len(addresses) * boxes * len(addresses[0])
+    print(f"{name:<12} {elapsed:8.3f}s  {elapsed / strings * 1e6:8.2f}us/string")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--boxes', type=int, default=2)
+    args = parser.parse_args()
+
+    addresses = corpus(args.orders)
+    shaper = ArabicShaper()
+    measure('uncached', shape_arabic, addresses, args.boxes)
+    measure('cached', shaper.shape, addresses, args.boxes)
+    print(shaper.cache_info())
+
+
+if __name__ == '__main__':
+    main()
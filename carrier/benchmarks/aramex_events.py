@@ -0,0 +1,133 @@
+"""
+Разбор файла событий Aramex: прежний DictReader + strptime + sorted против потокового AramexEventReader
+(в памяти и с внешней сортировкой). Файл генерируется, каждый вариант запускается в отдельном процессе,
+чтобы пиковая память (maxrss) не смешивалась.
+Запуск: python -m pimly.models.carrier.benchmarks.aramex_events [--rows N] [--spill-rows N]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
+
+from ..aramex.events import COLUMNS, AramexEventReader, AramexTrackInfo
+
+EVENT_CODES = [f"SH{code:03d}" for code in range(1, 400, 7)]
+MILESTONES = {code: code for code in EVENT_CODES[:40]}
+CATEGORIES = {code: 'delivery' for code in EVENT_CODES[:5]}
+
+
+def generate(path, rows, seed=1):
+    rnd = random.Random(seed)
+    awbs = [str(rnd.randint(10 ** 10, 10 ** 11 - 1)) for _ in range(max(rows // 6, 1))]
+    started = datetime(2021, 3, 1)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as dst:
+        writer = csv.writer(dst)
+        writer.writerow(COLUMNS)
+        for _ in range(rows):
+            event_date = started + timedelta(minutes=rnd.randint(0, 60 * 24 * 14))
+            code = rnd.choice(EVENT_CODES)
+            writer.writerow([
+                f" {rnd.choice(awbs)}",
+                code[:2],
+                code[2:],
+                event_date.strftime("%d/%m/%y"),
+                event_date.strftime("%H:%M"),
+                rnd.choice(['Delivered', 'Consignee not available', 'On hold', '']),
+                rnd.choice(['', 'Call customer', 'Wrong address, please update']),
+            ])
+
+
+def legacy_groups(file_path):
+    """Разбор так, как он был реализован в TrackingService"""
+    def parse_row(track):
+        pin_number = track['PINumber'].replace(' ', '') if track['PINumber'] else ''
+        problem_code = track['ProblemCode'].replace(' ', '') if track['ProblemCode'] else ''
+        event_code = f"{pin_number}{problem_code}"
+        milestone = MILESTONES.get(event_code.upper())
+        if not milestone:
+            return None
+        action_date = track['ActionDate'].strip() if track['ActionDate'] else ''
+        action_time = track['ActionTime'].strip() if track['ActionTime'] else ''
+        try:
+            event_date = datetime.strptime(f"{action_date}T{action_time}", "%d/%m/%yT%H:%M")
+        except ValueError:
+            return None
+        return AramexTrackInfo(
+            order_awb=track['AWB'].replace(' ', '') if track['AWB'] else '',
+            task_type=CATEGORIES.get(event_code),
+            milestone=milestone,
+            event_code=event_code,
+            action_date=event_date,
+            msg1=track['Comment1'].strip() if track['Comment1'] else '',
+            msg2=track['Comment2'].strip() if track['Comment2'] else '',
+        )
+
+    with open(file_path, encoding='utf-8-sig') as src:
+        reader = csv.DictReader(src, skipinitialspace=True)
+        tracking_events = sorted(filter(None, map(parse_row, reader)), key=attrgetter('order_awb'))
+    for awb, events in groupby(tracking_events, key=attrgetter('order_awb')):
+        yield awb, list(events)
+
+
+def child(variant, file_path, rows, spill_rows):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if variant == 'legacy':
+            groups = legacy_groups(file_path)
+        else:
+            groups = AramexEventReader(MILESTONES, CATEGORIES, spill_rows=spill_rows, tmp_dir=tmp_dir).groups(file_path)
+
+        started = time.perf_counter()
+        awbs = events = 0
+        for _, awb_events in groups:
+            awbs += 1
+            events += len(awb_events)
+        elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        'elapsed': elapsed,
+        'rows_per_sec': rows / elapsed,
+        'awbs': awbs,
+        'events': events,
+        'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--spill-rows', type=int, default=200000)
+    parser.add_argument('--child', default=None)
+    parser.add_argument('--file', default=None)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child, args.file, args.rows, args.spill_rows)
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'events.csv')
+        generate(file_path, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(file_path) // 1024} KB")
+        variants = (
+            ('legacy', args.rows + 1),
+            ('in memory', args.rows + 1),
+            ('external sort', args.spill_rows),
+        )
+        for name, spill_rows in variants:
+            command = [sys.executable, '-m', __spec__.name, '--child', name, '--file', file_path,
+                       '--rows', str(args.rows), '--spill-rows', str(spill_rows)]
+            result = json.loads(subprocess.check_output(command).decode().strip().splitlines()[-1])
+            print(f"{name:<14} {result['elapsed']:7.2f}s  {result['rows_per_sec']:10.0f} rows/s  "
+                  f"{result['awbs']} awbs, {result['events']} events, maxrss {result['maxrss_kb'] // 1024}MB")
+
+
+if __name__ == '__main__':
+    main()
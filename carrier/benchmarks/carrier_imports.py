@@ -0,0 +1,52 @@
+"""
+Время импорта модулей каждого керриера. Каждый керриер загружается в отдельном процессе,
+чтобы общие зависимости (lxml, zeep, reportlab) не учитывались только у первого.
+Запуск: python -m pimly.models.carrier.benchmarks.carrier_imports [carrier_name ...]
+"""
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+import time
+
+from ..registry import CarrierRegistry, carrier_registry
+
+ATTRIBUTES = ('ShippingService', 'TrackingService', 'ServicePointUpdater')
+
+
+def child(carrier_name):
+    started = time.perf_counter()
+    importlib.import_module(f'{__package__.rpartition(".")[0]}.selector')
+    selector_time = time.perf_counter() - started
+
+    carrier = carrier_registry.get(carrier_name)
+    for attribute in ATTRIBUTES:
+        getattr(carrier, attribute)
+
+    print(json.dumps({
+        'selector': selector_time,
+        'modules': carrier_registry.import_report().get(carrier_name, {}),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('carriers', nargs='*', default=list(CarrierRegistry.carriers))
+    parser.add_argument('--child', action='store_true')
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.carriers[0])
+
+    for carrier_name in args.carriers:
+        output = subprocess.check_output([sys.executable, '-m', __spec__.name, '--child', carrier_name])
+        result = json.loads(output.decode().strip().splitlines()[-1])
+        total = sum(result['modules'].values())
+        print(f"{carrier_name}: selector import {result['selector']:.3f}s, carrier modules {total:.3f}s")
+        for module_name, elapsed in sorted(result['modules'].items(), key=lambda item: -item[1]):
+            print(f"    {module_name:<50} {elapsed:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Сравнение общего индекса городов с прежним поиском по таблицам каждого керриера.
+Запуск: python -m pimly.models.carrier.benchmarks.city_codes [--addresses N] [--repeat N]
+"""
+import argparse
+import random
+import time
+
+from ..aramex.pdf.routing_table import CITY_ROUTE_MAPPING
+from ..cities import city_index, city_names_index
+from ..dhl import city_tables as dhl
+from ..naqel import city_tables as naqel
+from ..postaplus import city_tables as postaplus
+from ..smsa import city_tables as smsa
+
+SMSA_CITIES = sorted(set(smsa.CITY_CODES.values()))
+
+
+def legacy_codes(country, cities):
+    """Поиск так, как он был реализован в модулях керриеров"""
+    codes = {}
+    for city in cities:
+        code = dhl.CITY_CODES.get(country, {}).get(city.capitalize())
+        if code:
+            codes['dhl'] = code
+            break
+    for city in cities:
+        code = naqel.CITY_CODES.get(country, {}).get('city_codes', {}).get(city.strip().title())
+        if code:
+            codes['naqel'] = code
+            break
+    for city in cities:
+        code = postaplus.CITY_CODES.get(country, {}).get('city_codes', {}).get(city.strip().lower())
+        if code:
+            codes['postaplus'] = code
+            break
+    for city in cities:
+        city = city.strip().title()
+        city = smsa.CITY_CODES.get(city, city)
+        if city in SMSA_CITIES:
+            codes['smsa'] = city
+            break
+    if country == 'SA':
+        for city in cities:
+            code = CITY_ROUTE_MAPPING.get(city.lower().strip())
+            if code:
+                codes['aramex_route'] = code
+                break
+    return codes
+
+
+def unified_codes(country, cities):
+    city_codes = city_index.resolve(country, cities)
+    names = city_names_index(tuple(SMSA_CITIES))
+    smsa_city = next((names[city] for city in city_codes.smsa if city in names), None)
+    return {
+        carrier: code
+        for carrier, code in (('dhl', city_codes.dhl), ('naqel', city_codes.naqel), ('postaplus', city_codes.postaplus),
+                              ('smsa', smsa_city), ('aramex_route', city_codes.aramex_route))
+        if code
+    }
+
+
+def spellings(city):
+    """Написания одного города, которые встречаются в адресах"""
+    yield city
+    yield city.upper()
+    yield f"  {city.lower()} "
+    yield city.replace(' ', '-')
+    if city.lower().startswith('al '):
+        yield 'El-' + city[3:]
+
+
+def addresses(count, seed=1):
+    rnd = random.Random(seed)
+    cities = [('SA', city) for city in dhl.SA] + [('SA', city) for city in CITY_ROUTE_MAPPING] \
+        + [(country, city) for country, codes in naqel.CITY_CODES.items() for city in codes['city_codes']] \
+        + [(country, city) for country, codes in postaplus.CITY_CODES.items() for city in codes['city_codes']] \
+        + [('SA', city) for city in smsa.CITY_CODES]
+    result = []
+    for _ in range(count):
+        country, city = rnd.choice(cities)
+        base_cities = [rnd.choice(cities)[1] for _ in range(rnd.randint(0, 2))]
+        result.append((country, [rnd.choice(list(spellings(city)))] + base_cities))
+    return result
+
+
+def measure(name, function, sample, repeat):
+    started = time.perf_counter()
+    found = 0
+    for _ in range(repeat):
+        for country, cities in sample:
+            found += len(function(country, cities))
+    elapsed = time.perf_counter() - started
+    lookups = len(sample) * repeat
+    print(f"{name:<16} {elapsed:8.3f}s  {elapsed / lookups * 1e6:8.2f}us/address  codes found: {found // repeat}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--addresses', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    city_index.compile()
+    print(f"index compiled in {time.perf_counter() - started:.3f}s")
+
+    sample = addresses(args.addresses)
+    measure('per carrier', legacy_codes, sample, args.repeat)
+    city_index.clear()
+    measure('index (cold)', unified_codes, sample, 1)
+    measure('index (cached)', unified_codes, sample, args.repeat)
+    print(city_index.cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Время импорта и память процесса для таблиц городов: компиляция из исходных таблиц и бинарный индекс в mmap.
+Каждый вариант запускается в отдельном процессе.
+Запуск: python -m pimly.models.carrier.benchmarks.city_tables [--module pimly.models.carrier.selector]
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..city_store import build
+
+
+def memory():
+    """RSS процесса и часть RSS, которая отображена из файлов (общая между воркерами), в KB"""
+    values = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in ('VmRSS', 'RssFile'):
+                values[name] = int(value.split()[0])
+    return values
+
+
+def child(module, index_path):
+    from ..cities import city_index
+
+    before = memory()
+    started = time.perf_counter()
+    importlib.import_module(module)
+    imported = time.perf_counter()
+    city_index.configure({'pimly.carriers.cities.index_path': index_path})
+    city_index.compile()
+    city_index.resolve('SA', ['Riyadh'])
+    compiled = time.perf_counter()
+    after = memory()
+    print(json.dumps({
+        'import': imported - started,
+        'compile': compiled - imported,
+        'rss_kb': after['VmRSS'] - before['VmRSS'],
+        'file_rss_kb': after.get('RssFile', 0) - before.get('RssFile', 0),
+    }))
+
+
+def run(module, index_path):
+    command = [sys.executable, '-m', __spec__.name, '--child', '--module', module, '--index', index_path]
+    return json.loads(subprocess.check_output(command).decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--module', default=f'{__package__.rpartition(".")[0]}.selector')
+    parser.add_argument('--index', default=None)
+    parser.add_argument('--child', action='store_true')
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.module, args.index)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path, _ = build(os.path.join(directory, 'city_index.bin'))
+        print(f"index size: {os.path.getsize(index_path)} bytes")
+        for name, path in (('source tables', os.path.join(directory, 'missing.bin')), ('mmap index', index_path)):
+            result = run(args.module, path)
+            print(f"{name:<14} import {result['import']:.3f}s  compile {result['compile']:.3f}s  "
+                  f"rss +{result['rss_kb']}KB (file backed +{result['file_rss_kb']}KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Трекинг по нескольким AWB в запросе: прежние последовательные пачки фиксированного размера против
+AdaptiveBatchFetcher. Запрос керриера имитируется задержкой, растущей с размером пачки; пачка с «плохим» AWB
+завершается ошибкой, при --outage все запросы завершаются временной ошибкой.
+Запуск: python -m pimly.models.carrier.benchmarks.tracking_batches [--awbs N] [--batch-size N] [--bad N] [--outage]
+"""
+import argparse
+import random
+import time
+
+from ..abc.exc import SendingOrderDelayed
+from ..abc.fetcher import AdaptiveBatchFetcher, AdaptiveBatchSize
+
+
+def carrier_api(bad_awbs, base_latency, awb_latency, outage=False):
+    def get_tracking_info(tracking_numbers):
+        time.sleep(base_latency + awb_latency * len(tracking_numbers))
+        if outage:
+            raise SendingOrderDelayed("Service unavailable")
+        if bad_awbs.intersection(tracking_numbers):
+            raise ValueError("Invalid waybill number")
+        return [{'WaybillNo': tracking_number} for tracking_number in tracking_numbers]
+    return get_tracking_info
+
+
+def fixed(get_tracking_info, awbs, batch_size):
+    requests = fetched = 0
+    for start in range(0, len(awbs), batch_size):
+        batch = awbs[start:start + batch_size]
+        requests += 1
+        try:
+            fetched += len(get_tracking_info(batch))
+        except (ValueError, SendingOrderDelayed):
+            pass
+    return requests, fetched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--awbs', type=int, default=3000)
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--max-batch-size', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--bad', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--awb-latency', type=float, default=0.01)
+    parser.add_argument('--outage', action='store_true')
+    parser.add_argument('--backoff', type=float, default=0.1)
+    args = parser.parse_args()
+
+    awbs = [str(awb) for awb in range(args.awbs)]
+    bad_awbs = set(random.Random(1).sample(awbs, args.bad))
+    get_tracking_info = carrier_api(bad_awbs, args.latency, args.awb_latency, args.outage)
+
+    started = time.perf_counter()
+    requests, fetched = fixed(get_tracking_info, awbs, args.batch_size)
+    print(f"fixed     {time.perf_counter() - started:7.1f}s  {requests} requests, {fetched} AWBs fetched")
+
+    batch_size = AdaptiveBatchSize(args.batch_size, maximum=args.max_batch_size,
+                                   target_latency=args.latency + args.awb_latency * args.max_batch_size)
+    fetcher = AdaptiveBatchFetcher('benchmark', get_tracking_info, batch_size, workers=args.workers,
+                                   backoff=args.backoff)
+    started = time.perf_counter()
+    fetched = sum(len(batch) for batch, _ in fetcher.results(awbs))
+    print(f"adaptive  {time.perf_counter() - started:7.1f}s  {fetcher.stats['requests']} requests, {fetched} AWBs fetched, "
+          f"{fetcher.stats['retries']} retries, {fetcher.stats['splits']} splits, {fetcher.stats['failed']} failed, "
+          f"final batch size {batch_size.current}")
+
+
+if __name__ == '__main__':
+    main()
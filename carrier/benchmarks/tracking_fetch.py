@@ -0,0 +1,63 @@
+"""
+Получение трекинга по одному AWB: прежний последовательный цикл (запрос + пауза) против ConcurrentFetcher
+с ограничением частоты. Запрос керриера имитируется задержкой со случайными временными ошибками.
+Запуск: python -m pimly.models.carrier.benchmarks.tracking_fetch [--awbs N] [--latency S] [--rate N] [--workers N]
+"""
+import argparse
+import random
+import time
+
+from ..abc.exc import SendingOrderDelayed
+from ..abc.fetcher import ConcurrentFetcher
+
+
+def carrier_api(latency, error_rate, seed=1):
+    rnd = random.Random(seed)
+
+    def get_tracking_info(tracking_number):
+        time.sleep(latency * rnd.uniform(0.5, 1.5))
+        if rnd.random() < error_rate:
+            raise SendingOrderDelayed("timeout")
+        return [tracking_number]
+    return get_tracking_info
+
+
+def serial(get_tracking_info, awbs, pause):
+    fetched = 0
+    for awb in awbs:
+        try:
+            get_tracking_info(awb)
+            fetched += 1
+        except SendingOrderDelayed:
+            pass
+        time.sleep(pause)
+    return fetched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--awbs', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--errors', type=float, default=0.02)
+    parser.add_argument('--pause', type=float, default=2.0)
+    parser.add_argument('--rate', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    awbs = [str(awb) for awb in range(args.awbs)]
+
+    started = time.perf_counter()
+    fetched = serial(carrier_api(args.latency, args.errors), awbs, args.pause)
+    print(f"serial      {time.perf_counter() - started:8.1f}s  {fetched} fetched")
+
+    fetcher = ConcurrentFetcher('benchmark', carrier_api(args.latency, args.errors), workers=args.workers,
+                                rate=args.rate, retries=2, backoff=0.1)
+    started = time.perf_counter()
+    fetched = sum(len(batch) for batch in fetcher.batches(awbs, 100))
+    elapsed = time.perf_counter() - started
+    print(f"concurrent  {elapsed:8.1f}s  {fetched} fetched, {dict(fetcher.stats)}, "
+          f"rate limit bound {args.awbs / args.rate:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+
+class ProcessCache:
+    """
+    Кеш на процесс для неизменяемых объектов (таблица приоритетов керриеров, сервисы отправки и т.д.).
+    Значения хранятся под тегами из __cache_tags__ моделей: изменение записи через ORM
+    сбрасывает все значения ее тегов после коммита транзакции. ttl ограничивает время жизни значения,
+    чтобы изменения, сделанные в других процессах, тоже применялись.
+    """
+    session_key = 'process_cache_tags'
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._values = {}
+        self._generations = {}
+
+    def get(self, tag, key, creator):
+        with self._lock:
+            cached = self._values.get(tag, {}).get(key)
+            generation = self._generations.get(tag, 0)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        value = creator()
+        with self._lock:
+            # значение, созданное до invalidate тега, могло прочитать старые данные и не сохраняется
+            if self._generations.get(tag, 0) == generation:
+                self._values.setdefault(tag, {})[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._values.pop(tag, None)
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            for tag in set(self._values) | set(self._generations):
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            self._values.clear()
+
+    def watch(self, *models):
+        """Сброс тегов модели после коммита транзакции, в которой были insert/update/delete ее записей"""
+        for model in models:
+            tags = tuple(model.__cache_tags__)
+            for event_name in ('after_insert', 'after_update', 'after_delete'):
+                event.listen(model, event_name, lambda mapper, connection, target, tags=tags: self._changed(target, tags))
+
+    def _changed(self, target, tags):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(self.session_key, set()).update(tags)
+
+    def _after_commit(self, session):
+        # теги откаченных изменений сбрасываются со следующим коммитом: лишняя перезагрузка безопасна
+        tags = session.info.pop(self.session_key, None)
+        if tags:
+            self.invalidate(*tags)
+
+
+process_cache = ProcessCache()
+event.listen(Session, 'after_commit', process_cache._after_commit)
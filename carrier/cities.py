@@ -0,0 +1,290 @@
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+from pyramid.settings import asbool
+
+CityCodes = namedtuple('CityCodes', ['dhl', 'naqel', 'postaplus', 'postaplus_city', 'smsa', 'aramex_route', 'fuzzy'])
+FuzzyMatch = namedtuple('FuzzyMatch', ['carrier', 'city', 'name', 'code', 'confidence'])
+
+ARABIC_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹', '01234567890123456789')
+SEPARATORS = re.compile(r'[\W_]+')
+ARTICLES = frozenset(('al', 'el'))
+
+
+def normalize_city(city):
+    """Ключ города: без диакритики, casefold, арабские цифры, пробелы и пунктуация схлопнуты в один пробел"""
+    city = unicodedata.normalize('NFKD', city)
+    city = ''.join(char for char in city if not unicodedata.combining(char))
+    city = city.casefold().translate(ARABIC_DIGITS)
+    return SEPARATORS.sub(' ', city).strip()
+
+
+def strip_articles(key):
+    """Ключ без артиклей: 'al khobar', 'el-khobar' и 'khobar' совпадают"""
+    return ' '.join(word for word in key.split(' ') if word not in ARTICLES)
+
+
+def trigrams(key):
+    key = f"  {key} "
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+def similarity(first, second):
+    """1 - расстояние Дамерау-Левенштейна (перестановка соседних букв - одна ошибка) / длина большей строки"""
+    if len(first) < len(second):
+        first, second = second, first
+    if not first:
+        return 1.0
+
+    before, previous = None, list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (first_char != second_char))
+            if i > 1 and j > 1 and first_char == second[j - 2] and first[i - 2] == second_char:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        before, previous = previous, current
+    return 1 - previous[-1] / len(first)
+
+
+def table_tiers(codes):
+    """Словари уровней поиска (names, exact, variants) для пар (название, код)"""
+    tiers = ({}, {}, {})
+    for city, code in codes:
+        key = normalize_city(city)
+        for tier, tier_key in zip(tiers, (city.strip().casefold(), key, strip_articles(key))):
+            tier.setdefault(tier_key, code)
+    return tiers
+
+
+def source_tables():
+    """
+    Все таблицы керриеров в виде {'<керриер>/<страна>/<уровень>': {ключ: значение}}.
+    Коды стран - '<керриер>/*/country_code', алиасы SMSA - 'smsa/*/<уровень>'
+    """
+    from .aramex.pdf.routing_table import CITY_ROUTE_MAPPING
+    from .dhl import city_tables as dhl
+    from .naqel import city_tables as naqel
+    from .postaplus import city_tables as postaplus
+    from .smsa import city_tables as smsa
+
+    codes = {
+        ('dhl', country): cities.items() for country, cities in dhl.CITY_CODES.items()
+    }
+    for carrier, module in (('naqel', naqel), ('postaplus', postaplus)):
+        codes.update(((carrier, country), value['city_codes'].items()) for country, value in module.CITY_CODES.items())
+    codes['smsa', '*'] = smsa.CITY_CODES.items()
+    codes['aramex_route', 'SA'] = CITY_ROUTE_MAPPING.items()
+
+    tables = {}
+    for (carrier, country), cities in codes.items():
+        for tier, table in zip(CityTable.tiers, table_tiers(cities)):
+            tables[f'{carrier}/{country}/{tier}'] = table
+    for carrier, module in (('naqel', naqel), ('postaplus', postaplus)):
+        tables[f'{carrier}/*/country_code'] = {country: value['country_code'] for country, value in module.CITY_CODES.items()}
+    return tables
+
+
+class CityTable:
+    """
+    Индекс одной таблицы: название без учета регистра, затем нормализованный ключ, затем ключ без артиклей.
+    Первый уровень сохраняет коды для названий, которые различаются только пунктуацией ('Al Ahmar' и 'Al-Ahmar').
+    Уровни - словари или таблицы из mmap индекса, триграммы строятся при первом нечетком поиске
+    """
+    tiers = ('names', 'exact', 'variants')
+
+    def __init__(self, names, exact, variants):
+        self.names = names
+        self.exact = exact
+        self.variants = variants
+        self._trigrams = None
+
+    def _trigram_index(self):
+        if self._trigrams is None:
+            keys = list(self.exact)
+            key_trigrams = [trigrams(key) for key in keys]
+            trigram_index = {}
+            for position, trigram_set in enumerate(key_trigrams):
+                for trigram in trigram_set:
+                    trigram_index.setdefault(trigram, []).append(position)
+            self._trigrams = keys, key_trigrams, trigram_index
+        return self._trigrams
+
+    def get(self, city, key=None):
+        code = self.names.get(city.strip().casefold())
+        if code is None:
+            key = key if key is not None else normalize_city(city)
+            code = self.exact.get(key)
+            if code is None:
+                code = self.variants.get(strip_articles(key))
+        return code
+
+    def search(self, key, candidates=5):
+        """
+        Ближайшее название по триграммам: кандидаты с наибольшим коэффициентом Dice
+        проверяются расстоянием Левенштейна. Возвращает (название, код, уверенность) или None,
+        если лучшие названия с разными кодами одинаково близки
+        """
+        keys, key_trigrams, trigram_index = self._trigram_index()
+        query = trigrams(key)
+        shared = Counter(position for trigram in query for position in trigram_index.get(trigram, ()))
+        if not shared:
+            return None
+
+        dice = {position: 2 * count / (len(query) + len(key_trigrams[position])) for position, count in shared.items()}
+        best = sorted(dice, key=dice.get, reverse=True)[:candidates]
+        scored = sorted(((similarity(key, keys[position]), keys[position]) for position in best), reverse=True)
+        confidence, name = scored[0]
+        if len(scored) > 1 and scored[1][0] == confidence and self.exact[scored[1][1]] != self.exact[name]:
+            return None
+        return name, self.exact[name], confidence
+
+
+class CityIndex:
+    """
+    Общий поиск кодов городов для всех керриеров. Таблицы керриеров читаются из бинарного индекса
+    (city_store, собирается при деплое) или, если файла нет или он собран из других версий таблиц,
+    компилируются из исходных таблиц.
+    Результат для адреса (city + base_cities) запоминается, и коды всех керриеров находятся
+    за один проход по городам.
+    """
+
+    log = logging.getLogger('carriers_orders')
+    fuzzy_carriers = ('dhl', 'naqel', 'postaplus')
+
+    def __init__(self, maxsize=4096):
+        self._lock = threading.Lock()
+        self._tables = None
+        self.index_path = None
+        self.fuzzy = False
+        self.fuzzy_confidence = 0.8
+        self.fuzzy_min_length = 4
+        self.resolve_cached = lru_cache(maxsize=maxsize)(self._resolve)
+
+    def configure(self, settings):
+        """
+        Нечеткий поиск для DHL, Naqel и PostaPlus, если точного совпадения нет ни для одного города адреса.
+        Настройки: pimly.carriers.cities.fuzzy (вкл/выкл), pimly.carriers.cities.fuzzy_confidence / fuzzy_min_length,
+        pimly.carriers.cities.index_path - файл бинарного индекса
+        """
+        index_path = settings.get('pimly.carriers.cities.index_path')
+        if index_path != self.index_path:
+            self.index_path = index_path
+            self._tables = None
+        self.fuzzy = asbool(settings.get('pimly.carriers.cities.fuzzy', False))
+        self.fuzzy_confidence = float(settings.get('pimly.carriers.cities.fuzzy_confidence', 0.8))
+        self.fuzzy_min_length = int(settings.get('pimly.carriers.cities.fuzzy_min_length', 4))
+        self.clear()
+
+    def compile(self):
+        if self._tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._tables = self._compile()
+        return self._tables
+
+    def _compile(self):
+        from .city_store import DEFAULT_PATH, MappedIndex, source_digest
+
+        path = self.index_path or DEFAULT_PATH
+        try:
+            tables = MappedIndex(path, source_digest()).tables
+        except OSError as e:
+            self.log.info(f"City index {path} is not available ({e}), compiling city tables from source")
+            tables = source_tables()
+        except ValueError as e:
+            self.log.warning(f"City index {path} is stale ({e}), compiling city tables from source")
+            tables = source_tables()
+
+        compiled = {}
+        for name in tables:
+            carrier, country, tier = name.split('/')
+            if tier == 'country_code':
+                compiled.setdefault('country_code', {})[carrier] = tables[name]
+            elif tier == CityTable.tiers[0]:
+                table = CityTable(*(tables[f'{carrier}/{country}/{tier}'] for tier in CityTable.tiers))
+                compiled.setdefault(carrier, {})[country] = table
+        compiled['smsa'] = compiled['smsa']['*']
+        return compiled
+
+    def country_code(self, carrier, country):
+        return self.compile()['country_code'][carrier].get(country)
+
+    def resolve(self, country, cities):
+        """Коды всех керриеров для первого подходящего города из cities"""
+        return self.resolve_cached(country, tuple(city for city in cities if city))
+
+    def resolve_address(self, shipping_address, base_cities=True):
+        cities = [shipping_address.city]
+        if base_cities:
+            cities.extend(shipping_address.base_cities)
+        return self.resolve(shipping_address.country, cities)
+
+    def _resolve(self, country, cities):
+        tables = self.compile()
+        country_tables = {
+            carrier: tables[carrier].get(country)
+            for carrier in ('dhl', 'naqel', 'postaplus', 'aramex_route')
+        }
+        codes = dict.fromkeys(CityCodes._fields)
+        keys = [(city, normalize_city(city)) for city in cities]
+        smsa = []
+        for city, key in keys:
+            for carrier, table in country_tables.items():
+                if table is not None and codes[carrier] is None:
+                    codes[carrier] = table.get(city, key)
+                    if carrier == 'postaplus' and codes[carrier] is not None:
+                        codes['postaplus_city'] = city
+            smsa.append(normalize_city(tables['smsa'].get(city, key) or city))
+
+        codes['smsa'] = tuple(smsa)
+        codes['fuzzy'] = ()
+        if self.fuzzy:
+            codes['fuzzy'] = self._fuzzy(country, country_tables, codes, keys)
+        return CityCodes(**codes)
+
+    def _fuzzy(self, country, country_tables, codes, keys):
+        matches = []
+        for carrier in self.fuzzy_carriers:
+            table = country_tables[carrier]
+            if table is None or codes[carrier] is not None:
+                continue
+
+            for city, key in keys:
+                if len(key) < self.fuzzy_min_length:
+                    continue
+                found = table.search(key)
+                if found and found[2] >= self.fuzzy_confidence:
+                    name, code, confidence = found
+                    codes[carrier] = code
+                    if carrier == 'postaplus':
+                        codes['postaplus_city'] = city
+                    matches.append(FuzzyMatch(carrier, city, name, code, confidence))
+                    self.log.info(f"{carrier}: city '{city}' ({country}) matched to '{name}' -> {code} "
+                                  f"with confidence {confidence:.2f}, consider adding an alias")
+                    break
+
+        return tuple(matches)
+
+    def cache_info(self):
+        return self.resolve_cached.cache_info()
+
+    def clear(self):
+        self.resolve_cached.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def city_names_index(city_names):
+    """{нормализованный ключ: название} для списка городов керриера (SMSA получает список из API)"""
+    index = {}
+    for city_name in city_names:
+        index.setdefault(normalize_city(city_name), city_name)
+    return index
+
+
+city_index = CityIndex()
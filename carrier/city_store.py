@@ -0,0 +1,152 @@
+"""
+Бинарный индекс таблиц городов только для чтения. Файл открывается через mmap,
+поэтому страницы индекса общие для всех воркеров на машине, а при импорте словари не строятся.
+В заголовке хранится sha256 исходных модулей: индекс, собранный из других версий таблиц, не используется.
+Сборка: python -m pimly.models.carrier.city_store [путь]
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b'CITYIDX2'
+HEADER = struct.Struct('<8sI32s')  # magic, количество таблиц, sha256 исходных модулей
+DIRECTORY = struct.Struct('<HII')  # длина имени таблицы, смещение записей, количество записей
+ENTRY = struct.Struct('<IHIH')  # смещение и длина ключа, смещение и длина значения
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(PACKAGE_DIR, 'city_index.bin')
+# модули, из которых собираются таблицы (cities.py - правила нормализации ключей)
+SOURCE_FILES = (
+    'cities.py',
+    'aramex/pdf/routing_table.py',
+    'dhl/city_tables.py',
+    'naqel/city_tables.py',
+    'postaplus/city_tables.py',
+    'smsa/city_tables.py',
+)
+
+
+def source_digest():
+    """sha256 исходных модулей таблиц, без их импорта"""
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        with open(os.path.join(PACKAGE_DIR, name), 'rb') as f:
+            digest.update(name.encode())
+            digest.update(f.read())
+    return digest.digest()
+
+
+class MappedTable:
+    """Таблица {ключ: значение} в mmap: записи отсортированы по ключу, поиск бинарный"""
+
+    def __init__(self, buffer, offset, count):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, position):
+        key_offset, key_length, value_offset, value_length = ENTRY.unpack_from(self.buffer, self.offset + position * ENTRY.size)
+        return self.buffer[key_offset:key_offset + key_length], value_offset, value_length
+
+    def get(self, key, default=None):
+        key = key.encode()
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            middle_key, value_offset, value_length = self._entry(middle)
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return self.buffer[value_offset:value_offset + value_length].decode()
+        return default
+
+    def __iter__(self):
+        for position in range(self.count):
+            yield self._entry(position)[0].decode()
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+
+class MappedIndex:
+    """Набор именованных таблиц из файла индекса"""
+
+    def __init__(self, path, digest=None):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, tables_count, index_digest = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a city index")
+        if digest is not None and index_digest != digest:
+            raise ValueError(f"{path} was built from other city tables, rebuild it")
+
+        self.tables = {}
+        position = HEADER.size
+        for _ in range(tables_count):
+            name_length, offset, count = DIRECTORY.unpack_from(self.buffer, position)
+            position += DIRECTORY.size
+            name = self.buffer[position:position + name_length].decode()
+            position += name_length
+            self.tables[name] = MappedTable(self.buffer, offset, count)
+
+
+def write_index(path, tables, digest):
+    """
+    tables - {имя: {ключ: значение}}, digest - source_digest() модулей, из которых они собраны.
+    Файл заменяется атомарно, открытые воркерами копии остаются валидными
+    """
+    names = [name.encode() for name in tables]
+    strings = {}
+    pool = bytearray()
+
+    def intern(value):
+        value = value.encode()
+        if value not in strings:
+            strings[value] = len(pool)
+            pool.extend(value)
+        return strings[value], len(value)
+
+    entries_offset = HEADER.size + sum(DIRECTORY.size + len(name) for name in names)
+    pool_offset = entries_offset + sum(len(table) for table in tables.values()) * ENTRY.size
+
+    directory = bytearray(HEADER.pack(MAGIC, len(tables), digest))
+    entries = bytearray()
+    for name, table in zip(names, tables.values()):
+        directory += DIRECTORY.pack(len(name), entries_offset + len(entries), len(table))
+        directory += name
+        for key in sorted(table, key=str.encode):
+            key_offset, key_length = intern(key)
+            value_offset, value_length = intern(table[key])
+            entries += ENTRY.pack(pool_offset + key_offset, key_length, pool_offset + value_offset, value_length)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(directory)
+        f.write(entries)
+        f.write(pool)
+    os.replace(temp_path, path)
+
+
+def build(path=DEFAULT_PATH):
+    from .cities import source_tables
+    digest = source_digest()
+    tables = source_tables()
+    write_index(path, tables, digest)
+    return path, tables
+
+
+if __name__ == '__main__':
+    index_path, source = build(*sys.argv[1:2])
+    print(f"{index_path}: {len(source)} tables, {sum(map(len, source.values()))} entries, "
+          f"{os.path.getsize(index_path)} bytes")
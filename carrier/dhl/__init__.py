@@ -1,11 +1,10 @@
 from pimly.models import enum
 
 from ..abc.carrier import AbstractCarrier
-from .shipping import DHLShippingService
-from .tracking import TrackingUpdater
+from ..registry import LazyAttribute
 
 
 class DHL(AbstractCarrier):
     name = enum.CarrierName.dhl
-    ShippingService = DHLShippingService
-    TrackingService = TrackingUpdater
+    ShippingService = LazyAttribute('.shipping', 'DHLShippingService')
+    TrackingService = LazyAttribute('.tracking', 'TrackingUpdater')
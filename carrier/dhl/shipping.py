@@ -1,16 +1,18 @@
 from pimly.models import enum
 from .api import DHLOrderAPI
+from .city_codes import CityCodeNotFound, get_city_code
 from .pdf import invoice
-from ..abc.exc import SendingOrderCancelled, SendingOrderDelayed
+from ..abc.exc import SendingOrderDelayed
 from ..abc.shipping import AbstractShippingService
 
 
 class DHLShippingService(AbstractShippingService):
     carrier_name = enum.CarrierName.dhl
+    resend_allowed = False
 
-    def can_send_shipment(self, shipment):
+    def can_send_shipment(self, shipment, timeout=None):
         return shipment.delivery_type == enum.DeliveryType.international \
-                and self._valid_currency(shipment.order) \
+                and self._valid_currency(shipment) \
                 and self._valid_city_code(shipment)
 
     def create_shipping_document(self, shipment):
@@ -30,14 +32,12 @@ class DHLShippingService(AbstractShippingService):
     def _resend_shipment(self, shipment):
         raise SendingOrderDelayed("Resend for DHL carrier is not allowed")
 
-    def _valid_currency(self, order):
-        return not order.is_cod and order.currency == 'SAR'
+    def _valid_currency(self, shipment):
+        return not shipment.is_cod and shipment.currency == 'SAR'
 
     def _valid_city_code(self, shipment):
-        dhl_api = DHLOrderAPI(shipment, self.settings)
         try:
-            city_code = dhl_api.city_code(translate=False)
-        except SendingOrderCancelled:
+            get_city_code(shipment.country, shipment.cities)
+        except CityCodeNotFound:
             return False
-        else:
-            return city_code is not None
+        return True
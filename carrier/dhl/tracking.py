@@ -1,14 +1,11 @@
-import transaction
 from collections import namedtuple
 from datetime import date, timedelta, datetime
 
-from sqlalchemy.orm import selectinload
-
 from pimly.models import DBSession, enum
 from pimly.models.orders import Order, OrderShipment
-from pimly.models.tracking.enum import MilestoneType, OrderShipmentStatus
+from pimly.models.tracking.enum import MilestoneType
 from pimly.models.tracking.models import ShipmentMilestone
-from pimly.utils import grouper
+from ..abc.fetcher import AdaptiveBatchFetcher
 from ..abc.tracking import AbstractTrackingUpdater
 from .api import DHLTrackingAPI
 
@@ -71,22 +68,18 @@ class TrackingUpdater(AbstractTrackingUpdater):
     def __init__(self, settings, **kwargs):
         super().__init__(settings, **kwargs)
         self.channel_id = kwargs['channel_id']
+        self.fetcher = AdaptiveBatchFetcher.from_settings(
+            settings, self.carrier_name.name, DHLTrackingAPI(settings).get_tracking,
+            batch_size=100, max_batch_size=100, target_latency=20,
+        )
 
-    def update_trackings(self):
-        tracking_numbers = [order_shipment.tracking_number for order_shipment in self._tracking_qs]
+    def fetch(self, tracking_numbers):
         self.log.info(f"Trying to update tracking info for DHL orders: {len(tracking_numbers)}")
-        for group in grouper(100, tracking_numbers):
-            orders_tracking_info = self._get_orders_tracking_info([tracking_number for tracking_number in group if tracking_number])
-            self._update_shipment_milestones(orders_tracking_info)
-
-            delivered_tracking_numbers = [tracking['hawb'] for tracking in orders_tracking_info if tracking['is_delivered']]
-            self._set_delivered_status(delivered_tracking_numbers)
-            self._update_shipment_delivery_date(delivered_tracking_numbers)
+        for _, response in self.fetcher.results(filter(None, tracking_numbers)):
+            yield response
 
-    def _get_orders_tracking_info(self, tracking_numbers):
-        api = DHLTrackingAPI(self.settings)
-        orders_tracking_info = []
-        for carrier_events in api.get_tracking(tracking_numbers):
+    def parse(self, batch):
+        for carrier_events in batch:
             tracking_number = str(carrier_events["AWBNumber"])
 
             action_status = carrier_events["Status"]["ActionStatus"]
@@ -98,85 +91,28 @@ class TrackingUpdater(AbstractTrackingUpdater):
                 self.log.info(f"DHL: Empty ShipmentEvent info for {tracking_number} awb")
                 continue
 
-            tracking_info = []
             shipment_event_items = carrier_events["ShipmentInfo"]["ShipmentEvent"]["ArrayOfShipmentEventItem"]
             shipment_event_items = shipment_event_items if isinstance(shipment_event_items, list) else [shipment_event_items]
             for event in shipment_event_items:
                 event_code = event['ServiceEvent']['EventCode']
                 milestone = MILESTONES.get(event_code)
                 if milestone:
-                    tracking_info.append(DHLTrackInfo(
+                    yield tracking_number, DHLTrackInfo(
                         milestone=milestone,
                         event_code=event_code,
                         event_date=datetime.strptime(f"{event['Date']}T{event['Time']}", "%Y-%m-%dT%H:%M:%S"),
                         description=event['ServiceEvent']['Description'],
-                    ))
-            if tracking_info:
-                orders_tracking_info.append({
-                    'hawb': tracking_number,
-                    'is_delivered': self._check_delivered_status(tracking_info),
-                    'tracking_info': tracking_info
-                })
-        return orders_tracking_info
-
-    def _update_shipment_milestones(self, orders_tracking_info):
-        for order_tracking in orders_tracking_info:
-            with transaction.manager:
-                order_shipment = DBSession.query(OrderShipment) \
-                    .filter(OrderShipment.status_history.isnot(None),
-                            ~OrderShipment.current_status.in_([OrderShipmentStatus.delivered,
-                                                               OrderShipmentStatus.returned]),
-                            OrderShipment.carrier_id == self.carrier_id,
-                            OrderShipment.tracking_number == order_tracking['hawb']) \
-                    .first()
-                if not order_shipment:
-                    continue
-
-                milestones = [ShipmentMilestone(
-                    shipment_id=order_shipment.id,
-                    is_customer_view=tracking.milestone.args['is_customer_view'],
-                    milestone=tracking.milestone,
-                    carrier_code=tracking.event_code,
-                    event_date=tracking.event_date,
-                    description=tracking.description)
-                    for tracking in order_tracking['tracking_info']]
-                new_milestones = order_shipment.filter_milestones(milestones)
-                # Sort for the further correct addition of ShipmentNotification
-                new_milestones.sort()
-                DBSession.add_all(new_milestones)
-                DBSession.refresh(order_shipment)
-                order_shipment.update_status_info()
-
-    def _check_delivered_status(self, milestones):
-        for milestone in milestones:
-            if MilestoneType.is_delivered_milestone(milestone.milestone):
-                return True
-        return False
-
-    def _set_delivered_status(self, delivered_tracking_numbers):
-        order_shipment_qs = DBSession.query(OrderShipment.order_id) \
-            .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
-                    OrderShipment.carrier_id == self.carrier_id)
-
-        for group in grouper(100, [order_shipment.order_id for order_shipment in order_shipment_qs]):
-            delivered_order_ids = list(filter(None, group))
-            with transaction.manager:
-                order_qs = DBSession.query(Order) \
-                    .filter(Order.id.in_(delivered_order_ids)) \
-                    .options(selectinload('shipments').load_only('current_status'))
-                for order in order_qs:
-                    if all(sh.current_status == OrderShipmentStatus.delivered for sh in order.shipments):
-                        order.status = enum.OrderStatus.delivered
-                        DBSession.flush()
-            self.log.info(f"DHL. Set delivered status for orders (id): {delivered_order_ids}")
-
-    def _update_shipment_delivery_date(self, delivered_tracking_numbers):
-        with transaction.manager:
-            DBSession.query(OrderShipment) \
-                .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
-                        OrderShipment.current_status == OrderShipmentStatus.delivered) \
-                .update({OrderShipment.delivered_date: datetime.utcnow()},
-                        synchronize_session=False)
+                    )
+
+    def _create_milestone(self, shipment_id, tracking):
+        return ShipmentMilestone(
+            shipment_id=shipment_id,
+            is_customer_view=tracking.milestone.args['is_customer_view'],
+            milestone=tracking.milestone,
+            carrier_code=tracking.event_code,
+            event_date=tracking.event_date,
+            description=tracking.description,
+        )
 
     @property
     def _tracking_qs(self):
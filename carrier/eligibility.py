@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import transaction
+from pimly.models import DBSession, enum
+from pimly.utils.vat import VATOrderBeforeShipping
+from pyramid.settings import asbool
+
+_ShipmentSnapshot = namedtuple('ShipmentSnapshot', [
+    'shipment_id',
+    'order_code',
+    'channel_code',
+    'delivery_type',
+    'shipping_method_type',
+    'currency',
+    'is_cod',
+    'country',
+    'city',
+    'base_cities',
+    'extra_fee',
+    'document_number',
+    'vat_custom_total',
+    'shipped_total',
+])
+
+
+class ShipmentSnapshot(_ShipmentSnapshot):
+    """
+    Значения заказа, которые читают проверки can_send_shipment. Собирается в потоке запроса,
+    потому что ORM объекты нельзя читать из потоков пула: сессия не потокобезопасна
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_shipment(cls, shipment):
+        order = shipment.order
+        address = order.shipping_address
+        vat_custom_total = shipped_total = None
+        if shipment.delivery_type == enum.DeliveryType.international:
+            vat = VATOrderBeforeShipping(order.international_shipment)
+            vat_custom_total = vat.vat_custom[1]
+            shipped_total = vat.shipped_total
+
+        return cls(
+            shipment_id=shipment.id,
+            order_code=order.code,
+            channel_code=order.channel.code,
+            delivery_type=shipment.delivery_type,
+            shipping_method_type=order.shipping_method_type,
+            currency=order.currency,
+            is_cod=order.is_cod,
+            country=address.country,
+            city=address.city,
+            base_cities=tuple(address.base_cities),
+            extra_fee=shipment.totals.extra_fee,
+            document_number=order.document.document_number if order.document else None,
+            vat_custom_total=vat_custom_total,
+            shipped_total=shipped_total,
+        )
+
+    @property
+    def cities(self):
+        return [self.city, *self.base_cities]
+
+
+class EligibilityChecker:
+    """
+    Проверка can_send_shipment для нескольких керриеров с общим дедлайном: керриер, не ответивший
+    до дедлайна, считается недоступным. Проверки получают ShipmentSnapshot вместо ORM объектов и выполняются
+    параллельно в пуле потоков, запросы в базу из потоков пула идут в их собственных сессиях.
+    Внешние вызовы внутри проверок ограничены call_timeout, поэтому зависшая проверка не занимает поток пула.
+    Настройки: pimly.carriers.eligibility.workers / timeout / call_timeout / parallel
+    """
+    log = logging.getLogger('carriers_orders')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def check(self, settings, shipping_services, shipment):
+        """shipping_services - [(key, shipping_service)]. Возвращает ключи керриеров, которые могут отправить заказ"""
+        return self.check_many(settings, [(shipment, shipping_services)])[0]
+
+    def check_many(self, settings, candidates):
+        """
+        Проверка нескольких заказов одним проходом с общим дедлайном: candidates - [(shipment, [(key, shipping_service)])].
+        Возвращает для каждого заказа ключи керриеров, которые могут его отправить, в порядке shipping_services
+        """
+        snapshots = {
+            index: ShipmentSnapshot.from_shipment(shipment)
+            for index, (shipment, shipping_services) in enumerate(candidates) if shipping_services
+        }
+        checks = [
+            (index, key, shipping_service, snapshots[index])
+            for index, (shipment, shipping_services) in enumerate(candidates) if shipping_services
+            for key, shipping_service in shipping_services
+        ]
+        if not checks:
+            return [[] for _ in candidates]
+
+        timeout = self._option(settings, 'timeout', 10, float)
+        call_timeout = self._option(settings, 'call_timeout', timeout, float)
+        if len(checks) < 2 or not self._option(settings, 'parallel', True, asbool):
+            available = self._check_serial(checks, timeout, call_timeout)
+        else:
+            available = self._check_parallel(settings, checks, timeout, call_timeout)
+
+        return [
+            [key for key, shipping_service in shipping_services if (index, key) in available]
+            for index, (shipment, shipping_services) in enumerate(candidates)
+        ]
+
+    def _check_parallel(self, settings, checks, timeout, call_timeout):
+        executor = self._get_executor(settings)
+        futures = {
+            executor.submit(self._run, shipping_service, snapshot, call_timeout): (index, key, shipping_service, snapshot)
+            for index, key, shipping_service, snapshot in checks
+        }
+        wait(futures, timeout=timeout)
+
+        available = set()
+        for future, (index, key, shipping_service, snapshot) in futures.items():
+            if not future.done():
+                # запущенную проверку отменить нельзя, она завершится не позже call_timeout
+                future.cancel()
+                self._deadline_exceeded(shipping_service, snapshot, timeout)
+            elif future.result():
+                available.add((index, key))
+        return available
+
+    def _check_serial(self, checks, timeout, call_timeout):
+        deadline = time.monotonic() + timeout
+        available = set()
+        for index, key, shipping_service, snapshot in checks:
+            if time.monotonic() >= deadline:
+                self._deadline_exceeded(shipping_service, snapshot, timeout)
+            elif self._can_send(shipping_service, snapshot, call_timeout):
+                available.add((index, key))
+        return available
+
+    def _run(self, shipping_service, snapshot, call_timeout):
+        try:
+            return self._can_send(shipping_service, snapshot, call_timeout)
+        finally:
+            transaction.abort()
+            DBSession.remove()
+
+    def _can_send(self, shipping_service, snapshot, call_timeout):
+        started = time.perf_counter()
+        try:
+            return shipping_service.can_send_shipment(snapshot, timeout=call_timeout)
+        except Exception:
+            self.log.exception(f"Can not check carrier shipping availability: {shipping_service.carrier_name}")
+            return False
+        finally:
+            self.log.info(f"{shipping_service.carrier_name.value}: shipping availability checked "
+                          f"in {time.perf_counter() - started:.3f}s")
+
+    def _deadline_exceeded(self, shipping_service, snapshot, timeout):
+        self.log.warning(f"{shipping_service.carrier_name.value}: shipping availability check for order "
+                         f"{snapshot.order_code} exceeded {timeout}s deadline")
+
+    def _get_executor(self, settings):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._option(settings, 'workers', 8, int),
+                        thread_name_prefix='carrier-eligibility',
+                    )
+        return self._executor
+
+    @staticmethod
+    def _option(settings, option, default, convert):
+        return convert(settings.get(f'pimly.carriers.eligibility.{option}', default))
+
+
+eligibility_checker = EligibilityChecker()
@@ -1,4 +1,7 @@
+import random
 from collections import namedtuple
+from datetime import datetime, timedelta
+from functools import lru_cache
 from itertools import chain
 
 from sqlalchemy import (
@@ -7,6 +10,7 @@ from sqlalchemy import (
     Unicode,
     Integer,
     Boolean,
+    DateTime,
     UniqueConstraint,
     UnicodeText,
     desc
@@ -15,14 +19,23 @@ from sqlalchemy.orm import relation, backref
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.mutable import MutableDict
 
+from pimlib.cache import cache_tag
 from pimlib.db.types import DeclSource
 from pimlib.db.utils import db_created, db_updated
 
 from pimly.models.catalog import Channel
 from pimly.utils.helpers import country_names
+from .cache import process_cache
 from .settings import RetailerAddress
 from src.pimly.models import enum, Base, DBSession
 
+CarrierInfo = namedtuple('CarrierInfo', ['id', 'name'])
+
+
+@lru_cache(maxsize=None)
+def _settings_class(class_name, field_names):
+    return namedtuple(class_name, field_names)
+
 
 class Carrier(Base):
     __tablename__ = 'carrier'
@@ -35,27 +48,57 @@ class Carrier(Base):
     retailer_addresses = Column(MutableDict.as_mutable(JSONB), doc=u'Retailer Addresses')
 
     def get_settings(self, channel_code='default'):
-        field_names = set(chain.from_iterable(self.name.args['settings_fields'].values()))
+        return _channel_settings(self.name, self.settings, channel_code)
 
-        carrier_settings = namedtuple("ChannelSettings", field_names)
-        default_settings = self.settings['default']
-        channel_settings = self.settings.get(channel_code, {})
-        for name in field_names:
-            value = channel_settings.get(name, default_settings.get(name))
-            setattr(carrier_settings, name, value)
+    def get_retailer_addresses(self, country_code='default'):
+        return _retailer_addresses(self.retailer_addresses, country_code)
 
-        return carrier_settings
+    @classmethod
+    def cached(cls, carrier_name):
+        """Закешированные id и name керриера"""
+        return CarrierInfo(_carrier_data(carrier_name)['id'], carrier_name)
 
-    def get_retailer_addresses(self, country_code='default'):
-        field_names = list(chain.from_iterable(RetailerAddress.values()))
-        carrier_retailer_addresses = namedtuple("ChannelRetailerAddress", field_names)
-        default_retailer_addresses = self.retailer_addresses['default']
-        channel_retailer_addresses = self.retailer_addresses.get(country_code, {})
-        for name in field_names:
-            value = channel_retailer_addresses.get(name, default_retailer_addresses.get(name))
-            setattr(carrier_retailer_addresses, name, value)
+    @classmethod
+    def cached_settings(cls, carrier_name, channel_code='default'):
+        """Неизменяемый снимок get_settings из закешированных настроек керриера"""
+        return _channel_settings(carrier_name, _carrier_data(carrier_name)['settings'], channel_code)
 
-        return carrier_retailer_addresses
+    @classmethod
+    def cached_retailer_addresses(cls, carrier_name, country_code='default'):
+        """Неизменяемый снимок get_retailer_addresses из закешированных настроек керриера"""
+        return _retailer_addresses(_carrier_data(carrier_name)['retailer_addresses'], country_code)
+
+
+@cache_tag('carrier', expiration_time=24*60*60)
+def _carrier_data(carrier_name):
+    """
+    id и JSONB настройки керриера. Кеш общий для процессов и сбрасывается тегом 'carrier' модели Carrier,
+    поэтому хранит только простые значения, снимки настроек собираются из них в процессе
+    """
+    carrier = DBSession.query(Carrier).filter(Carrier.name == carrier_name).one()
+    return {
+        'id': carrier.id,
+        'settings': dict(carrier.settings or {}),
+        'retailer_addresses': dict(carrier.retailer_addresses or {}),
+    }
+
+
+def _channel_settings(carrier_name, settings, channel_code):
+    field_names = tuple(sorted(set(chain.from_iterable(carrier_name.args['settings_fields'].values()))))
+    default_settings = settings['default']
+    channel_settings = settings.get(channel_code, {})
+    return _settings_class("ChannelSettings", field_names)(*(
+        channel_settings.get(name, default_settings.get(name)) for name in field_names
+    ))
+
+
+def _retailer_addresses(retailer_addresses, country_code):
+    field_names = tuple(chain.from_iterable(RetailerAddress.values()))
+    default_retailer_addresses = retailer_addresses['default']
+    channel_retailer_addresses = retailer_addresses.get(country_code, {})
+    return _settings_class("ChannelRetailerAddress", field_names)(*(
+        channel_retailer_addresses.get(name, default_retailer_addresses.get(name)) for name in field_names
+    ))
 
 
 class CarrierGroup(Base):
@@ -113,6 +156,8 @@ class CarrierNumber(Base):
     group_id = Column(Integer, ForeignKey('carrier_group.id', onupdate='CASCADE', ondelete='CASCADE'), index=True, nullable=False, info={'skip_filters': True})
 
     number = Column(Unicode(), nullable=False, doc='Number')
+    lease_owner = Column(Unicode(128), nullable=True, index=True, doc='Leased by', info={'skip_filters': True})
+    leased_until = Column(DateTime, nullable=True, doc='Leased until', info={'skip_filters': True})
 
     carrier = relation(Carrier, info={'skip_filters': True})
     group = relation(CarrierGroup, backref=backref('carrier_numbers', cascade='all, delete-orphan'), info={'skip_filters': True})
@@ -208,10 +253,63 @@ class CarrierPriority(Base):
 
     @classmethod
     def country_priorities(cls, channel_id, country_code):
-        qs = DBSession.query(Carrier.name, cls.priority) \
-            .join(cls) \
-            .filter(cls.channel_id == channel_id,
-                    cls.country_code == country_code) \
+        return cls.priority_table().get((channel_id, country_code), ())
+
+    @classmethod
+    def priority_table(cls):
+        """Закешированная таблица (channel_id, country_code) -> ((carrier_name, priority), ...) по убыванию приоритета"""
+        return process_cache.get('carrier_priority', 'priority_table', cls._load_priority_table)
+
+    @classmethod
+    def _load_priority_table(cls):
+        qs = DBSession.query(cls.channel_id, cls.country_code, Carrier.name, cls.priority) \
+            .join(Carrier, cls.carrier_id == Carrier.id) \
             .order_by(desc(cls.priority))
 
-        return [(carrier.name, carrier.priority) for carrier in qs]
+        table = {}
+        for priority in qs:
+            table.setdefault((priority.channel_id, priority.country_code), []).append((priority.name, priority.priority))
+
+        return {key: tuple(priorities) for key, priorities in table.items()}
+
+
+class ShippingJobStatus:
+    pending = 'pending'
+    processing = 'processing'
+    sent = 'sent'
+    failed = 'failed'
+
+
+class CarrierShippingJob(Base):
+    """Задание на отправку шипмента керриеру (outbox), создается в транзакции завершения заказа"""
+    __tablename__ = 'carrier_shipping_job'
+    __cache_tags__ = ['carrier_shipping_job']
+
+    id = Column(Integer, primary_key=True, doc=u'ID', info={'skip_filters': True})
+    shipment_id = Column(Integer, ForeignKey('order_shipment.id', onupdate='CASCADE', ondelete='CASCADE'), index=True, nullable=False, info={'skip_filters': True})
+    carrier_id = Column(Integer, ForeignKey('carrier.id', onupdate='CASCADE', ondelete='CASCADE'), index=True, nullable=False, info={'skip_filters': True})
+
+    channel_code = Column(Unicode(64), nullable=False, doc=u'Channel Code')
+    status = Column(Unicode(16), nullable=False, index=True, default=ShippingJobStatus.pending, server_default=ShippingJobStatus.pending, doc=u'Status')
+    attempts = Column(Integer, nullable=False, default=0, server_default='0', doc=u'Attempts')
+    tracking_number = Column(Unicode(), nullable=True, doc=u'Tracking Number')
+    message = Column(UnicodeText, nullable=True, doc=u'Message')
+    locked_by = Column(Unicode(128), nullable=True, doc=u'Locked by', info={'skip_filters': True})
+    locked_until = Column(DateTime, nullable=True, doc=u'Locked until', info={'skip_filters': True})
+    next_attempt_at = Column(DateTime, nullable=True, index=True, doc=u'Next attempt at')
+    order_status = Column(DeclSource(Unicode(64), enum.OrderStatus), nullable=True, doc=u'Order status before completion')
+
+    created = db_created()
+    updated = db_updated()
+
+    shipment = relation('OrderShipment', doc=u'Shipment', info={'skip_filters': True})
+    carrier = relation(Carrier, doc=u'Carrier', info={'skip_filters': True})
+
+    def retry_later(self, base_delay, max_delay):
+        """Повторная попытка с экспоненциальной задержкой и случайным разбросом"""
+        delay = min(base_delay * 2 ** max(self.attempts - 1, 0), max_delay)
+        self.status = ShippingJobStatus.pending
+        self.next_attempt_at = datetime.utcnow() + timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+process_cache.watch(CarrierPriority)
@@ -1,12 +1,11 @@
 from pimly.models import enum
 
-from .shipping import NaqelShippingService
 from ..abc.carrier import AbstractCarrier
-from .tracking import TrackingService
+from ..registry import LazyAttribute
 
 
 class Naqel(AbstractCarrier):
     name = enum.CarrierName.naqel
     awb_warning_limit = 5000
-    ShippingService = NaqelShippingService
-    TrackingService = TrackingService
+    ShippingService = LazyAttribute('.shipping', 'NaqelShippingService')
+    TrackingService = LazyAttribute('.tracking', 'TrackingService')
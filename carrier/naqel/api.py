@@ -6,11 +6,11 @@ from unidecode import unidecode
 from lxml import etree
 from pyramid.settings import asbool
 from pyramid.threadlocal import get_current_registry
-from zeep import Client, Transport
 
 from pimly.utils.vat import VATOrder
-from pimly.models import DBSession, enum
+from pimly.models import enum
 from ..abc.exc import SendingOrderDelayed
+from ..abc.soap import soap_clients
 from pimly.models.carrier.models import Carrier
 from pimly.utils.cache import cached_property
 from .city_codes import get_city_code, get_country_code
@@ -23,14 +23,19 @@ class NaqelAPI(object):
 
     def __init__(self, settings=None, channel='default'):
         settings = settings or get_current_registry().settings
+        self.settings = settings
         self.production_mode = asbool(settings.get('pimly.order_api.production_mode', False))
-        self.url = self.production_url if self.production_mode else self.staging_url
-        self.carrier = self._load_carrier()
-        self.carrier_settings = self._load_carrier_settings(channel)
+        self.carrier_settings = Carrier.cached_settings(enum.CarrierName.naqel, channel)
 
-    @cached_property
+    @classmethod
+    def soap_client(cls, settings):
+        production_mode = asbool(settings.get('pimly.order_api.production_mode', False))
+        url = cls.production_url if production_mode else cls.staging_url
+        return soap_clients.get(settings, url, timeout=120, operation_timeout=120)
+
+    @property
     def client(self):
-        return Client(self.url, transport=Transport(timeout=120, operation_timeout=120))
+        return self.soap_client(self.settings)
 
     @cached_property
     def factory(self):
@@ -80,13 +85,6 @@ class NaqelAPI(object):
 
         return response or []
 
-    def _load_carrier_settings(self, channel):
-        return self.carrier.get_settings(channel)
-
-    @staticmethod
-    def _load_carrier():
-        return DBSession.query(Carrier).filter(Carrier.name == enum.CarrierName.naqel).one()
-
 
 class NaqelOrderAPI(NaqelAPI):
 
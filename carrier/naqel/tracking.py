@@ -1,17 +1,11 @@
-import transaction
-from _operator import attrgetter
 from collections import namedtuple
-from datetime import datetime
-from itertools import groupby
-
-from sqlalchemy.orm import selectinload
 
 from pimly.models import DBSession, enum
 from pimly.models.catalog import Channel
 from pimly.models.orders import Order, OrderShipment
-from pimly.models.tracking.enum import MilestoneType, OrderShipmentStatus
+from pimly.models.tracking.enum import MilestoneType
 from pimly.models.tracking.models import ShipmentMilestone
-from pimly.utils import grouper
+from ..abc.fetcher import AdaptiveBatchFetcher
 from ..abc.tracking import AbstractTrackingUpdater
 from .api import NaqelAPI
 
@@ -175,103 +169,34 @@ class TrackingService(AbstractTrackingUpdater):
         super().__init__(settings, **kwargs)
         self.channel_id = kwargs['channel_id']
         self.channel_code = DBSession.query(Channel.code).filter(Channel.id == self.channel_id).scalar()
-
-    def update_trackings(self):
-        order_awbs = [order_shipment.tracking_number for order_shipment in self._tracking_qs]
-        for group in grouper(10, order_awbs):
-            orders_tracking_info = self._get_events(filter(None, group))
-            self._update_shipment_milestones(orders_tracking_info)
-
-            delivered_tracking_numbers = [tracking['hawb'] for tracking in orders_tracking_info if tracking['is_delivered']]
-            self._set_delivered_status(delivered_tracking_numbers)
-            self._update_shipment_delivery_date(delivered_tracking_numbers)
-
-    def _get_events(self, hawbs):
-        naqel_api = NaqelAPI(self.settings, self.channel_code)
-        carrier_events = naqel_api.get_tracking_info(hawbs)
-        events = [self._parse_events(event) for event in carrier_events]
-        orders_tracking_info = []
-        for hawb, events_by_hawb in groupby(filter(None,events), key=attrgetter('hawb')):
-            tracking_info = list(events_by_hawb)
-            orders_tracking_info.append({
-                'hawb': hawb,
-                'is_delivered': self._check_delivered_status(tracking_info),
-                'tracking_info': tracking_info
-            })
-        return orders_tracking_info
-
-    @staticmethod
-    def _parse_events(event):
-        milestone = MILESTONES.get(event['ActivityCode'])
-        if milestone:
-            return NaqelTrackInfo(
+        self.fetcher = AdaptiveBatchFetcher.from_settings(
+            settings, self.carrier_name.name, NaqelAPI(self.settings, self.channel_code).get_tracking_info,
+            batch_size=10, max_batch_size=100, target_latency=30,
+        )
+
+    def fetch(self, tracking_numbers):
+        for _, response in self.fetcher.results(filter(None, tracking_numbers)):
+            yield response
+
+    def parse(self, batch):
+        for event in batch:
+            yield str(event['WaybillNo']), NaqelTrackInfo(
                 hawb=str(event['WaybillNo']),
-                milestone=milestone,
+                milestone=MILESTONES.get(event['ActivityCode']),
                 event_code=str(event['ActivityCode']),
                 event_date=event['Date'],
                 description=event['Activity'],
             )
-        else:
-            return None
-
-    @staticmethod
-    def _check_delivered_status(milestones):
-        for milestone in milestones:
-            if MilestoneType.is_delivered_milestone(milestone.milestone):
-                return True
-        return False
-
-    def _update_shipment_milestones(self, orders_tracking_info):
-        for order_tracking in orders_tracking_info:
-            with transaction.manager:
-                order_shipment = DBSession.query(OrderShipment) \
-                    .filter(OrderShipment.status_history != None,
-                            ~OrderShipment.current_status.in_([OrderShipmentStatus.delivered, OrderShipmentStatus.returned]),
-                            OrderShipment.carrier_id == self.carrier_id,
-                            OrderShipment.tracking_number == order_tracking['hawb']) \
-                    .first()
-                if not order_shipment:
-                    continue
-
-                milestones = [ShipmentMilestone(
-                    shipment_id=order_shipment.id,
-                    is_customer_view=tracking.milestone.args['is_customer_view'],
-                    milestone=tracking.milestone,
-                    carrier_code=tracking.event_code,
-                    event_date=tracking.event_date,
-                    description=tracking.description)
-                    for tracking in order_tracking['tracking_info']]
-                new_milestones = order_shipment.filter_milestones(milestones)
-                # Sort for the further correct addition of ShipmentNotification
-                new_milestones.sort()
-                DBSession.add_all(new_milestones)
-                DBSession.refresh(order_shipment)
-                order_shipment.update_status_info()
-
-    def _set_delivered_status(self, delivered_tracking_numbers):
-        order_shipment_qs = DBSession.query(OrderShipment.order_id) \
-            .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
-                    OrderShipment.carrier_id == self.carrier_id)
-
-        for group in grouper(100, [order_shipment.order_id for order_shipment in order_shipment_qs]):
-            delivered_order_ids = list(filter(None, group))
-            with transaction.manager:
-                order_qs = DBSession.query(Order) \
-                    .filter(Order.id.in_(delivered_order_ids)) \
-                    .options(selectinload('shipments').load_only('current_status'))
-                for order in order_qs:
-                    if all(sh.current_status == OrderShipmentStatus.delivered for sh in order.shipments):
-                        order.status = enum.OrderStatus.delivered
-                        DBSession.flush()
-            self.log.info(f"Naqel. Set delivered status for orders (id): {delivered_order_ids}")
 
-    def _update_shipment_delivery_date(self, delivered_tracking_numbers):
-        with transaction.manager:
-            DBSession.query(OrderShipment) \
-                .filter(OrderShipment.tracking_number.in_(delivered_tracking_numbers),
-                        OrderShipment.current_status == OrderShipmentStatus.delivered) \
-                .update({OrderShipment.delivered_date: datetime.utcnow()},
-                        synchronize_session=False)
+    def _create_milestone(self, shipment_id, tracking):
+        return ShipmentMilestone(
+            shipment_id=shipment_id,
+            is_customer_view=tracking.milestone.args['is_customer_view'],
+            milestone=tracking.milestone,
+            carrier_code=tracking.event_code,
+            event_date=tracking.event_date,
+            description=tracking.description,
+        )
 
     @property
     def _tracking_qs(self):
@@ -0,0 +1,368 @@
+import collections
+import datetime
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import transaction
+from pimly.models import DBSession
+from pimly.models.enum import OrderStatus
+from pimly.models.carrier.models import Carrier, CarrierNumber, CarrierShippingJob, ShippingJobStatus
+from pimly.tasks.send_email import send_shipment_email
+from pyramid.settings import asbool
+from sqlalchemy import func, text
+
+from .abc.exc import SendingOrderCancelled
+from .selector import CarrierSelector
+
+
+class ShippingOutbox:
+    """
+    Отправка и повторная отправка шипментов керриерам вне веб запроса.
+    Завершение заказа создает CarrierShippingJob в своей транзакции, ошибка отправки
+    планирует задание на next_attempt_at с экспоненциальной задержкой. Воркеры забирают готовые задания
+    (FOR UPDATE SKIP LOCKED) с ограничением числа одновременных отправок на керриера
+    и записывают трекинг номер в шипмент. Задание, воркер которого упал, снова становится
+    доступным после locked_until. Воркеры запускаются процессом outbox_worker.
+    Настройки: pimly.carriers.outbox (вкл/выкл), pimly.carriers.outbox.workers / poll_interval / max_attempts,
+    pimly.carriers.outbox.retry_base / retry_max, pimly.carriers.outbox.[<carrier>.]concurrency
+    Керриеры с send_shipments (Aramex) могут отправлять задания пачками:
+    pimly.carriers.outbox.[<carrier>.]batch_size / batch_latency - пачка отправляется, когда набралось
+    batch_size заданий или самое старое ждет дольше batch_latency секунд.
+    """
+    log = logging.getLogger('carriers_orders')
+    exception_log = logging.getLogger('carriers_orders_exceptions')
+    lease_ttl = datetime.timedelta(minutes=10)
+
+    claim_sql = text(f"""
+        UPDATE {CarrierShippingJob.__tablename__}
+        SET status = :processing, locked_by = :owner, locked_until = :locked_until
+        WHERE id IN (
+            SELECT id FROM {CarrierShippingJob.__tablename__}
+            WHERE carrier_id = :carrier_id
+              AND ((status = :pending AND (next_attempt_at IS NULL OR next_attempt_at <= :now))
+                   OR (status = :processing AND locked_until < :now))
+            ORDER BY next_attempt_at NULLS FIRST, id
+            LIMIT :size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id
+    """)
+
+    due_sql = text(f"""
+        SELECT count(id) AS due, min(coalesce(next_attempt_at, created)) AS oldest
+        FROM {CarrierShippingJob.__tablename__}
+        WHERE carrier_id = :carrier_id
+          AND ((status = :pending AND (next_attempt_at IS NULL OR next_attempt_at <= :now))
+               OR (status = :processing AND locked_until < :now))
+    """)
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.workers = int(settings.get('pimly.carriers.outbox.workers', 8))
+        self.poll_interval = float(settings.get('pimly.carriers.outbox.poll_interval', 2))
+        self.max_attempts = int(settings.get('pimly.carriers.outbox.max_attempts', 10))
+        self.retry_delays = (float(settings.get('pimly.carriers.outbox.retry_base', 60)),
+                             float(settings.get('pimly.carriers.outbox.retry_max', 60 * 60)))
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._running = collections.Counter()
+        self._results = collections.defaultdict(collections.Counter)
+
+    @staticmethod
+    def enabled(settings):
+        return asbool(settings.get('pimly.carriers.outbox', False))
+
+    @staticmethod
+    def enqueue(shipment, shipping_service, channel_code, order_status=None):
+        """
+        Задание на отправку в текущей транзакции. order_status - статус заказа до завершения:
+        если керриер отклонит шипмент, заказ возвращается в этот статус
+        """
+        job = CarrierShippingJob(
+            shipment=shipment,
+            carrier_id=shipping_service.carrier_info.id,
+            channel_code=channel_code,
+            order_status=order_status,
+        )
+        DBSession.add(job)
+        return job
+
+    def run(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='carrier-outbox') as executor:
+            while not stop_event.is_set():
+                claimed = self.claim()
+                for job_ids, carrier_name in claimed:
+                    executor.submit(self.process, job_ids, carrier_name)
+
+                if not claimed:
+                    stop_event.wait(self.poll_interval)
+
+    def claim(self):
+        """Забираем задания в пределах свободных слотов каждого керриера: [(job_ids, carrier_name)]"""
+        claimed = []
+        now = datetime.datetime.utcnow()
+        for carrier in CarrierSelector.get_carriers():
+            # задания не должны ждать в очереди пула дольше аренды: не больше свободных потоков
+            with self._lock:
+                free = min(self.concurrency(carrier.name) - self._running[carrier.name],
+                           self.workers - sum(self._running.values()))
+            if free <= 0:
+                continue
+
+            params = {
+                'processing': ShippingJobStatus.processing,
+                'pending': ShippingJobStatus.pending,
+                'owner': self.owner,
+                'locked_until': now + self.lease_ttl,
+                'now': now,
+                'carrier_id': Carrier.cached(carrier.name).id,
+            }
+            batch_size = self.batch_size(carrier)
+            with DBSession.get_bind().begin() as connection:
+                if batch_size > 1 and not self._batch_ready(connection, carrier, batch_size, params):
+                    continue
+                rows = connection.execute(self.claim_sql, dict(params, size=free * batch_size)).fetchall()
+
+            job_ids = [row.id for row in rows]
+            units = [job_ids[i:i + batch_size] for i in range(0, len(job_ids), batch_size)]
+            with self._lock:
+                self._running[carrier.name] += len(units)
+            claimed.extend((unit, carrier.name) for unit in units)
+
+        return claimed
+
+    def process(self, job_ids, carrier_name):
+        accepted = {}
+        try:
+            with transaction.manager:
+                jobs = self._owned_jobs(job_ids)
+                if len(jobs) < len(job_ids):
+                    lost = sorted(set(job_ids) - {job.id for job in jobs})
+                    self.log.warning(f"Shipping jobs {lost} to {carrier_name.value} are no longer owned by {self.owner}, skipped")
+                if len(jobs) == 1:
+                    statuses = [self._send(jobs[0], accepted)]
+                elif jobs:
+                    statuses = self._send_batch(jobs, accepted)
+                else:
+                    statuses = []
+            self._send_emails(accepted)
+            for status in statuses:
+                self._count(carrier_name, status)
+        except Exception as e:
+            self.exception_log.exception(f"Shipping jobs {job_ids} to {carrier_name.value} failed")
+            try:
+                self._recover(job_ids, carrier_name, accepted, e)
+            except Exception:
+                self.exception_log.exception(f"Can not recover shipping jobs {job_ids} to {carrier_name.value}, "
+                                             f"tracking numbers accepted by the carrier: {accepted}")
+        finally:
+            DBSession.remove()
+            with self._lock:
+                self._running[carrier_name] -= 1
+
+    def _owned_jobs(self, job_ids):
+        """
+        Задания, которые все еще арендованы этим воркером. Строки блокируются до конца транзакции,
+        поэтому после истечения аренды другой воркер не заберет задание, пока идет отправка керриеру
+        """
+        return DBSession.query(CarrierShippingJob) \
+            .filter(CarrierShippingJob.id.in_(job_ids),
+                    CarrierShippingJob.locked_by == self.owner,
+                    CarrierShippingJob.status == ShippingJobStatus.processing) \
+            .order_by(CarrierShippingJob.id) \
+            .with_for_update(skip_locked=True) \
+            .all()
+
+    def _recover(self, job_ids, carrier_name, accepted, exc):
+        """
+        Ошибка вне обработки ответа керриера (в том числе при коммите): транзакция отправки откатилась.
+        Шипменты, которые керриер уже принял, отмечаются отправленными с полученным трекинг номером,
+        остальные задания повторяются позже
+        """
+        recovered = {}
+        statuses = []
+        resend_allowed = CarrierSelector.get_carrier(carrier_name).ShippingService.resend_allowed
+        with transaction.manager:
+            for job in self._owned_jobs(job_ids):
+                job.attempts += 1
+                job.locked_until = None
+                if job.id in accepted:
+                    tracking_number = accepted[job.id][1]
+                    # номер из пула был удален в откаченной транзакции
+                    DBSession.query(CarrierNumber) \
+                        .filter(CarrierNumber.carrier_id == job.carrier_id,
+                                CarrierNumber.number == tracking_number) \
+                        .delete(synchronize_session=False)
+                    job.shipment.tracking_number = tracking_number
+                    job.tracking_number = tracking_number
+                    job.status = ShippingJobStatus.sent
+                    job.message = None
+                    recovered[job.id] = accepted[job.id]
+                else:
+                    self._retry_or_fail(job, str(exc), resend_allowed)
+                statuses.append(job.status)
+
+        self._send_emails(recovered)
+        for status in statuses:
+            self._count(carrier_name, status)
+
+    def batch_size(self, carrier):
+        if not hasattr(carrier.ShippingService, 'send_shipments'):
+            return 1
+        return max(int(self._option(carrier.name, 'batch_size', 1)), 1)
+
+    def _batch_ready(self, connection, carrier, batch_size, params):
+        due = connection.execute(self.due_sql, params).first()
+        if not due.due:
+            return False
+
+        latency = datetime.timedelta(seconds=float(self._option(carrier.name, 'batch_latency', 30)))
+        return due.due >= batch_size or due.oldest <= params['now'] - latency
+
+    def stats(self):
+        """
+        По каждому керриеру: отправлено/ошибок в этом процессе, отправок в минуту,
+        заданий в очереди, максимум попыток и время создания самого старого задания
+        """
+        minutes = max(time.monotonic() - self.started, 1) / 60
+        stats = {
+            carrier.name: {
+                'sent': self._results[carrier.name][ShippingJobStatus.sent],
+                'failed': self._results[carrier.name][ShippingJobStatus.failed],
+                'retried': self._results[carrier.name][ShippingJobStatus.pending],
+                'per_minute': self._results[carrier.name][ShippingJobStatus.sent] / minutes,
+                'pending': 0,
+                'max_attempts': 0,
+                'oldest_pending': None,
+            }
+            for carrier in CarrierSelector.get_carriers()
+        }
+
+        qs = DBSession.query(Carrier.name,
+                             func.count(CarrierShippingJob.id),
+                             func.max(CarrierShippingJob.attempts),
+                             func.min(CarrierShippingJob.created)) \
+            .join(CarrierShippingJob.carrier) \
+            .filter(CarrierShippingJob.status.in_([ShippingJobStatus.pending, ShippingJobStatus.processing])) \
+            .group_by(Carrier.name)
+        for carrier_name, pending, max_attempts, oldest_pending in qs:
+            stats.setdefault(carrier_name, {}).update(
+                pending=pending,
+                max_attempts=max_attempts,
+                oldest_pending=oldest_pending,
+            )
+
+        return stats
+
+    def concurrency(self, carrier_name):
+        return int(self._option(carrier_name, 'concurrency', 2))
+
+    def _option(self, carrier_name, option, default):
+        value = self.settings.get(f'pimly.carriers.outbox.{carrier_name.name}.{option}')
+        if value is None:
+            value = self.settings.get(f'pimly.carriers.outbox.{option}', default)
+        return value
+
+    def _send(self, job, accepted):
+        shipment = job.shipment
+        shipping_service = CarrierSelector.get_shipping_service(self.settings, job.carrier.name, job.channel_code)
+        resend = job.attempts > 0
+        job.attempts += 1
+        job.locked_until = None
+        savepoint = transaction.savepoint()
+        try:
+            if resend:
+                shipping_service.resend_shipments([shipment])
+                tracking_number = shipment.tracking_number
+            else:
+                tracking_number = shipping_service.send_shipment(shipment)
+        except SendingOrderCancelled as e:
+            savepoint.rollback()
+            self._cancel(job, str(e))
+        except shipping_service.send_exceptions as e:
+            # таск на повторную отправку уже сохранен в send_shipment
+            self._retry_or_fail(job, str(e), shipping_service.resend_allowed)
+        else:
+            self._mark_sent(job, tracking_number, accepted)
+
+        DBSession.flush()
+        return job.status
+
+    def _send_batch(self, jobs, accepted):
+        """Пачка заданий одного керриера: один документ на канал и учетные данные керриера"""
+        statuses = []
+        jobs_by_channel = {}
+        for job in jobs:
+            job.attempts += 1
+            job.locked_until = None
+            jobs_by_channel.setdefault(job.channel_code, []).append(job)
+
+        for channel_code, channel_jobs in jobs_by_channel.items():
+            shipping_service = CarrierSelector.get_shipping_service(self.settings, channel_jobs[0].carrier.name, channel_code)
+            results = shipping_service.send_shipments([job.shipment for job in channel_jobs])
+            for job in channel_jobs:
+                exc = results[job.shipment_id]
+                if exc is None:
+                    self._mark_sent(job, job.shipment.tracking_number, accepted)
+                elif isinstance(exc, SendingOrderCancelled):
+                    self._cancel(job, str(exc))
+                else:
+                    self._retry_or_fail(job, str(exc), shipping_service.resend_allowed)
+                statuses.append(job.status)
+
+        DBSession.flush()
+        return statuses
+
+    def _retry_or_fail(self, job, message, retry=True):
+        """
+        Повтор задания позже. Задание без повтора (керриер не разрешает повторную отправку)
+        или исчерпавшее max_attempts становится failed, его таск на повторную отправку остается оператору
+        """
+        job.message = message
+        if retry and job.attempts < self.max_attempts:
+            job.retry_later(*self.retry_delays)
+        else:
+            job.status = ShippingJobStatus.failed
+
+    def _cancel(self, job, message):
+        """
+        Керриер отклонил шипмент. Как при синхронной отправке, завершение заказа не должно остаться в силе:
+        заказ возвращается в статус до завершения, чтобы его можно было завершить снова, ошибка уходит операторам
+        """
+        job.status = ShippingJobStatus.failed
+        job.message = message
+        order = job.shipment.order
+        if job.order_status is not None and order.status == OrderStatus.complete:
+            order.status = job.order_status
+            DBSession.flush()
+        self.exception_log.error(f"Order {order.code}: shipment {job.shipment_id} was rejected by "
+                                 f"{job.carrier.name.value}: {message}. Order status: {order.status.value}")
+
+    def _mark_sent(self, job, tracking_number, accepted):
+        """Керриер принял шипмент. accepted хранит результат вне транзакции, чтобы не потерять его при ошибке коммита"""
+        shipment = job.shipment
+        shipment.tracking_number = tracking_number
+        job.tracking_number = tracking_number
+        job.status = ShippingJobStatus.sent
+        job.message = None
+        accepted[job.id] = (shipment.id, tracking_number, shipment.can_send_shipping_email)
+
+    def _send_emails(self, accepted):
+        """Письма отправляются только после коммита трекинг номеров"""
+        for shipment_id, tracking_number, send_email in accepted.values():
+            if not send_email:
+                continue
+            try:
+                send_shipment_email.apply_async(args=(shipment_id,), countdown=10)
+            except Exception:
+                self.exception_log.exception(f"Can not schedule shipment email for shipment {shipment_id}")
+
+    def _count(self, carrier_name, status):
+        with self._lock:
+            self._results[carrier_name][status] += 1
@@ -0,0 +1,43 @@
+"""
+Процесс воркеров ShippingOutbox: забирает задания на отправку шипментов керриерам, пока не получит SIGTERM/SIGINT.
+Запускается отдельно от веб процессов (supervisor/systemd), по одному процессу на узел или больше.
+Запуск: python -m pimly.models.carrier.outbox_worker <config.ini>
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from pyramid.paster import bootstrap, setup_logging
+
+from .outbox import ShippingOutbox
+from .selector import CarrierSelector
+
+log = logging.getLogger('carriers_orders')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('config_uri')
+    args = parser.parse_args(argv)
+
+    setup_logging(args.config_uri)
+    with bootstrap(args.config_uri) as env:
+        settings = env['registry'].settings
+        if not ShippingOutbox.enabled(settings):
+            log.warning("Shipping outbox is disabled (pimly.carriers.outbox), workers are not started")
+            return
+
+        stop_event = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda signum, frame: stop_event.set())
+
+        CarrierSelector.warm_up(settings)
+        outbox = ShippingOutbox(settings)
+        log.info(f"Shipping outbox {outbox.owner} started with {outbox.workers} workers")
+        outbox.run(stop_event)
+        log.info(f"Shipping outbox {outbox.owner} stopped: {outbox.stats()}")
+
+
+if __name__ == '__main__':
+    main()
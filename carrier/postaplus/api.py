@@ -7,17 +7,15 @@ import re
 import os
 
 from pyramid.settings import asbool
-from requests import Session
 from unidecode import unidecode
-from zeep import Client, Transport
 from lxml import etree
 
-from pimly.utils import cached_property
 from pimly.utils.helpers import normalize_arabic_phone
 from pimly.utils.vat import VATOrder
-from pimly.models import DBSession, enum
+from pimly.models import enum
 from pimly.models.carrier.models import Carrier
 from ..abc.exc import SendingOrderDelayed, SendingOrderCancelled
+from ..abc.soap import soap_clients
 
 from .city_codes import get_country_code, get_city_code
 
@@ -36,18 +34,11 @@ class PostaPlusAPI:
     exception_log = logging.getLogger('carriers_orders_exceptions')
 
     def __init__(self, shipment, settings):
-        production_mode = asbool(settings.get('pimly.order_api.production_mode', False))
-        self.url = self.production_url if production_mode else self.staging_url
+        self.settings = settings
         self.shipment = shipment
         self.order = shipment.order
         self.vat_order = VATOrder(self.shipment)
-        self.carrier = self._carrier_qs.one()
-        self.carrier_settings = self.carrier.get_settings(self.order.channel.code)
-
-        if production_mode:
-            self.verify = os.path.join(settings['webassets.base_dir'], enum.CarrierName.postaplus.name, 'api-certificate.crt')
-        else:
-            self.verify = False
+        self.carrier_settings = Carrier.cached_settings(enum.CarrierName.postaplus, self.order.channel.code)
 
     def send_order(self):
         shipping_info = self._shipping_info()
@@ -63,51 +54,20 @@ class PostaPlusAPI:
         if response != self.shipment.tracking_number:
             raise SendingOrderDelayed(f"Invalid PostaPlus response: {response}, Carrier Order UID: {self.shipment.tracking_number}")
 
-    def get_shipping_tracking_info(self):
-        response = self.client.service.Shipment_Tracking(
-            UserName=self.carrier_settings.username,
-            Password=self.carrier_settings.password,
-            ShipperAccount=self.carrier_settings.shipper_account,
-            AirwaybillNumber=self.shipment.tracking_number,
-            Reference1='',
-            Reference2=''
-        )
-
-        last_order_tracking = response[0]
-
-        if last_order_tracking.ErrorMsg is not None:
-            self.exception_log.error(f"PostapPlus. Response for order {self.order.code} has error message: {last_order_tracking.ErrorMsg}")
-            request = self.client.create_message(
-                self.client.service,
-                "Shipment_Tracking",
-                UserName=self.carrier_settings.username,
-                Password=self.carrier_settings.password,
-                ShipperAccount=self.carrier_settings.shipper_account,
-                AirwaybillNumber=self.shipment.tracking_number,
-                Reference1='',
-                Reference2=''
-            )
-            self.exception_log.error(f"Request: {etree.tostring(request, pretty_print=True)}")
-            raise SendingOrderCancelled(f"Shipment Tracking Failed. Response ({last_order_tracking.ErrorMsg})")
-
-        tracking_info = []
-        for track in response:
-            try:
-                tracking_info.append(PostaPlusTrackInfo(
-                    event_code=track.Event,
-                    event_date=datetime.strptime(track.DateTime, '%d/%m/%Y %H:%M:%S'),
-                    description=track.Note
-                ))
-            except ValueError as e:
-                self.exception_log.exception("PostapPlus: Error during parse Response. [Event Date format]")
+    @classmethod
+    def soap_client(cls, settings):
+        if asbool(settings.get('pimly.order_api.production_mode', False)):
+            url = cls.production_url
+            verify = os.path.join(settings['webassets.base_dir'], enum.CarrierName.postaplus.name, 'api-certificate.crt')
+        else:
+            url = cls.staging_url
+            verify = False
 
-        return tracking_info
+        return soap_clients.get(settings, url, verify=verify, timeout=180, operation_timeout=60)
 
-    @cached_property
+    @property
     def client(self):
-        session = Session()
-        session.verify = self.verify
-        return Client(self.url, transport=Transport(timeout=180, operation_timeout=60, session=session))
+        return self.soap_client(self.settings)
 
     def _validate(self, shipping_info):
         mobile = shipping_info['Consignee']['ToMobile']
@@ -238,10 +198,6 @@ class PostaPlusAPI:
             } for _ in range(self.shipment.box_qty)
         ]
 
-    @property
-    def _carrier_qs(self):
-        return DBSession.query(Carrier).filter(Carrier.name == enum.CarrierName.postaplus)
-
 
 def replace_characters(text, replacer):
     if not text:
@@ -257,3 +213,61 @@ def normalize_arabic_numbers(text):
             character = unidecode(character)
         output.append(character)
     return ''.join(output)
+
+
+class PostaPlusTrackingAPI:
+    """Трекинг PostaPlus по AWB канала, без шипмента"""
+    log = logging.getLogger('carriers_orders')
+    exception_log = logging.getLogger('carriers_orders_exceptions')
+
+    def __init__(self, settings, channel='default'):
+        self.settings = settings
+        self.carrier_settings = Carrier.cached_settings(enum.CarrierName.postaplus, channel)
+
+    @property
+    def client(self):
+        return PostaPlusAPI.soap_client(self.settings)
+
+    def get_tracking_info(self, tracking_number):
+        try:
+            response = self.client.service.Shipment_Tracking(
+                UserName=self.carrier_settings.username,
+                Password=self.carrier_settings.password,
+                ShipperAccount=self.carrier_settings.shipper_account,
+                AirwaybillNumber=tracking_number,
+                Reference1='',
+                Reference2=''
+            )
+        except Exception as e:
+            self.exception_log.exception(f"PostaPlus. An error occurred while receiving tracking response for awb {tracking_number}")
+            raise SendingOrderDelayed(f"PostaPlus API not available: {e}")
+
+        last_order_tracking = response[0]
+
+        if last_order_tracking.ErrorMsg is not None:
+            self.exception_log.error(f"PostapPlus. Response for awb {tracking_number} has error message: {last_order_tracking.ErrorMsg}")
+            request = self.client.create_message(
+                self.client.service,
+                "Shipment_Tracking",
+                UserName=self.carrier_settings.username,
+                Password=self.carrier_settings.password,
+                ShipperAccount=self.carrier_settings.shipper_account,
+                AirwaybillNumber=tracking_number,
+                Reference1='',
+                Reference2=''
+            )
+            self.exception_log.error(f"Request: {etree.tostring(request, pretty_print=True)}")
+            raise SendingOrderCancelled(f"Shipment Tracking Failed. Response ({last_order_tracking.ErrorMsg})")
+
+        tracking_info = []
+        for track in response:
+            try:
+                tracking_info.append(PostaPlusTrackInfo(
+                    event_code=track.Event,
+                    event_date=datetime.strptime(track.DateTime, '%d/%m/%Y %H:%M:%S'),
+                    description=track.Note
+                ))
+            except ValueError as e:
+                self.exception_log.exception("PostapPlus: Error during parse Response. [Event Date format]")
+
+        return tracking_info
@@ -0,0 +1,398 @@
+# - *- coding: utf- 8 - *-
+CITY_CODES = {
+    'KW': {
+        'country_code': 'KWT',
+        'city_codes': {
+            'kuwait': 'CITY415729',
+            'kuwait city': 'CITY415729',
+            'mubarak al kabeer': 'CITY144262',
+            'al jahra': 'CITY72126',
+            'jabriya': 'CITY72125',
+            'salwa': 'CITY239872',
+            'abdulla al mubarak al sabah': 'CITY72128',
+            'hawally': 'CITY168444',
+            'sabah al salem': 'CITY336647',
+            'saad abdullah city': 'CITY144264',
+            'sabah al naser': 'CITY287977',
+            'al adan': 'CITY192283',
+            'ahmadi': 'CITY24044',
+            'ardiya': 'CITY144258',
+            'farwaniyah': 'CITY192289',
+            'hadiya': 'CITY215993',
+            'fahad al ahmed area': 'CITY24047',
+            'jaber al ali': 'CITY215994',
+            'salmiya': 'CITY72131',
+            'sabahiya': 'CITY48125',
+            'jabir al ahmad': 'CITY24048',
+            'andalous': 'CITY4',
+            'zahra': 'CITY360695',
+            'bayan': 'CITY215990',
+            'rumaithiya': 'CITY8',
+            'qurtuba': 'CITY72129',
+            'al salam': 'CITY263805',
+            'ali sabah al salem': 'CITY11',
+            'firdous': 'CITY24057',
+            'surra': 'CITY239873',
+            'hateen': 'CITY120310',
+            'ishbilya': 'CITY144261',
+            'qurain': 'CITY72130',
+            'mishref': 'CITY72127',
+            'fahaheel': 'CITY120309',
+            'kaifan': 'CITY5',
+            'khaldiya': 'CITY24050',
+            'abu fateera': 'CITY239867',
+            'manqaf': 'CITY24051',
+            'jahra industrial area': 'CITY215995',
+            'north west sulaibikhat': 'CITY144268',
+            'qusor': 'CITY192285',
+            'nahda': 'CITY96299',
+            'abraq khaitan': 'CITY287976',
+            'al shuhada': 'CITY192296',
+            'adailiya': 'CITY360691',
+            'fintas': 'CITY312160',
+            'rehab': 'CITY96304',
+            'rawda': 'CITY192292',
+            'al rabiah': 'CITY239871',
+            'qeirawan': 'CITY192291',
+            'faiha': 'CITY215991',
+            'doha': 'CITY96301',
+            'dhaher': 'CITY24046',
+            'omariyah': 'CITY168445',
+            'yarmouk': 'CITY312163',
+            'midan hawally': 'CITY6',
+            'dasma': 'CITY312159',
+            'nuzha': 'CITY215996',
+            'mahboula': 'CITY48124',
+            'granada': 'CITY96302',
+            'sabah al ahmad': 'CITY96305',
+            'sideeq': 'CITY144266',
+            'sharq': 'CITY192294',
+            'qadsiya': 'CITY7',
+            'abdullah mubarak west jleeb shyookh': 'CITY263802',
+            'aqeela': 'CITY239869',
+            'daiya': 'CITY192288',
+            'shamiyah': 'CITY144265',
+            'abdulla al salem': 'CITY72123',
+            'waha': 'CITY168442',
+            "a'youn": 'CITY168441',
+            'beneid al gar': 'CITY192287',
+            'naseem': 'CITY48122',
+            'shuwaikh': 'CITY336648',
+            'kazma': 'CITY312161',
+            'regiee': 'CITY24056',
+            'masayel': 'CITY24053',
+            'south jahra': 'CITY239874',
+            'abdali': 'CITY239866',
+            'abu haleefa': 'CITY287971',
+            'abu hassaniya': 'CITY239868',
+            'al mseilah': 'CITY2',
+            'al naeem': 'CITY192284',
+            'al qaser': 'CITY3',
+            'amghara': 'CITY360689',
+            'bidaa': 'CITY360690',
+            'dajeej': 'CITY144260',
+            'dasman': 'CITY48123',
+            'fnaitees': 'CITY215992',
+            # 'jleeb al shyookh': 'CITY360692',
+            'khairan': 'CITY192290',
+            'mansooriyah': 'CITY24052',
+            'mirqab': 'CITY96303',
+            'nuwaiseb': 'CITY239870',
+            'qibleh': 'CITY24055',
+            'saleebiyah': 'CITY215998',
+            'tayma': 'CITY360694',
+            'wafra': 'CITY24060',
+        },
+    },
+    'BH': {
+        'country_code': 'BHR',
+        'city_codes': {
+            'abu beham': 'CITY419903',
+            'abu saiba': 'CITY419904',
+            'abusaiba': 'CITY216020',
+            'adliya': 'CITY287993',
+            'al aali': 'CITY192307',
+            'al bandar': 'CITY336660',
+            'al dare': 'CITY72150',
+            'al-hidd': 'CITY192310',
+            'alakkar': 'CITY168467',
+            'alareen': 'CITY35',
+            'amwaj': 'CITY144280',
+            'arad': 'CITY72151',
+            'askar': 'CITY120328',
+            'awali': 'CITY168468',
+            'buquwa': 'CITY419905',
+            'buri': 'CITY419906',
+            'barbar': 'CITY144281',
+            'bennijarah': 'CITY312180',
+            'biladil qadeem': 'CITY96328',
+            'budaiya': 'CITY120329',
+            'burhama': 'CITY36',
+            'busaiten': 'CITY192308',
+            'dar kulaib': 'CITY419907',
+            'diraz': 'CITY419908',
+            'diplomat area': 'CITY72152',
+            'diras': 'CITY48151',
+            'durat al bahrain': 'CITY48152',
+            'durmistan': 'CITY192309',
+            'east riffa': 'CITY287994',
+            'ghurayfah': 'CITY419909',
+            'galali': 'CITY168469',
+            'gudaibiya': 'CITY360709',
+            'hajar': 'CITY419910',
+            'hillat abdulsaleh': 'CITY419911',
+            'hamadtown': 'CITY336661',
+            'hamala': 'CITY120330',
+            'hoora': 'CITY72153',
+            'isa town': 'CITY336662',
+            'jid alhaj': 'CITY419912',
+            'janabiya': 'CITY120331',
+            'jannusan': 'CITY239901',
+            'jassra': 'CITY287995',
+            'jaw': 'CITY48153',
+            'jibilath hibshi': 'CITY360710',
+            'jiddafs': 'CITY144282',
+            'jidhali': 'CITY192311',
+            'juffair': 'CITY263825',
+            'jurdab': 'CITY263826',
+            'karana': 'CITY263827',
+            'karzakhan': 'CITY144283',
+            'khamees': 'CITY24078',
+            'kharbabad': 'CITY216021',
+            'markh': 'CITY419913',
+            'musalla': 'CITY419914',
+            'mahooz': 'CITY120332',
+            'makabha': 'CITY168470',
+            'malikkiya': 'CITY96329',
+            'mameer': 'CITY72154',
+            'manama': 'CITY239902',
+            'meena salman': 'CITY336663',
+            'muharraq': 'CITY312181',
+            'muksha': 'CITY263828',
+            'nasfah': 'CITY419915',
+            'north sehla': 'CITY419916',
+            'qadam': 'CITY419917',
+            'qalali': 'CITY419918',
+            'qella': 'CITY419919',
+            'qofool': 'CITY419920',
+            'qurayya': 'CITY419921',
+            'ras ruman': 'CITY419922',
+            'riffa': 'CITY239903',
+            'sadad': 'CITY419923',
+            'sakheir': 'CITY419924',
+            'salmaniya': 'CITY419925',
+            'shahrakan': 'CITY419926',
+            'shakhura': 'CITY419927',
+            'saar': 'CITY96330',
+            'salmabad': 'CITY216022',
+            'samahije': 'CITY312182',
+            'sanabees': 'CITY263829',
+            'sanad': 'CITY263830',
+            'seef': 'CITY312183',
+            'sehala': 'CITY263831',
+            'sitra': 'CITY239904',
+            'tala island': 'CITY419928',
+            'tashan': 'CITY419929',
+            'tubli': 'CITY96331',
+            'umm alsabban (mohammadiya)': 'CITY419930',
+            'umulhazam': 'CITY263832',
+            'west rifa': 'CITY216023',
+            'zayed town': 'CITY419931',
+            'zalaq': 'CITY96332',
+            'zinj': 'CITY312184',
+        },
+    },
+    'AE': {
+        'country_code': 'ARE',
+        'city_codes': {
+            'abu dhabi city': 'CITY11616',
+            'ajman city': 'CITY91060',
+            'al ain city': 'CITY147855',
+            'al aqaa': 'CITY340168',
+            'al aweer': 'CITY304449',
+            'al barsha': 'CITY275305',
+            'al dhafra': 'CITY150937',
+            'al dhafra ab': 'CITY131587',
+            'al dhafra air base ae': 'CITY11416',
+            'al ghusais': 'CITY139024',
+            'al jaddaf': 'CITY231643',
+            'al raha': 'CITY131588',
+            'al raha beach area': 'CITY66903',
+            'arabian ranches': 'CITY115004',
+            'business bay': 'CITY291510',
+            'discovery gardens': 'CITY277603',
+            'downtown dubai': 'CITY323727',
+            'dubai': 'CITY282700',
+            'dubai academic city': 'CITY136078',
+            'dubai airport freezone': 'CITY128772',
+            'dubai health care city': 'CITY107428',
+            'dubai humanitarian city': 'CITY275306',
+            'dubai industrial city': 'CITY52001',
+            'dubai international fin. center': 'CITY32726',
+            'dubai investment park': 'CITY3856',
+            'dubai knowledge village': 'CITY315700',
+            'dubai logistic city': 'CITY381522',
+            'dubai marina': 'CITY374349',
+            'dubai motor city': 'CITY277604',
+            'dubai outsource zone': 'CITY267270',
+            'dubai silicon oasis': 'CITY169411',
+            'dubai sports city': 'CITY376944',
+            'dubai studio city': 'CITY336670',
+            'dubai water front': 'CITY117259',
+            'emirates hills': 'CITY343262',
+            'emirates lakes': 'CITY107633',
+            'fujairah city': 'CITY128957',
+            'green community': 'CITY301750',
+            'hamriya free zone': 'CITY32727',
+            'icad-1': 'CITY316130',
+            'icad-11': 'CITY138666',
+            'icad-111': 'CITY253618',
+            'inside meena port': 'CITY131787',
+            'international city': 'CITY320843',
+            'international media prod. zone': 'CITY296555',
+            'jafliya': 'CITY153214',
+            'jebel ali': 'CITY162853',
+            'jebel ali free zone': 'CITY73125',
+            'jebel ali industrial area': 'CITY3857',
+            'jumeirah beach residence': 'CITY333513',
+            'jumeirah lake towers': 'CITY248429',
+            'jumeirah village': 'CITY191503',
+            'khalifa city': 'CITY251388',
+            'khalifa city a': 'CITY114638',
+            'khalifa city b': 'CITY222482',
+            'khalifa park area': 'CITY253620',
+            'khorfakkan': 'CITY45039',
+            'meydan': 'CITY263839',
+            'mina zayed': 'CITY258279',
+            'mizher': 'CITY136694',
+            'mohammed bin zayed city': 'CITY160778',
+            'musaffah': 'CITY304450',
+            'mussafah  shabiya': 'CITY378868',
+            'nad al sheba meydan': 'CITY296741',
+            'palm island': 'CITY260856',
+            'ras al khaimah city': 'CITY63843',
+            'rashidiya': 'CITY263840',
+            'reem island': 'CITY263065',
+            'ruwais': 'CITY272388',
+            'shahama': 'CITY42730',
+            'sharjah city': 'CITY336671',
+            'sharjah free zone': 'CITY360715',
+            'sharjah international airport': 'CITY287996',
+            'sonapur': 'CITY184760',
+            'soowah island': 'CITY172323',
+            'techno park': 'CITY291928',
+            'the greens': 'CITY372091',
+            'the meadows': 'CITY355452',
+            'the springs': 'CITY115005',
+            'yas island': 'CITY123776',
+            'bustan': 'CITY416028',
+            'jarf': 'CITY416029',
+            'masfut': 'CITY416030',
+            'rashidya': 'CITY416033',
+            'absheron': 'CITY369473',
+            'aguila': 'CITY400936',
+            'ajo': 'CITY400937',
+            'al mafraq': 'CITY416020',
+            'al maqta': 'CITY416021',
+            'al marfa': 'CITY416022',
+            'buteen': 'CITY416023',
+            'ganthoot': 'CITY416024',
+            'habshan': 'CITY416025',
+            'mussafah': 'CITY376945',
+            'sila': 'CITY416026',
+            'sweihan': 'CITY416027',
+            'umm al nar': 'CITY99766',
+            'abu hayl': 'CITY416032',
+            'al awir': 'CITY415672',
+            'al quoz': 'CITY136077',
+            'al ruwaiya': 'CITY416034',
+            'al wajeha al bahriah': 'CITY415682',
+            'deira': 'CITY415671',
+            'dubai city': 'CITY415720',
+            'dubai internet city': 'CITY330866',
+            'dubai media city': 'CITY321056',
+            'hadaeq mohammed bin rashid': 'CITY415674',
+            'hatta': 'CITY416035',
+            'jabal ali': 'CITY415676',
+            'karama': 'CITY239098',
+            'madinat al maktoum': 'CITY415683',
+            'madinat al qudra': 'CITY415675',
+            'mina sufooh': 'CITY416036',
+            'nakhlat deira': 'CITY415684',
+            'satwa': 'CITY107634',
+            'sheikh zayed road': 'CITY415710',
+            'zaabeel': 'CITY415681',
+            'abadilah': 'CITY416037',
+            'akamiyah': 'CITY416038',
+            'al hayl': 'CITY416039',
+            'badiyah': 'CITY416040',
+            'diba': 'CITY416041',
+            'diba al hesn': 'CITY416042',
+            'furfar': 'CITY416043',
+            'qidfa': 'CITY222483',
+            'rughaylat': 'CITY416044',
+            'saqamqam': 'CITY416045',
+            'siji': 'CITY416046',
+            'adhan': 'CITY416047',
+            'al dharbaniyah': 'CITY416048',
+            'al fulayyah': 'CITY416049',
+            'al hamraniyah': 'CITY416050',
+            'al hayr': 'CITY416051',
+            'al jazirah al hamra': 'CITY416052',
+            'al khashfah': 'CITY416053',
+            'al manamah': 'CITY416054',
+            'al rams': 'CITY416055',
+            "al sha'm": 'CITY416056',
+            'al zahra': 'CITY416057',
+            'awanat': 'CITY416058',
+            'kharran': 'CITY416059',
+            'khatt': 'CITY416060',
+            'khor kheir': 'CITY277605',
+            'masafi': 'CITY416061',
+            'abu shagara': 'CITY416063',
+            'al azrah': 'CITY416064',
+            'al dhayd': 'CITY416065',
+            'al fahiya': 'CITY416066',
+            'al falaj': 'CITY416067',
+            'al khan': 'CITY416068',
+            'al manak': 'CITY416069',
+            "al rafa'ah": 'CITY416070',
+            'al tawoon': 'CITY416071',
+            'al wasit': 'CITY416072',
+            'buteena': 'CITY416073',
+            'dasman': 'CITY416074',
+            'dhaid': 'CITY416075',
+            'ghafia': 'CITY416076',
+            'ghubaiba': 'CITY416077',
+            'hamariya': 'CITY416103',
+            'jamestown': 'CITY265690',
+            'jazzat': 'CITY416078',
+            'kalba': 'CITY416079',
+            'kharayan': 'CITY416080',
+            'layyah': 'CITY416081',
+            'maisaloon': 'CITY416082',
+            'majjarah': 'CITY416083',
+            'mansoora': 'CITY416084',
+            'muwafja': 'CITY416085',
+            'nabbah': 'CITY416086',
+            'nakheelat': 'CITY416087',
+            'nasariya': 'CITY416088',
+            'qasimiya': 'CITY416089',
+            'ramaqiya': 'CITY416090',
+            'ramlah': 'CITY416091',
+            'ramtha': 'CITY416092',
+            'rolla': 'CITY416093',
+            'saabah': 'CITY416094',
+            'saif': 'CITY416095',
+            'samnan': 'CITY416096',
+            'shahba': 'CITY416097',
+            'shanghai': 'CITY399069',
+            'sharjah': 'CITY415687',
+            'sherqan': 'CITY416098',
+            'umm kanoor': 'CITY416099',
+            'wadi shi': 'CITY416100',
+            'yarmook': 'CITY416101',
+            'falaj al mulla': 'CITY416102',
+        },
+    },
+}
@@ -3,21 +3,16 @@
 from reportlab.platypus import Paragraph
 
 from ...abc.pdf import arabic_text, BaseInvoicePDF
-from pimly.models.translate import Translator
 from pimly.utils import helpers as h
 
 
 class PostaPlusInvoicePDF(BaseInvoicePDF):
 
-    def __init__(self, settings, shipment, **kwargs):
-        super().__init__(settings, shipment, **kwargs)
-        self.translator = Translator()
-
     def _billing_address(self, style):
         billing_district = self.order.billing_address.district or u''
         base_city = self.order.billing_address.base_city if self.order.billing_address.base_city != self.order.billing_address.city else None
-        translated_name = self.translator.translate(self.order.billing_address.full_name)
-        translated_city = base_city or self.translator.translate(self.order.billing_address.city)
+        translated_name = self.address_translations[self.order.billing_address.full_name]
+        translated_city = base_city or self.address_translations[self.order.billing_address.city]
         billing_params = {
             'full_name': arabic_text(self.order.billing_address.full_name),
             'address': arabic_text(self.order.billing_address.address),
@@ -45,8 +40,8 @@ class PostaPlusInvoicePDF(BaseInvoicePDF):
     def _shipping_address(self, style):
         shipping_district = self.order.shipping_address.district or u''
         base_city = self.order.shipping_address.base_city if self.order.shipping_address.base_city != self.order.shipping_address.city else None
-        translated_name = self.translator.translate(self.order.shipping_address.full_name)
-        translated_city = base_city or self.translator.translate(self.order.shipping_address.city)
+        translated_name = self.address_translations[self.order.shipping_address.full_name]
+        translated_city = base_city or self.address_translations[self.order.shipping_address.city]
         shipping_params = {
             'full_name': arabic_text(self.order.shipping_address.full_name),
             'address': arabic_text(self.order.shipping_address.address),
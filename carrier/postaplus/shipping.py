@@ -1,7 +1,6 @@
 from decimal import Decimal
 
 from pimly.models import enum
-from pimly.utils.vat import VATOrderBeforeShipping
 from ..abc.shipping import AbstractShippingService, TrackingNumberMixin
 from .pdf import home_collection, invoice
 from .api import PostaPlusAPI
@@ -10,12 +9,11 @@ from .api import PostaPlusAPI
 class PostaPlusShippingService(TrackingNumberMixin, AbstractShippingService):
     carrier_name = enum.CarrierName.postaplus
 
-    def can_send_shipment(self, shipment):
-        order = shipment.order
+    def can_send_shipment(self, shipment, timeout=None):
         return shipment.delivery_type == enum.DeliveryType.international \
-               and self._valid_country(order, shipment) \
-               and self.tracking_number_qs.count() > 0 \
-               and self._valid_high_value(order)
+               and self._valid_country(shipment) \
+               and self.has_tracking_numbers() \
+               and self._valid_high_value(shipment)
 
     def create_shipping_document(self, shipment):
         creator = home_collection.ShipmentPDF(self.settings, shipment)
@@ -44,10 +42,10 @@ class PostaPlusShippingService(TrackingNumberMixin, AbstractShippingService):
         postaplus_api = PostaPlusAPI(shipment, self.settings)
         postaplus_api.send_order()
 
-    def _valid_country(self, order, shipment):
-        return not (order.shipping_address.country == 'AE' and shipment.totals.extra_fee > 0)
+    def _valid_country(self, shipment):
+        return not (shipment.country == 'AE' and shipment.extra_fee > 0)
 
-    def _valid_high_value(self, order):
-        return not (order.shipping_address.country == 'AE'
-                    and order.currency == "AED"
-                    and VATOrderBeforeShipping(order.international_shipment).shipped_total >= Decimal('1000'))
+    def _valid_high_value(self, shipment):
+        return not (shipment.country == 'AE'
+                    and shipment.currency == "AED"
+                    and shipment.shipped_total >= Decimal('1000'))
@@ -0,0 +1,89 @@
+import importlib
+import logging
+import threading
+import time
+
+
+class CarrierRegistry:
+    """
+    Реестр керриеров по имени (CarrierName.name). Пакет керриера импортируется при первом обращении,
+    а его модули отправки, трекинга и пунктов выдачи (вместе с PDF и API) - при первом обращении
+    к соответствующему атрибуту класса керриера (LazyAttribute). Время каждого импорта сохраняется для отчета.
+    """
+    log = logging.getLogger('carriers_orders')
+    carriers = {
+        'aramex': ('.aramex', 'Aramex'),
+        'aramex_sa': ('.aramex_sa', 'AramexSA'),
+        'naqel': ('.naqel', 'Naqel'),
+        'postaplus': ('.postaplus', 'PostaPlus'),
+        'smsa': ('.smsa', 'SMSA'),
+        'dhl': ('.dhl', 'DHL'),
+    }
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._instances = {}
+        self._import_times = {}
+
+    def names(self):
+        return list(self.carriers)
+
+    def get(self, carrier_name):
+        if hasattr(carrier_name, 'name'):
+            carrier_name = carrier_name.name
+
+        carrier = self._instances.get(carrier_name)
+        if carrier is None:
+            with self._lock:
+                if carrier_name not in self._instances:
+                    module_name, class_name = self.carriers[carrier_name]
+                    module = self.import_module(carrier_name, module_name, __package__)
+                    self._instances[carrier_name] = getattr(module, class_name)()
+            carrier = self._instances[carrier_name]
+        return carrier
+
+    def all(self):
+        return [self.get(carrier_name) for carrier_name in self.carriers]
+
+    def loaded(self):
+        return [self._instances[carrier_name] for carrier_name in self.carriers if carrier_name in self._instances]
+
+    def import_module(self, carrier_name, module_name, package):
+        with self._lock:
+            started = time.perf_counter()
+            module = importlib.import_module(module_name, package)
+            elapsed = time.perf_counter() - started
+
+        self._import_times.setdefault((carrier_name, module.__name__), elapsed)
+        self.log.debug(f"{carrier_name}: {module.__name__} imported in {elapsed:.3f}s")
+        return module
+
+    def import_report(self):
+        """
+        {carrier_name: {module: секунды}} для импортированных модулей. Общие зависимости
+        (lxml, zeep, reportlab) учитываются у керриера, который импортировал их первым
+        """
+        report = {}
+        for (carrier_name, module_name), elapsed in self._import_times.items():
+            report.setdefault(carrier_name, {})[module_name] = elapsed
+        return report
+
+
+class LazyAttribute:
+    """Атрибут класса керриера, модуль которого импортируется при первом обращении"""
+
+    def __init__(self, module_name, attribute):
+        self.module_name = module_name
+        self.attribute = attribute
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        module = carrier_registry.import_module(owner.name.name, self.module_name, owner.__module__)
+        value = getattr(module, self.attribute)
+        setattr(owner, self.name, value)
+        return value
+
+
+carrier_registry = CarrierRegistry()
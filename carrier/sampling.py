@@ -0,0 +1,59 @@
+import random
+
+
+class AliasTable:
+    """
+    Взвешенный случайный выбор за O(1) (alias method, алгоритм Vose).
+    Таблица строится один раз для набора весов. Выбор только среди разрешенных индексов
+    делается отбрасыванием неподходящих значений, что сохраняет пропорции весов.
+    """
+    max_attempts = 32
+
+    def __init__(self, weights):
+        self.weights = [max(weight, 0) for weight in weights]
+        self.size = len(self.weights)
+        self.total = sum(self.weights)
+        self.probability = [0.0] * self.size
+        self.alias = [0] * self.size
+        if self.total > 0:
+            self._build()
+
+    def _build(self):
+        scaled = [weight * self.size / self.total for weight in self.weights]
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+        for index in small + large:
+            self.probability[index] = 1.0
+
+    def sample(self):
+        index = random.randrange(self.size)
+        return index if random.random() < self.probability[index] else self.alias[index]
+
+    def choice(self, allowed=None):
+        """Индекс, выбранный с вероятностью пропорциональной весу. allowed - допустимые индексы"""
+        if allowed is not None:
+            allowed = set(allowed)
+            if not allowed:
+                raise IndexError("Cannot choose from an empty set")
+
+        if self.total <= 0 or (allowed is not None and not any(self.weights[index] for index in allowed)):
+            return min(allowed) if allowed is not None else 0
+
+        if allowed is not None and len(allowed) == 1:
+            return next(iter(allowed))
+
+        for _ in range(self.max_attempts):
+            index = self.sample()
+            if allowed is None or index in allowed:
+                return index
+
+        # разрешенные керриеры имеют малую долю общего веса
+        allowed = sorted(allowed)
+        return random.choices(allowed, weights=[self.weights[index] for index in allowed])[0]
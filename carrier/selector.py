@@ -1,84 +1,130 @@
 import logging
 import operator
-import random
 
 from src.pimly.models.enum import CarrierName
+from .cache import process_cache
+from .cities import city_index
+from .eligibility import eligibility_checker
 from .models import CarrierPriority
-from .aramex import Aramex
-from .aramex_sa import AramexSA
-from .naqel import Naqel
-from .postaplus import PostaPlus
-from .smsa import SMSA
-from .dhl import DHL
+from .registry import carrier_registry
+from .sampling import AliasTable
 
 log = logging.getLogger(__name__)
 
 
 class CarrierSelector:
-    _carriers = {
-        carrier.name.name: carrier()
-        for carrier in (Aramex,
-                        AramexSA,
-                        Naqel,
-                        PostaPlus,
-                        SMSA,
-                        DHL,
-                        )
-    }
+    _carriers = carrier_registry
 
     @classmethod
     def get_shipping_services(cls, settings, shipment):
         """Выбор керриеров, которые могут отправить заказ"""
-        shipping_services = []
-        order = shipment.order
-        if order.shipping_info.get('carrier'):
-            customer_selected_carrier = CarrierName.from_raw(order.shipping_info['carrier'])
-        else:
-            customer_selected_carrier = None
+        return cls.get_bulk_shipping_services(settings, [shipment])[shipment.id]
+
+    @classmethod
+    def get_bulk_shipping_services(cls, settings, shipments):
+        """
+        Керриеры в порядке выбора для нескольких заказов сразу (экраны волн сборки): {shipment.id: [shipping_service, ...]}.
+        Заказы группируются по (канал, страна): приоритеты, семплер и сервисы керриеров берутся один раз на группу,
+        проверки can_send_shipment всех заказов группы идут одним проходом eligibility_checker
+        """
+        groups = {}
+        for shipment in shipments:
+            order = shipment.order
+            groups.setdefault((order.channel_id, order.shipping_address.country), []).append(shipment)
+
+        priority_table = CarrierPriority.priority_table()
+        selected = {}
+        for (channel_id, country_code), group in groups.items():
+            carriers_priorities = priority_table.get((channel_id, country_code), ())
+            group_services = cls._priority_services(settings, carriers_priorities, group[0].order.channel.code)
+            candidates = [(shipment, cls._customer_services(shipment, group_services)) for shipment in group]
+            available = eligibility_checker.check_many(settings, candidates)
+            sampler = cls._priority_sampler(channel_id, country_code, carriers_priorities) if carriers_priorities else None
+            for (shipment, shipping_services), available_indexes in zip(candidates, available):
+                shipping_services = [(index, shipping_service) for index, shipping_service in shipping_services
+                                     if index in available_indexes]
+                if len(shipping_services) > 1:
+                    significant_index = sampler.choice(index for index, shipping_service in shipping_services)
+                    shipping_services.sort(key=lambda service: service[0] != significant_index)
+                selected[shipment.id] = [shipping_service for index, shipping_service in shipping_services]
 
-        carriers_priorities = CarrierPriority.country_priorities(order.channel_id, order.shipping_address.country)
-        for carrier_name, priority in carriers_priorities:
-            if customer_selected_carrier and customer_selected_carrier != carrier_name:
-                continue
+        return selected
 
+    @classmethod
+    def _priority_services(cls, settings, carriers_priorities, channel_code):
+        """[(индекс приоритета, carrier_name, shipping_service)] для керриеров таблицы приоритетов"""
+        shipping_services = []
+        for index, (carrier_name, priority) in enumerate(carriers_priorities):
             try:
-                carrier = cls.get_carrier(carrier_name)
-                shipping_service = carrier.ShippingService(settings, order.channel.code)
-                if shipping_service.can_send_shipment(shipment):
-                    shipping_services.append((shipping_service, priority))
+                shipping_services.append((index, carrier_name, cls.get_shipping_service(settings, carrier_name, channel_code)))
             except Exception:
                 log.exception(f"Can not check carrier shipping availability: {carrier_name}")
+        return shipping_services
 
-        if len(shipping_services) > 1:
-            significant_carriers = random.choices(shipping_services, weights=[p[1] for p in shipping_services])
-            shipping_services.remove(significant_carriers[0])
-            shipping_services.insert(0, significant_carriers[0])
-
-        return [shipping_service for shipping_service, priority in shipping_services]
+    @staticmethod
+    def _customer_services(shipment, shipping_services):
+        """[(индекс приоритета, shipping_service)] с учетом керриера, выбранного покупателем"""
+        shipping_info = shipment.order.shipping_info
+        customer_selected_carrier = CarrierName.from_raw(shipping_info['carrier']) if shipping_info.get('carrier') else None
+        return [(index, shipping_service) for index, carrier_name, shipping_service in shipping_services
+                if not customer_selected_carrier or customer_selected_carrier == carrier_name]
 
     @classmethod
     def get_local_shipping_services(cls, settings, shipment):
         """Выбор керриеров, которые могут отправить локальный заказ."""
         shipping_services = []
         order = shipment.order
-        for carrier_name, carrier in cls._carriers.items():
+        for carrier_name in cls._carriers.names():
             try:
-                shipping_service = carrier.ShippingService(settings, order.channel.code)
-                if shipping_service.can_send_shipment(shipment):
-                    shipping_services.append(shipping_service)
+                shipping_services.append((carrier_name, cls.get_shipping_service(settings, carrier_name, order.channel.code)))
             except Exception:
                 log.exception(f"Can not check carrier shipping availability: {carrier_name}")
 
-        return shipping_services
+        available = eligibility_checker.check(settings, shipping_services, shipment)
+        return [shipping_service for carrier_name, shipping_service in shipping_services if carrier_name in available]
+
+    @classmethod
+    def get_shipping_service(cls, settings, carrier_name, channel_code):
+        """
+        Сервис отправки керриера для канала. Сервисы не хранят состояние запроса и читают настройки керриера
+        из общего кеша, поэтому создаются один раз на процесс
+        """
+        carrier = cls.get_carrier(carrier_name)
+        return process_cache.get(
+            'carrier', ('shipping_service', carrier.name, channel_code),
+            lambda: carrier.ShippingService(settings, channel_code),
+        )
+
+    @classmethod
+    def _priority_sampler(cls, channel_id, country_code, carriers_priorities):
+        return process_cache.get(
+            'carrier_priority', ('sampler', channel_id, country_code),
+            lambda: AliasTable([priority for carrier_name, priority in carriers_priorities]),
+        )
 
     @classmethod
     def get_carrier(cls, carrier_name):
-        if hasattr(carrier_name, 'name'):
-            carrier_name = carrier_name.name
+        return cls._carriers.get(carrier_name)
 
-        return cls._carriers[carrier_name]
+    @classmethod
+    def get_carriers(cls):
+        return cls._carriers.all()
 
     @classmethod
     def get_service_point_carriers(cls):
         """Выбор слжуб доставки, у которых есть service points (пункты выдачи товаров)"""
-        return [carrier for carrier in cls._carriers.values() if carrier.ServicePointUpdater]
+        return [carrier for carrier in cls._carriers.all() if carrier.ServicePointUpdater]
+
+    @classmethod
+    def warm_up(cls, settings):
+        """Загрузка шрифтов, WSDL керриеров и индекса городов при старте воркера"""
+        # PDF (reportlab) и SOAP (zeep) нужны только здесь, выбор керриера их не импортирует
+        from .abc.pdf import font_registry
+        from .abc.soap import soap_clients
+        font_registry.warm_up(settings)
+        city_index.configure(settings)
+        city_index.compile()
+        from .naqel.api import NaqelAPI
+        from .postaplus.api import PostaPlusAPI
+        from .smsa.api import SMSAAPI
+        soap_clients.preload(settings, NaqelAPI, PostaPlusAPI, SMSAAPI)
@@ -9,18 +9,16 @@ from lxml.etree import tostring
 from pdfrw import PdfReader, PdfWriter
 from pyramid.settings import asbool
 from pyramid.threadlocal import get_current_registry
-from zeep import Client, Transport
 from pimlib.cache import cache_tag
 from pimlib.utils.files import ensure_dir
 
-from pimly.models import DBSession
 from pimly.models import enum
 from pimly.models.carrier.models import Carrier
-from pimly.utils.cache import cached_property
 from pimly.utils.vat import VATOrder
-from ..abc.exc import SendingOrderCancelled
+from ..abc.exc import SendingOrderCancelled, SendingOrderDelayed
 from ..abc.service_point import Location
-from .city_codes import CITY_CODES
+from ..abc.soap import soap_clients
+from ..cities import city_index, city_names_index
 
 
 class SMSAAPI:
@@ -28,39 +26,47 @@ class SMSAAPI:
     log = logging.getLogger('carriers_orders')
     exception_log = logging.getLogger('carriers_orders_exceptions')
 
-    def __init__(self, settings=None, channel='default'):
+    def __init__(self, settings=None, channel='default', operation_timeout=30):
         self.settings = settings or get_current_registry().settings
+        self.operation_timeout = operation_timeout
         self.production_mode = asbool(self.settings.get('pimly.order_api.production_mode', False))
-        self.url = self.production_url
-        self.carrier = self._load_carrier()
-        self.carrier_settings = self.carrier.get_settings(channel)
+        self.carrier_settings = Carrier.cached_settings(enum.CarrierName.smsa, channel)
         self.passkey = self.carrier_settings.passkey if self.production_mode else 'Testing1'
 
-    @cached_property
+    @classmethod
+    def soap_client(cls, settings, operation_timeout=30):
+        return soap_clients.get(settings, cls.production_url, timeout=120, operation_timeout=operation_timeout)
+
+    @property
     def client(self):
-        return Client(self.url, transport=Transport(timeout=120, operation_timeout=30))
+        return self.soap_client(self.settings, self.operation_timeout)
 
     @property
     @cache_tag('get_cities', expiration_time=4*60*60)
     def cities(self):
         cities = []
-        self.client.settings.raw_response = True
         try:
-            response = self.client.service.getRTLCities(self.passkey)
+            with self.client.settings(raw_response=True):
+                response = self.client.service.getRTLCities(self.passkey)
             root = ElementTree.fromstring(response.text)
             cities = [tag.find('rCity').text for tag in root.iter("RetailCities")]
             cities = [city_name.title() for city_name in cities]
         except Exception as e:
             self.exception_log.exception(e)
-        finally:
-            self.client.settings.raw_response = False
         return cities
 
+    def city_name(self, country, cities):
+        """Название города SMSA для первого подходящего города из cities"""
+        city_names = city_names_index(tuple(self.cities))
+        for city in city_index.resolve(country, cities).smsa:
+            if city in city_names:
+                return city_names[city]
+
     def get_service_points(self):
-        self.client.settings.raw_response = True
         service_points = []
         try:
-            response = self.client.service.getAllRetails(self.passkey)
+            with self.client.settings(raw_response=True):
+                response = self.client.service.getAllRetails(self.passkey)
             root = ElementTree.fromstring(response.content)
             for tag in root.iter("RetailsList"):
                 coordinates = tag.find("rGPSPt").text.split(',')
@@ -84,13 +90,43 @@ class SMSAAPI:
             raise
         else:
             return service_points
-        finally:
-            self.client.settings.raw_response = False
 
-    def _load_carrier(self):
-        return DBSession.query(Carrier)\
-            .filter(Carrier.name == enum.CarrierName.smsa)\
-            .one()
+    def get_tracking_info(self, tracking_number):
+        try:
+            with self.client.settings(raw_response=True):
+                response = self.client.service.getTracking(
+                    passkey=self.passkey,
+                    awbNo=tracking_number
+                )
+        except Exception as e:
+            self.exception_log.exception(f"SMSA. An error occurred while receiving tracking response for awb {tracking_number}")
+            raise SendingOrderDelayed(f"SMSA. Getting tracking info failed with error: {e}")
+
+        root = ElementTree.fromstring(response.content)
+        if not root:
+            self.exception_log.error(f"SMSA. Response for awb {tracking_number} has error message: {response}")
+            request = self.client.create_message(
+                self.client.service,
+                "getStatus",
+                passkey=self.passkey,
+                awbNo=tracking_number
+            )
+            self.exception_log.error(f"Request: {tostring(request, pretty_print=True)}")
+            raise SendingOrderCancelled(f"Shipment Tracking Failed. Response: {response}")
+
+        tracking_info = []
+        for track in root.iter("Tracking"):
+            try:
+                event_date = datetime.strptime(track.find('Date').text, '%d %b %Y %H:%M')
+                tracking_info.append(SMSATrackInfo(
+                    event_code=track.find('Activity').text,
+                    event_date=event_date,
+                    description=track.find("Details").text
+                ))
+            except ValueError as e:
+                self.exception_log.exception("SMSA: Error during parse Response. [Event Date format]")
+
+        return tracking_info
 
 
 SMSATrackInfo = namedtuple('SMSATrackInfo', [
@@ -112,12 +148,8 @@ class SMSAOrderAPI(SMSAAPI):
         if self.order.shipping_method_type == enum.ShippingMethod.click_and_collect:
             self.passkey = self.carrier_settings.cc_passkey if self.production_mode else "Testing1"
 
-    def _load_carrier(self):
-        return self.shipment.carrier or super()._load_carrier()
-
     def send_shipment(self, box_qty, **kwargs):
         try:
-            self.client.settings.raw_response = False
             tracking_number = self.client.service.addShip(**self._create_info(box_qty, **kwargs))
         except Exception as e:
             self.exception_log.exception(e)
@@ -146,16 +178,11 @@ class SMSAOrderAPI(SMSAAPI):
 
     @property
     def order_city_name(self):
-        cdb_cities = [self.order.shipping_address.city]
-
+        address = self.order.shipping_address
+        cities = [address.city]
         if self.order.shipping_method_type != enum.ShippingMethod.click_and_collect:
-            cdb_cities.extend(self.order.shipping_address.base_cities)
-
-        for city in cdb_cities:
-            city = city.strip().title()
-            city = CITY_CODES.get(city, city)
-            if city in self.cities:
-                return city
+            cities.extend(address.base_cities)
+        return self.city_name(address.country, cities)
 
     def _create_info(self, box_qty, **kwargs):
         postcode = self.order.shipping_address.postcode
@@ -227,40 +254,3 @@ class SMSAOrderAPI(SMSAAPI):
 
         }
         return info
-
-    def get_order_tracking_info(self):
-        try:
-            self.client.settings.raw_response = True
-            response = self.client.service.getTracking(
-                passkey=self.passkey,
-                awbNo=self.shipment.tracking_number
-            )
-        except Exception as e:
-            self.exception_log.exception(f"SMSA. An error occurred while receiving tracking response for order {self.order.code}")
-            raise SendingOrderCancelled(f"SMSA. Getting tracking info failed with error: {e}")
-
-        root = ElementTree.fromstring(response.content)
-        if not root:
-            self.exception_log.error(f"SMSA. Response for order {self.order.code} has error message: {response}")
-            request = self.client.create_message(
-                self.client.service,
-                "getStatus",
-                passkey=self.passkey,
-                awbNo=self.shipment.tracking_number
-            )
-            self.exception_log.error(f"Request: {tostring(request, pretty_print=True)}")
-            raise SendingOrderCancelled(f"Shipment Tracking Failed. Response: {response}")
-
-        tracking_info = []
-        for track in root.iter("Tracking"):
-            try:
-                event_date = datetime.strptime(track.find('Date').text, '%d %b %Y %H:%M')
-                tracking_info.append(SMSATrackInfo(
-                    event_code=track.find('Activity').text,
-                    event_date=event_date,
-                    description=track.find("Details").text
-                ))
-            except ValueError as e:
-                self.exception_log.exception("SMSA: Error during parse Response. [Event Date format]")
-
-        return tracking_info
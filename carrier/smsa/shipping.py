@@ -1,5 +1,5 @@
 from pimly.models import enum
-from .api import SMSAOrderAPI
+from .api import SMSAAPI, SMSAOrderAPI
 from ..abc.pdf import BaseInvoicePDF
 from ..abc.exc import SendingOrderDelayed
 from ..abc.shipping import AbstractShippingService
@@ -7,12 +7,12 @@ from ..abc.shipping import AbstractShippingService
 
 class SMSAShippingService(AbstractShippingService):
     carrier_name = enum.CarrierName.smsa
+    resend_allowed = False
 
-    def can_send_shipment(self, shipment):
-        order = shipment.order
+    def can_send_shipment(self, shipment, timeout=None):
         return shipment.delivery_type == enum.DeliveryType.international \
-               and order.currency == "SAR" \
-               and self._valid_city_code(order, shipment)
+               and shipment.currency == "SAR" \
+               and self._valid_city_code(shipment, timeout)
 
     def create_shipping_document(self, shipment):
         api = SMSAOrderAPI(shipment, self.settings)
@@ -39,6 +39,8 @@ class SMSAShippingService(AbstractShippingService):
     def _resend_shipment(self, shipment):
         raise SendingOrderDelayed("Resend for SMSA carrier is not allowed")
 
-    def _valid_city_code(self, order, shipment):
-        return order.shipping_method_type == enum.ShippingMethod.click_and_collect \
-               or SMSAOrderAPI(shipment, self.settings).valid_city()
+    def _valid_city_code(self, shipment, timeout):
+        if shipment.shipping_method_type == enum.ShippingMethod.click_and_collect:
+            return True
+        api = SMSAAPI(self.settings, channel=shipment.channel_code, operation_timeout=timeout)
+        return api.city_name(shipment.country, shipment.cities) is not None
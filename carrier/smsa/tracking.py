@@ -1,17 +1,13 @@
-import time
-import transaction
-from datetime import datetime
+from collections import namedtuple
 
-from sqlalchemy.orm import joinedload
-
-from pimly.utils import grouper
 from pimly.models import DBSession, enum
+from pimly.models.catalog import Channel
 from pimly.models.orders import Order, OrderShipment
+from pimly.models.tracking.enum import MilestoneType
 from pimly.models.tracking.models import ShipmentMilestone
-from pimly.models.tracking.enum import MilestoneType, OrderShipmentStatus
-from .api import SMSAOrderAPI
+from .api import SMSAAPI
+from ..abc.fetcher import ConcurrentFetcher
 from ..abc.tracking import AbstractTrackingUpdater
-from ..abc.exc import SendingOrderCancelled
 
 
 MILESTONES = {
@@ -62,87 +58,53 @@ MILESTONES = {
 }
 
 
+SMSAMilestoneInfo = namedtuple('SMSAMilestoneInfo', [
+    'event_code',
+    'event_date',
+    'description',
+    'milestone',
+])
+
+
 class TrackingUpdater(AbstractTrackingUpdater):
     carrier_name = enum.CarrierName.smsa
+    fetch_batch_size = 100
 
     def __init__(self, settings, **kwargs):
         super().__init__(settings, **kwargs)
         self.channel_id = kwargs['channel_id']
-
-    def update_trackings(self):
-        shipment_ids = [shipment.id for shipment in self._tracking_qs]
-        for group in grouper(100, shipment_ids):
-            delivered_shipment_ids = []
-            with transaction.manager:
-                qs = DBSession.query(OrderShipment) \
-                    .filter(OrderShipment.id.in_(filter(None, group))) \
-                    .options(joinedload('order'),
-                             joinedload('carrier'))
-
-                for shipment in qs:
-                    try:
-                        api = SMSAOrderAPI(shipment, self.settings)
-                        milestones = self._create_milestones(shipment.id, api.get_order_tracking_info())
-                        new_milestones = shipment.filter_milestones(milestones)
-                        time.sleep(2)
-
-                        if self._check_delivered_status(new_milestones):
-                            delivered_shipment_ids.append(shipment.id)
-
-                        # Sort for the further correct addition of ShipmentNotification
-                        new_milestones.sort()
-                        DBSession.add_all(new_milestones)
-                        DBSession.refresh(shipment)
-                        shipment.update_status_info()
-
-                    except SendingOrderCancelled as e:
-                        self.exception_log.exception(e)
-
-            self._set_order_delivered_status(delivered_shipment_ids)
-            self._update_shipment_delivery_date(delivered_shipment_ids)
-
-    def _create_milestones(self, shipment_id, tracking_info):
-        shipment_milestones = []
-        for tracking in tracking_info:
-            milestone = MILESTONES.get(tracking.event_code.lower(), None)
-            if not milestone:
-                continue
-            shipment_milestones.append(ShipmentMilestone(
-                shipment_id=shipment_id,
-                is_customer_view=milestone.args['is_customer_view'],
-                milestone=milestone,
-                carrier_code=tracking.event_code,
-                event_date=tracking.event_date,
-                description=tracking.description
-            ))
-        return shipment_milestones
-
-    def _check_delivered_status(self, milestones):
-        return any(MilestoneType.is_delivered_milestone(m.milestone) for m in milestones)
-
-    def _set_order_delivered_status(self, delivered_shipment_ids):
-        if not delivered_shipment_ids:
-            return
-
-        with transaction.manager:
-            order_qs = DBSession.query(Order) \
-                .filter(Order.shipments.any(OrderShipment.id.in_(delivered_shipment_ids)))
-            for order in order_qs:
-                if all(sh.current_status == OrderShipmentStatus.delivered for sh in order.shipments):
-                    order.status = enum.OrderStatus.delivered
-                    DBSession.flush()
-
-    def _update_shipment_delivery_date(self, delivered_shipment_ids):
-        with transaction.manager:
-            DBSession.query(OrderShipment) \
-                .filter(OrderShipment.id.in_(delivered_shipment_ids),
-                        OrderShipment.current_status == OrderShipmentStatus.delivered) \
-                .update({OrderShipment.delivered_date: datetime.utcnow()},
-                        synchronize_session=False)
+        channel_code = DBSession.query(Channel.code).filter(Channel.id == self.channel_id).scalar()
+        self.api = SMSAAPI(self.settings, channel_code)
+        self.fetcher = ConcurrentFetcher.from_settings(
+            settings, self.carrier_name.name, self.api.get_tracking_info, workers=2, rate=1,
+        )
+
+    def fetch(self, tracking_numbers):
+        yield from self.fetcher.batches(tracking_numbers, self.fetch_batch_size)
+
+    def parse(self, batch):
+        for tracking_number, tracking_info in batch:
+            for tracking in tracking_info:
+                yield tracking_number, SMSAMilestoneInfo(
+                    event_code=tracking.event_code,
+                    event_date=tracking.event_date,
+                    description=tracking.description,
+                    milestone=MILESTONES.get((tracking.event_code or '').lower()),
+                )
+
+    def _create_milestone(self, shipment_id, tracking):
+        return ShipmentMilestone(
+            shipment_id=shipment_id,
+            is_customer_view=tracking.milestone.args['is_customer_view'],
+            milestone=tracking.milestone,
+            carrier_code=tracking.event_code,
+            event_date=tracking.event_date,
+            description=tracking.description,
+        )
 
     @property
     def _tracking_qs(self):
-        qs = DBSession.query(OrderShipment.id)\
+        qs = DBSession.query(OrderShipment.tracking_number)\
             .join(Order)\
             .filter(Order.channel_id == self.channel_id,
                     OrderShipment.carrier_id == self.carrier_id,
@@ -16,6 +16,7 @@ from carrier.forms import BaseCarrierCompleteForm
 from pimly.models.enum import OrderStatus, ShippingMethod
 from pimly.models.orders import Order
 from carrier.selector import CarrierSelector
+from carrier.outbox import ShippingOutbox
 from carrier.abc.exc import SendingOrderCancelled
 from pimly.models.warehouse.enum import WarehouseProductStatus
 from pimly.tasks.send_email import send_shipment_email
@@ -37,6 +38,7 @@ class OrderComplete(ExtendedCRUDUpdate):
         'failed': u"Error complete order",
         'no_available_carriers': u"There are no available carriers",
         'invalid_carrier': u"Invalid carrier",
+        'pending': u"Order completed. Shipment is being sent to carrier",
     }
 
     def __init__(self, request):
@@ -47,6 +49,7 @@ class OrderComplete(ExtendedCRUDUpdate):
         self.success_complete = None
         self.lock = None
         self.international_items = None
+        self.previous_status = None
 
     def load_model(self):
         entity_id = self.request.matchdict['id']
@@ -148,6 +151,7 @@ class OrderComplete(ExtendedCRUDUpdate):
             try:
                 self.di.Session.add(self.model)
                 self.international_items = [i for i in self.model.items if i.is_international]
+                self.previous_status = self.model.status
                 self.model.set_status(OrderStatus.complete)
                 self.set_items_shipped_qty()
                 self.update_order_shipment()
@@ -168,6 +172,15 @@ class OrderComplete(ExtendedCRUDUpdate):
         return super().fail_exceptions + (SendingOrderCancelled,)
 
     def after_flush(self):
+        if ShippingOutbox.enabled(self.request.registry.settings):
+            self._enqueue_shipment()
+        else:
+            self._send_shipment()
+
+        self._update_warehosue_product_status()
+        self.di.Session.flush()
+
+    def _send_shipment(self):
         try:
             tracking_number = self.current_shipping_service.send_shipment(self.model.international_shipment)
         except self.current_shipping_service.send_exceptions as e:
@@ -177,12 +190,15 @@ class OrderComplete(ExtendedCRUDUpdate):
             self.model.international_shipment.tracking_number = tracking_number
             self.success_complete = True
 
-        self._update_warehosue_product_status()
-
         if self.model.international_shipment.can_send_shipping_email:
             send_shipment_email.apply_async(args=(self.model.international_shipment.id,), countdown=10)
 
-        self.di.Session.flush()
+    def _enqueue_shipment(self):
+        """Шипмент отправит воркер ShippingOutbox, он же отправит письмо после получения трекинг номера"""
+        ShippingOutbox.enqueue(self.model.international_shipment, self.current_shipping_service, self.model.channel.code,
+                               order_status=self.previous_status)
+        self.request.session.flash("info;{}".format(self.messages.pending))
+        self.success_complete = None
 
     def update_order_shipment(self):
         current_datetime = datetime.utcnow()